@@ -0,0 +1,7 @@
+import os
+import OpenGL
+
+# PyOpenGL checks for errors after every GL call which is costly when called from Python.
+# Release runs turn the checks off, this has to happen before OpenGL.GL is first imported.
+if os.environ.get("SHADERCRAFT_RELEASE", "0") == "1":
+    OpenGL.ERROR_CHECKING = False
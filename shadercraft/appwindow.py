@@ -1,7 +1,8 @@
 import os
 from typing import Type, Optional
 import logging as Log
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QTimer, QEvent
+from PySide6.QtGui import QCloseEvent
 from PySide6.QtWidgets import (
     QApplication,
     QGraphicsScene,
@@ -34,7 +35,10 @@ from .nodegraphview import NodeGraphView
 from .nodepalette import NodePaletteWidget
 from .propertypanel import PropertyPanelWidget
 from .viewportwidget import ViewportWidget
-from .shadergen import ShaderGen
+from .shadergen import ShaderGen, ShaderGenResult
+from .rebuildscheduler import RebuildScheduler
+from .shaderbuilder import ShaderBuilder, ShaderBuildResult
+from .nodescheduler import GraphCycleError
 
 
 class AppWindow(QMainWindow):
@@ -43,7 +47,23 @@ class AppWindow(QMainWindow):
         self.log_last_pos: int = 0
         self.log_refresh_rate: int = 100
         self.log_timer: QTimer = QTimer(self)
-        self.preview_timer: QTimer = QTimer(self)
+
+        # Promoted node input values are pushed to the preview shader as uniforms
+        # so value only edits do not require shader recompilation.
+        # Exported shaders have no host setting the uniforms so promoted values are baked in.
+        self.uniform_promotion: bool = True
+        self.shader_gen: ShaderGen = ShaderGen()
+        self.export_shader_gen: ShaderGen = ShaderGen(bake_uniforms=True)
+        self.shader_export_dir: str = "."
+
+        # Bursts of graph edits are merged into single preview rebuild per debounce window
+        self.preview_rebuild_debounce: int = 30
+        self.rebuild_scheduler: RebuildScheduler = RebuildScheduler(self.preview_rebuild_debounce, self)
+        self.rebuild_scheduler.rebuild_requested.connect(self.onPreviewRedrawRequested)
+
+        # Preview shader code is generated on worker thread so large graphs do not block the UI
+        self.shader_builder: ShaderBuilder = ShaderBuilder(self.shader_gen, self)
+        self.shader_builder.build_finished.connect(self.onShaderBuildFinished)
 
         self.ui = Ui_MainWindow()
         self.ui.setupUi(self)
@@ -54,7 +74,7 @@ class AppWindow(QMainWindow):
         self._initPalette()
         self._initPropertyPanel()
         self._initPreviewViewport()
-        self.ui.actionGenerate_Shader_Code.triggered.connect(self.onGenerateShaderCode)
+        self.ui.actionGenerate_Shader_Code.triggered.connect(self.onExportShaderCode)
 
     def _initPalette(self) -> None:
         """
@@ -100,7 +120,8 @@ class AppWindow(QMainWindow):
         assertRef(self.graph_view)
         self.graph_scene: NodeGraphScene = NodeGraphScene()
         self.graph_scene.selected_node_changed.connect(self.onGraphNodeSelectionChanged)
-        self.graph_scene.preview_redraw_requested.connect(self.onPreviewRedrawRequested)
+        self.graph_scene.node_added.connect(self.onGraphNodeAdded)
+        self.graph_scene.preview_redraw_requested.connect(self.rebuild_scheduler.request)
         self.graph_view.setScene(self.graph_scene)
         self.graph_view.update()
         self.graph_scene.addDefaultNodes()
@@ -120,7 +141,7 @@ class AppWindow(QMainWindow):
 
     def _initPropertyPanel(self) -> None:
         self.property_panel: PropertyPanelWidget = PropertyPanelWidget(self)
-        self.property_panel.preview_redraw_requested.connect(self.onPreviewRedrawRequested)
+        self.property_panel.preview_redraw_requested.connect(self.rebuild_scheduler.request)
         self.ui.PropertiesPanelFrame.setLayout(QVBoxLayout())
         self.ui.PropertiesPanelFrame.layout().addWidget(self.property_panel)
 
@@ -135,9 +156,17 @@ class AppWindow(QMainWindow):
         frame.setLayout(QVBoxLayout())
         frame.layout().addWidget(self.preview_viewport)
 
-        # Set viewport to redraw at 60Hz
-        self.preview_timer.timeout.connect(self.preview_viewport.requestRedraw)
-        self.preview_timer.start(16)
+    def closeEvent(self, event: QCloseEvent) -> None:
+        """Event handler invoked when window is closed, background shader builds are stopped"""
+        self.rebuild_scheduler.cancel()
+        self.shader_builder.shutdown()
+        super().closeEvent(event)
+
+    def changeEvent(self, event: QEvent) -> None:
+        """Event handler invoked when window state changes, preview redraws stop while minimized"""
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange and hasattr(self, "preview_viewport"):
+            self.preview_viewport.setRedrawSuspended(self.isMinimized())
 
     def updateLogView(self) -> None:
         """
@@ -172,44 +201,124 @@ class AppWindow(QMainWindow):
         node: Node = node_desc.node_type()
         self.graph_scene.addNode(node)
 
+    def onGraphNodeAdded(self, node: Node) -> None:
+        """Event handler invoked when node is added to the graph, node input promotion is set up once here"""
+        if isinstance(node, ShaderNodeBase):
+            node.setUniformPromotion(self.uniform_promotion)
+
     def onPreviewRedrawRequested(self, rebuild_shader: bool = True) -> None:
         """
         Event handler invoked when various app panels action request redraw of preview viewport.
-        This can be slow if it triggers shader recompilation.
+        Requests are coalesced by rebuild scheduler, this can be slow if it triggers shader recompilation.
         """
         assertType(rebuild_shader, bool)
         assertRef(self.preview_viewport)
         Log.debug("Preview redraw requested")
 
         if rebuild_shader:
-            self.onGenerateShaderCode()
+            self.rebuildPreviewShader()
         self.preview_viewport.requestRedraw()
 
-    def onGenerateShaderCode(self) -> None:
+    def getOutputNode(self) -> Optional[OutputShaderNode]:
+        """Get output shader node of the graph, None if graph has no output node"""
+        output_nodes: list[Node] = self.graph_scene.getAllNodeOfClass(OutputShaderNode)
+        if not output_nodes:
+            return None
+        assertTrue(len(output_nodes) == 1)
+        return output_nodes[0]
+
+    def rebuildPreviewShader(self) -> None:
         """
-        Event handler invoked when genrate shader code menu item is clicked.
-        Collects all the graph shader nodes and generates shader source code.
+        Update preview shader to match current state of the graph.
+        Shader is only regenerated when nodes contributing to the output changed,
+        value only edits of promoted node inputs just update preview uniforms.
+        Regeneration runs in the background and cancels any rebuild still in flight.
         """
-        Log.info("Generating shader code")
-        output_nodes: OutputShaderNode = self.graph_scene.getAllNodeOfClass(OutputShaderNode)
-        if output_nodes is None:
+        output_node: Optional[OutputShaderNode] = self.getOutputNode()
+        if output_node is None:
             Log.warning("Attempting to generate shader code with no output node in the scene, aborting.")
             return
-        assertTrue(len(output_nodes) == 1)
-        output_node: Node = output_nodes[0]
-        shader_nodes: list[Node] = output_node.getDownstreamNodes()
 
-        gen: ShaderGen = ShaderGen()
-        gen.generateSource(shader_nodes)
-        gen.writeSource(".")
+        try:
+            shader_nodes: list[Node] = output_node.getDownstreamNodes()
+        except GraphCycleError as err:
+            Log.error(f"Failed to rebuild preview shader, keeping last valid shader: {err}")
+            return
+
+        if not output_node.isDirty():
+            Log.debug("Graph shader code is up to date, updating preview uniform values")
+            self.preview_viewport.setUniformValues(ShaderGen.collectUniformValues(shader_nodes))
+            self.updatePreviewAnimation(shader_nodes)
+            return
+
+        self.shader_builder.request(shader_nodes)
+
+    def onShaderBuildFinished(self, result: ShaderBuildResult) -> None:
+        """Event handler invoked when background shader build generates sources of latest graph state"""
+        assertRef(self.preview_viewport)
+        self.preview_viewport.requestShaderSourceAsync(result.sources.vs_source, result.sources.ps_source)
+        self.preview_viewport.setUniformValues(ShaderGen.collectUniformValues(result.snapshot.nodes))
+        self.updatePreviewAnimation(result.snapshot.nodes)
+
+    def onGenerateShaderCode(self) -> bool:
+        """
+        Collects all the graph shader nodes, generates shader source code
+        and loads it into the preview viewport.
+
+        Returns:
+            bool : True if shader code was generated, False if the graph cannot be generated.
+        """
+        Log.info("Generating shader code")
+        output_node: Optional[OutputShaderNode] = self.getOutputNode()
+        if output_node is None:
+            Log.warning("Attempting to generate shader code with no output node in the scene, aborting.")
+            return False
+
+        try:
+            shader_nodes: list[Node] = output_node.getDownstreamNodes()
+        except GraphCycleError as err:
+            Log.error(f"Failed to generate shader code, keeping last valid shader: {err}")
+            return False
+
+        # Sources generated here supersede any background build in flight
+        self.shader_builder.cancel()
+        result: ShaderGenResult = self.shader_gen.generateSource(shader_nodes)
 
-        # Load generate shade into preview viewport
+        # Load generated shader sources straight into preview viewport
         assertRef(self.preview_viewport)
-        stat: bool = self.preview_viewport.requestShader(gen.vertex_shader, gen.pixel_shader)
+        stat: bool = self.preview_viewport.requestShaderSource(result.vs_source, result.ps_source)
         if not stat:
             Log.error("Failed to compile generated shader code")
+        self.preview_viewport.setUniformValues(result.uniform_values)
+        self.updatePreviewAnimation(shader_nodes)
 
         Log.info("Done")
+        return True
+
+    def updatePreviewAnimation(self, shader_nodes: list[Node]) -> None:
+        """Keep preview viewport redrawing continuously only while the shader depends on time"""
+        animating: bool = any(
+            isinstance(node, ShaderNodeBase) and node.time_dependent
+            for node in shader_nodes
+        )
+        self.preview_viewport.setAnimating(animating)
+
+    def onExportShaderCode(self) -> None:
+        """
+        Event handler invoked when generate shader code menu item is clicked.
+        Regenerates graph shader code and writes shader sources to disk.
+        Exported sources have promoted input values baked in as constants.
+        """
+        if not self.onGenerateShaderCode():
+            Log.warning("Shader code export aborted")
+            return
+
+        output_node: OutputShaderNode = self.getOutputNode()
+
+        gen: ShaderGen = self.export_shader_gen
+        gen.generateSource(output_node.getDownstreamNodes())
+        gen.writeSource(self.shader_export_dir)
+        Log.info(f"Shader sources exported -> {self.shader_export_dir}")
 
     def onGraphNodeSelectionChanged(self, node: Node) -> None:
         """
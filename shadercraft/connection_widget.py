@@ -1,23 +1,78 @@
 from __future__ import annotations
-from uuid import UUID, uuid1
+from typing import Optional, Callable, Iterator
+from uuid import UUID
+import math
 
-from PySide6.QtCore import QObject, QRectF, QPointF, QLine, Qt
-from PySide6.QtWidgets import QGraphicsWidget, QWidget
-from PySide6.QtGui import QPainter, QPen
+from PySide6.QtCore import QRectF, QPointF, Qt, QTimer
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsWidget, QGraphicsObject, QStyleOptionGraphicsItem, QWidget
+from PySide6.QtGui import QPainter, QPen, QPainterPath
 
-from .asserts import assertRef
-from .node_widget import NodeProxyWidget
+from .asserts import assertRef, assertTrue
+from .node_widget import NodeProxyWidget, NodeDetailLevel
+from .styles import node_pin_color
+
+
+class ConnectionPaths:
+    """
+    Utility class for building connection line geometry.
+    """
+    pen_width: int = 3
+    pin_radius: float = 6
+
+    @staticmethod
+    def createPen(level: NodeDetailLevel = NodeDetailLevel.FULL) -> QPen:
+        """Create pen used to stroke connection lines, simple detail uses thin cosmetic lines"""
+        pen: QPen = QPen(node_pin_color)
+        if level is NodeDetailLevel.SIMPLE:
+            pen.setWidth(0)
+        else:
+            pen.setWidth(ConnectionPaths.pen_width)
+        return pen
+
+    @staticmethod
+    def buildPath(start: QPointF, end: QPointF, curved: bool = False) -> QPainterPath:
+        """
+        Build path of a single connection line.
+
+        Parameters:
+            start (QPointF) : Scene position of the source pin.
+            end (QPointF) : Scene position of the target pin.
+            curved (bool) : Build horizontal bezier curve instead of straight line.
+        """
+        assertRef(start)
+        assertRef(end)
+
+        path: QPainterPath = QPainterPath(start)
+        if curved:
+            # Control points pull the curve out horizontally from both pins
+            offset: float = max(abs(end.x() - start.x()) * 0.5, ConnectionPaths.pin_radius * 4)
+            path.cubicTo(
+                QPointF(start.x() + offset, start.y()),
+                QPointF(end.x() - offset, end.y()),
+                end
+            )
+        else:
+            path.lineTo(end)
+        return path
+
+    @staticmethod
+    def getBounds(path: QPainterPath) -> QRectF:
+        """Get bounding box of connection path including room for the pen and pins"""
+        exp: float = ConnectionPaths.pin_radius * 2
+        return path.controlPointRect().adjusted(-exp, -exp, exp, exp)
 
 
 class ConnectionWidget(QGraphicsWidget):
     """
     Class encapsulates widget representation of node connection.
     Connection is represented by a line connecting two pins between two different nodes.
+    Used for previewing connections while they are being dragged, established connections
+    are drawn by the ConnectionLayer.
     """
-    pin_radius: float = 6
+    pin_radius: float = ConnectionPaths.pin_radius
     depth_order: int = NodeProxyWidget.depth_order - 10
 
-    def __init__(self, uuid: UUID, start: QPointF, end: QPointF) -> None:
+    def __init__(self, uuid: UUID, start: QPointF, end: QPointF, curved: bool = False) -> None:
         super().__init__()
         assertRef(uuid)
         assertRef(start)
@@ -26,31 +81,20 @@ class ConnectionWidget(QGraphicsWidget):
         self.uuid = uuid
         self.start: QPointF = start
         self.end: QPointF = end
+        self.curved: bool = curved
+        self.__pen: QPen = ConnectionPaths.createPen()
+        self.__path: QPainterPath = ConnectionPaths.buildPath(start, end, curved)
         self.setZValue(self.depth_order)
 
     def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: QWidget | None = ...) -> None:
         """Draws the entire widget"""
-        assertRef(self.start)
-        assertRef(self.end)
-
-        pen = QPen(Qt.green)
-        pen.setWidth(3)
-        painter.setPen(pen)
+        painter.setPen(self.__pen)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        painter.drawLine(QLine(self.start.toPoint(), self.end.toPoint()))
+        painter.drawPath(self.__path)
 
     def boundingRect(self) -> QRectF:
         """Get bounding box of this widget"""
-        assertRef(self.start)
-        assertRef(self.end)
-
-        left = min(self.start.x(), self.end.x())
-        right = max(self.start.x(), self.end.x())
-        top = min(self.start.y(), self.end.y())
-        bottom = max(self.start.y(), self.end.y())
-        exp = self.pin_radius * 2
-
-        return QRectF(QPointF(left - exp, top - exp), QPointF(right + exp, bottom + exp))
+        return ConnectionPaths.getBounds(self.__path)
 
     def updateConnectionPoints(self, a: QPointF, b: QPointF) -> None:
         """
@@ -60,7 +104,233 @@ class ConnectionWidget(QGraphicsWidget):
         assertRef(a)
         assertRef(b)
 
+        self.prepareGeometryChange()
         self.start = a
         self.end = b
-        self.prepareGeometryChange()
+        self.__path = ConnectionPaths.buildPath(a, b, self.curved)
         self.update()
+
+
+class ConnectionLayer(QGraphicsObject):
+    """
+    Single graphics item drawing all established node connections of the graph.
+    Path of every connection is cached and only rebuilt when its end points change.
+    Cached paths are bucketed into uniform grid cells so painting only strokes connections
+    overlapping the exposed area and moving a connection only redraws the area it covers.
+    Scheduled connection updates are coalesced and applied at most once per frame.
+    """
+    depth_order: int = NodeProxyWidget.depth_order - 10
+
+    # Interval in milliseconds in which scheduled connection updates are applied
+    update_interval: int = 16
+
+    # Size of grid cells connections are bucketed into, also used as margin when layer bounds grow
+    cell_size: float = 256.0
+
+    def __init__(self, curved: bool = False) -> None:
+        super().__init__()
+        self.__curved: bool = curved
+        self.__detail_level: NodeDetailLevel = NodeDetailLevel.FULL
+        self.__pen: QPen = ConnectionPaths.createPen()
+        self.__ends: dict[UUID, tuple[QPointF, QPointF]] = {}
+        self.__paths: dict[UUID, QPainterPath] = {}
+        self.__bounds: dict[UUID, QRectF] = {}
+        self.__cells: dict[tuple[int, int], set[UUID]] = {}
+
+        # Bounds of the layer only grow while connections are present so moving connections
+        # does not invalidate geometry of the whole layer.
+        self.__rect: QRectF = QRectF()
+
+        # Connections waiting for update mapped to callables resolving their end points
+        self.__pending: dict[UUID, Callable[[], Optional[tuple[QPointF, QPointF]]]] = {}
+        self.__update_timer: QTimer = QTimer(self)
+        self.__update_timer.setSingleShot(True)
+        self.__update_timer.setInterval(self.update_interval)
+        self.__update_timer.timeout.connect(self.flushUpdates)
+
+        # Number of connection paths built, update requests and paths stroked, useful for profiling
+        self.path_builds: int = 0
+        self.update_requests: int = 0
+        self.paths_drawn: int = 0
+        self.setZValue(self.depth_order)
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption)
+
+    def isCurved(self) -> bool:
+        """Check whether connections are drawn as bezier curves"""
+        return self.__curved
+
+    def setCurved(self, curved: bool) -> None:
+        """Set whether connections are drawn as bezier curves or straight lines"""
+        if curved == self.__curved:
+            return
+
+        self.__curved = curved
+        for uuid, (start, end) in list(self.__ends.items()):
+            self._storePath(uuid, start, end)
+
+    def getDetailLevel(self) -> NodeDetailLevel:
+        """Get detail level connections are drawn with"""
+        return self.__detail_level
+
+    def setDetailLevel(self, level: NodeDetailLevel) -> None:
+        """Set detail level of connections, simple detail draws thin lines without antialiasing"""
+        if level is not self.__detail_level:
+            self.__detail_level = level
+            self.__pen = ConnectionPaths.createPen(level)
+            self.update()
+
+    def _buildPath(self, start: QPointF, end: QPointF) -> QPainterPath:
+        self.path_builds += 1
+        return ConnectionPaths.buildPath(start, end, self.__curved)
+
+    def _cellsInRect(self, rect: QRectF) -> Iterator[tuple[int, int]]:
+        """Iterate over grid cells overlapping given rectangle"""
+        left, top = math.floor(rect.left() / self.cell_size), math.floor(rect.top() / self.cell_size)
+        right, bottom = math.floor(rect.right() / self.cell_size), math.floor(rect.bottom() / self.cell_size)
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                yield cx, cy
+
+    def _unindex(self, uuid: UUID, bounds: QRectF) -> None:
+        for cell in self._cellsInRect(bounds):
+            bucket: set[UUID] = self.__cells[cell]
+            bucket.discard(uuid)
+            if not bucket:
+                del self.__cells[cell]
+
+    def _storePath(self, uuid: UUID, start: QPointF, end: QPointF) -> None:
+        """Build and index path of given connection, only area covered by its old and new path is redrawn"""
+        dirty: QRectF = QRectF()
+        old: Optional[QRectF] = self.__bounds.get(uuid)
+        if old is not None:
+            self._unindex(uuid, old)
+            dirty = old
+
+        path: QPainterPath = self._buildPath(start, end)
+        bounds: QRectF = ConnectionPaths.getBounds(path)
+        self.__ends[uuid] = (start, end)
+        self.__paths[uuid] = path
+        self.__bounds[uuid] = bounds
+        for cell in self._cellsInRect(bounds):
+            self.__cells.setdefault(cell, set()).add(uuid)
+
+        if not self.__rect.contains(bounds):
+            # Grow with margin so connections dragged outwards do not change layer geometry every frame
+            self.prepareGeometryChange()
+            margin: float = self.cell_size
+            self.__rect = self.__rect.united(bounds.adjusted(-margin, -margin, margin, margin))
+        self.update(dirty.united(bounds))
+
+    def hasConnection(self, uuid: UUID) -> bool:
+        """Check whether connection of given UUID is drawn by this layer"""
+        return uuid in self.__paths
+
+    def getConnectionCount(self) -> int:
+        """Get number of connections drawn by this layer"""
+        return len(self.__paths)
+
+    def getConnectionPath(self, uuid: UUID) -> Optional[QPainterPath]:
+        """Get cached path of connection matching given UUID"""
+        return self.__paths.get(uuid)
+
+    def getConnectionsInRect(self, rect: QRectF) -> list[UUID]:
+        """Get UUIDs of all connections whose bounds overlap given layer rectangle"""
+        assertRef(rect)
+        rect = rect.intersected(self.__rect)
+        if rect.isEmpty():
+            return []
+
+        found: set[UUID] = set()
+        for cell in self._cellsInRect(rect):
+            bucket: Optional[set[UUID]] = self.__cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        return [uuid for uuid in found if self.__bounds[uuid].intersects(rect)]
+
+    def addConnection(self, uuid: UUID, start: QPointF, end: QPointF) -> None:
+        """
+        Add connection line to this layer.
+
+        Parameters:
+            uuid (UUID) : UUID of the connection.
+            start (QPointF) : Scene position of the source pin.
+            end (QPointF) : Scene position of the target pin.
+        """
+        assertRef(uuid)
+        assertTrue(uuid not in self.__paths, "Connection already present in the layer")
+        self._storePath(uuid, start, end)
+
+    def _setEndPoints(self, uuid: UUID, start: QPointF, end: QPointF) -> bool:
+        """Rebuild path of given connection if its end points changed, returns True if path was rebuilt"""
+        assertTrue(uuid in self.__paths, "Connection is not present in the layer")
+        if self.__ends[uuid] == (start, end):
+            return False
+
+        self._storePath(uuid, start, end)
+        return True
+
+    def updateConnection(self, uuid: UUID, start: QPointF, end: QPointF) -> None:
+        """Update end points of connection matching given UUID, unchanged connections are left untouched"""
+        self._setEndPoints(uuid, start, end)
+
+    def scheduleUpdate(self, uuid: UUID, resolver: Callable[[], Optional[tuple[QPointF, QPointF]]]) -> None:
+        """
+        Schedule update of connection matching given UUID.
+        Any number of requests within single frame result in single update of the connection.
+
+        Parameters:
+            uuid (UUID) : UUID of the connection.
+            resolver (Callable) : Callable returning current source and target pin scene positions,
+                                  None if they can not be resolved and cached path should be kept.
+        """
+        assertTrue(uuid in self.__paths, "Connection is not present in the layer")
+        self.update_requests += 1
+        self.__pending[uuid] = resolver
+
+        # Timer is not restarted by further requests so updates keep flowing during long drags
+        if not self.__update_timer.isActive():
+            self.__update_timer.start()
+
+    def isUpdatePending(self) -> bool:
+        """Check whether any connection update is waiting to be applied"""
+        return len(self.__pending) > 0
+
+    def flushUpdates(self) -> None:
+        """Apply all scheduled connection updates immediately"""
+        self.__update_timer.stop()
+        pending: dict[UUID, Callable[[], Optional[tuple[QPointF, QPointF]]]] = self.__pending
+        self.__pending = {}
+        for uuid, resolver in pending.items():
+            # End points are unknown while any of the connected nodes has no widget
+            ends: Optional[tuple[QPointF, QPointF]] = resolver()
+            if ends is None:
+                continue
+            self._setEndPoints(uuid, *ends)
+
+    def removeConnection(self, uuid: UUID) -> None:
+        """Remove connection matching given UUID from this layer"""
+        self.__pending.pop(uuid, None)
+        if self.__paths.pop(uuid, None) is None:
+            return
+
+        del self.__ends[uuid]
+        bounds: QRectF = self.__bounds.pop(uuid)
+        self._unindex(uuid, bounds)
+        if self.__paths:
+            self.update(bounds)
+        else:
+            self.prepareGeometryChange()
+            self.__rect = QRectF()
+
+    def boundingRect(self) -> QRectF:
+        """Get bounding box enclosing all connections"""
+        return self.__rect
+
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: QWidget | None = ...) -> None:
+        """Draws connections overlapping the exposed area"""
+        painter.setPen(self.__pen)
+        painter.setBrush(Qt.NoBrush)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, self.__detail_level is NodeDetailLevel.FULL)
+        for uuid in self.getConnectionsInRect(option.exposedRect):
+            painter.drawPath(self.__paths[uuid])
+            self.paths_drawn += 1
@@ -1,11 +1,112 @@
+from __future__ import annotations
 from typing import Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from collections import OrderedDict
 import os
-import importlib.resources as res
+import ctypes
+import struct
+import hashlib
+import logging as Log
 import numpy as np
 import OpenGL.GL as GL
+from OpenGL.error import GLError
+from OpenGL.GL.KHR import parallel_shader_compile as KHRParallel
+from OpenGL.GL.ARB import parallel_shader_compile as ARBParallel
 
 from .asserts import assertRef, assertTrue, assertType
+from .shadertemplates import ShaderTemplateRegistry
+from .gfxmeshes import GFXMeshData, GFXMeshes
+from .gfxresources import GFXResourceManager, GFXResourceKind, GFXResource
+from .vectors import Vec3F
+
+@dataclass
+class GFXVertexAttribute:
+    """
+    Single float vertex attribute stored within interleaved vertex buffer.
+    Offset is in bytes from the start of the vertex.
+    """
+    name: str
+    size: int
+    location: int
+    offset: int = 0
+
+
+class GFXVertexLayout:
+    """
+    Description of interleaved vertex buffer layout.
+    All attributes are stored as 32bit floats one vertex after another.
+    """
+    # Vertex attribute locations shared by all shader programs.
+    # Attributes not listed here are assigned locations following the standard ones.
+    standard_locations: dict[str, int] = {
+        "position": 0,
+        "color": 1,
+        "normal": 2,
+        "uv": 3,
+        "tangent": 4
+    }
+    # Component counts of standard attributes, flat arrays of these attributes are split accordingly
+    standard_sizes: dict[str, int] = {
+        "position": 3,
+        "color": 3,
+        "normal": 3,
+        "uv": 2,
+        "tangent": 3
+    }
+
+    def __init__(self, attributes: list[GFXVertexAttribute]) -> None:
+        assertTrue(len(attributes) > 0, "Vertex layout has no attributes")
+        self.attributes: list[GFXVertexAttribute] = attributes
+        self.stride: int = 0
+        for attribute in self.attributes:
+            assertTrue(attribute.size > 0, f"Invalid size of vertex attribute '{attribute.name}'")
+            attribute.offset = self.stride
+            self.stride += attribute.size * np.dtype(np.float32).itemsize
+
+    @staticmethod
+    def fromArrays(arrays: dict[str, np.ndarray]) -> GFXVertexLayout:
+        """Create layout describing given per vertex attribute arrays keyed by attribute name"""
+        next_location: int = max(GFXVertexLayout.standard_locations.values()) + 1
+        attributes: list[GFXVertexAttribute] = []
+        for name, array in arrays.items():
+            location: Optional[int] = GFXVertexLayout.standard_locations.get(name)
+            if location is None:
+                location = next_location
+                next_location += 1
+            size: Optional[int] = GFXVertexLayout.standard_sizes.get(name)
+            if size is None:
+                size = 1 if array.ndim == 1 else array.shape[1]
+            assertTrue(array.size % size == 0, f"Data of vertex attribute '{name}' does not match its size")
+            attributes.append(GFXVertexAttribute(name, size, location, 0))
+        return GFXVertexLayout(attributes)
+
+    def getAttribute(self, name: str) -> Optional[GFXVertexAttribute]:
+        """Get attribute of given name, None if layout does not contain such attribute"""
+        for attribute in self.attributes:
+            if attribute.name == name:
+                return attribute
+        return None
+
+    def interleave(self, arrays: dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Pack given per vertex attribute arrays into single interleaved vertex array.
+
+        Parameters:
+            arrays (dict[str, np.ndarray]) : Attribute arrays keyed by attribute name.
+
+        Returns:
+            np.ndarray : Contiguous (vertex count, stride / 4) float32 array.
+        """
+        columns: list[np.ndarray] = []
+        for attribute in self.attributes:
+            array: Optional[np.ndarray] = arrays.get(attribute.name)
+            assertRef(array, f"Missing data of vertex attribute '{attribute.name}'")
+            columns.append(np.asarray(array, dtype=np.float32).reshape(-1, attribute.size))
+
+        count: int = len(columns[0])
+        assertTrue(all(len(column) == count for column in columns), "Vertex attribute arrays differ in length")
+        return np.ascontiguousarray(np.hstack(columns), dtype=np.float32)
+
 
 @dataclass
 class GFXRenderable:
@@ -16,6 +117,398 @@ class GFXRenderable:
     indices: list[int]
     colors: list[float]
     normals: list[float]
+    # Additional per vertex attributes such as uv or tangent keyed by attribute name
+    attributes: dict[str, np.ndarray] = field(default_factory=dict)
+    layout: Optional[GFXVertexLayout] = None
+
+    def getVertexArrays(self) -> dict[str, np.ndarray]:
+        """Get all per vertex attribute arrays keyed by attribute name"""
+        arrays: dict[str, np.ndarray] = {
+            "position": self.vertices,
+            "color": self.colors,
+            "normal": self.normals
+        }
+        arrays.update(self.attributes)
+        return arrays
+
+
+class GFXProgramCache:
+    """
+    Least recently used cache of linked shader programs keyed by hash of their sources.
+    Programs evicted from the cache are deleted, cache must be used with its GL context current.
+    When resource manager is given the cache holds a reference to every cached program instead,
+    so programs still in use elsewhere outlive their eviction.
+    """
+
+    def __init__(self, capacity: int = 16, resources: Optional[GFXResourceManager] = None) -> None:
+        assertTrue(capacity > 0, "Program cache capacity must be positive")
+        self.capacity: int = capacity
+        self.resources: Optional[GFXResourceManager] = resources
+        self.hits: int = 0
+        self.misses: int = 0
+        self.__programs: OrderedDict[str, GL.GLuint] = OrderedDict()
+
+    @staticmethod
+    def hashSources(vs_src: str, ps_src: str) -> str:
+        """Get cache key identifying shader program built from given sources"""
+        assertType(vs_src, str)
+        assertType(ps_src, str)
+        digest = hashlib.sha1(vs_src.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(ps_src.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[GL.GLuint]:
+        """Get cached program matching given key, None if the program is not cached"""
+        program: Optional[GL.GLuint] = self.__programs.get(key)
+        if program is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.__programs.move_to_end(key)
+        return program
+
+    def put(self, key: str, program: GL.GLuint) -> None:
+        """Add program to the cache, least recently used programs are deleted when over capacity"""
+        assertRef(program)
+        replaced: Optional[GL.GLuint] = self.__programs.get(key)
+        if replaced == program:
+            self.__programs.move_to_end(key)
+            return
+
+        if self.resources is not None:
+            self.resources.trackProgram(program, f"program {key[:8]}")
+        if replaced is not None:
+            self._releaseProgram(replaced)
+
+        self.__programs[key] = program
+        self.__programs.move_to_end(key)
+        while len(self.__programs) > self.capacity:
+            evicted_key, evicted = self.__programs.popitem(last=False)
+            Log.debug(f"Evicting shader program from cache -> {evicted_key}")
+            self._releaseProgram(evicted)
+
+    def clear(self) -> None:
+        """Delete all cached programs"""
+        for program in self.__programs.values():
+            self._releaseProgram(program)
+        self.__programs.clear()
+
+    def _releaseProgram(self, program: GL.GLuint) -> None:
+        """Drop reference to program removed from the cache"""
+        if self.resources is not None:
+            self.resources.release(GFXResourceKind.PROGRAM, program)
+        else:
+            GL.glDeleteProgram(program)
+
+    def getHitRate(self) -> float:
+        """Get ratio of cache lookups which found matching program"""
+        lookups: int = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+    def __len__(self) -> int:
+        return len(self.__programs)
+
+
+class GFXProgramBinaryCache:
+    """
+    On disk cache of linked shader program binaries persisted across sessions.
+    Binaries are keyed by program source hash along with vendor, renderer and version
+    of the OpenGL implementation which produced them.
+    Cache must be created and used with its GL context current.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None) -> None:
+        self.cache_dir: str = cache_dir or GFXProgramBinaryCache.getDefaultCacheDir()
+        self.enabled: bool = GFXProgramBinaryCache.isSupported()
+        self.__context_key: str = GFXProgramBinaryCache.getContextKey() if self.enabled else ""
+        if not self.enabled:
+            Log.info("Program binaries are not supported by OpenGL context, binary cache disabled")
+
+    @staticmethod
+    def getDefaultCacheDir() -> str:
+        """Get default directory for program binaries inside user cache directory"""
+        cache_root: str = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return os.path.join(cache_root, "shadercraft", "programs")
+
+    @staticmethod
+    def isSupported() -> bool:
+        """Get value indicating if current OpenGL context can save and load program binaries"""
+        try:
+            if not bool(GL.glGetProgramBinary) or not bool(GL.glProgramBinary):
+                return False
+            return GL.glGetIntegerv(GL.GL_NUM_PROGRAM_BINARY_FORMATS) > 0
+        except GLError:
+            return False
+
+    @staticmethod
+    def getContextKey() -> str:
+        """Get string identifying OpenGL implementation of current context"""
+        items: list[str] = []
+        for name in (GL.GL_VENDOR, GL.GL_RENDERER, GL.GL_VERSION):
+            value: Optional[bytes] = GL.glGetString(name)
+            items.append(value.decode() if value else "")
+        return "|".join(items)
+
+    def getPath(self, source_hash: str) -> str:
+        """Get filepath of the program binary matching given source hash"""
+        assertType(source_hash, str)
+        digest = hashlib.sha1(self.__context_key.encode("utf-8"))
+        digest.update(source_hash.encode("utf-8"))
+        return os.path.join(self.cache_dir, f"{digest.hexdigest()}.bin")
+
+    def load(self, source_hash: str) -> Optional[GL.GLuint]:
+        """
+        Create shader program from cached binary matching given source hash.
+        Invalid binaries are removed from the cache.
+
+        Returns:
+            GL.GLuint : OpenGL handle to linked shader program, None if binary is not available.
+        """
+        if not self.enabled:
+            return None
+
+        path: str = self.getPath(source_hash)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "rb") as file:
+                data: bytes = file.read()
+        except OSError as err:
+            Log.warning(f"Failed to read program binary -> {path}: {err}")
+            return None
+
+        header_size: int = struct.calcsize("<I")
+        if len(data) <= header_size:
+            self._discard(path)
+            return None
+
+        binary_format: int = struct.unpack_from("<I", data)[0]
+        binary: np.ndarray = np.frombuffer(data, dtype=np.uint8, offset=header_size)
+        program: GL.GLuint = GL.glCreateProgram()
+        try:
+            GL.glProgramBinary(program, binary_format, binary, binary.nbytes)
+            linked: bool = bool(GL.glGetProgramiv(program, GL.GL_LINK_STATUS))
+        except GLError:
+            linked = False
+
+        if not linked:
+            Log.warning(f"Cached program binary was rejected by OpenGL driver -> {path}")
+            GL.glDeleteProgram(program)
+            self._discard(path)
+            return None
+
+        Log.debug(f"Loaded shader program from binary cache -> {path}")
+        return program
+
+    def save(self, source_hash: str, program: GL.GLuint) -> bool:
+        """
+        Save binary of given linked shader program to the cache.
+
+        Returns:
+            bool : True if binary was saved, False otherwise.
+        """
+        assertRef(program)
+        if not self.enabled:
+            return False
+
+        try:
+            length: int = GL.glGetProgramiv(program, GL.GL_PROGRAM_BINARY_LENGTH)
+            if length <= 0:
+                return False
+            binary, binary_format, written = GL.glGetProgramBinary(program, length)
+        except GLError as err:
+            Log.warning(f"Failed to retrieve shader program binary: {err}")
+            return False
+
+        path: str = self.getPath(source_hash)
+        tmp_path: str = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as file:
+                file.write(struct.pack("<I", int(binary_format)))
+                file.write(np.asarray(binary, dtype=np.uint8)[:int(written)].tobytes())
+            os.replace(tmp_path, path)
+        except OSError as err:
+            Log.warning(f"Failed to write program binary -> {path}: {err}")
+            return False
+
+        Log.debug(f"Saved shader program binary -> {path}")
+        return True
+
+    @staticmethod
+    def _discard(path: str) -> None:
+        """Remove cached binary file"""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class GFXProgramBuild:
+    """
+    Shader program being compiled and linked by the OpenGL driver.
+    When parallel shader compilation is enabled the driver builds the program on its own threads
+    and build completion can be polled without blocking, otherwise build completes on first query.
+    Build must be polled and finished with the GL context it was started in current.
+    """
+
+    def __init__(self, vs_src: str, ps_src: str, retrievable: bool = False, parallel: bool = False) -> None:
+        assertType(vs_src, str)
+        assertType(ps_src, str)
+        self.parallel: bool = parallel
+        self.__shaders: list[GL.GLuint] = []
+        self.__program: Optional[GL.GLuint] = GL.glCreateProgram()
+        assertRef(self.__program, "Failed to initialise OpenGL shader program")
+
+        # Status of shaders and program is not queried here as that would wait for the driver
+        for src, shader_type in ((vs_src, GL.GL_VERTEX_SHADER), (ps_src, GL.GL_FRAGMENT_SHADER)):
+            shader: GL.GLuint = GL.glCreateShader(shader_type)
+            assertTrue(shader != 0, "Failed to create shader object")
+            GL.glShaderSource(shader, src)
+            GL.glCompileShader(shader)
+            GL.glAttachShader(self.__program, shader)
+            self.__shaders.append(shader)
+
+        GFX.bindStandardAttribLocations(self.__program)
+        if retrievable:
+            GL.glProgramParameteri(self.__program, GL.GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL.GL_TRUE)
+        GL.glLinkProgram(self.__program)
+
+    def isReady(self) -> bool:
+        """Get value indicating if the build can be finished without blocking"""
+        if self.__program is None or not self.parallel:
+            return True
+        # PyOpenGL does not know output size of extension queries so result array is passed explicitly
+        status: np.ndarray = np.zeros(1, dtype=np.int32)
+        GL.glGetProgramiv(self.__program, KHRParallel.GL_COMPLETION_STATUS_KHR, status)
+        return bool(status[0])
+
+    def finish(self) -> Optional[GL.GLuint]:
+        """
+        Complete the build, blocks until the driver finishes if the build is not ready yet.
+
+        Returns:
+            GL.GLuint : OpenGL handle to linked shader program, None if build failed or was cancelled.
+        """
+        program: Optional[GL.GLuint] = self.__program
+        if program is None:
+            return None
+
+        for shader in self.__shaders:
+            if not GL.glGetShaderiv(shader, GL.GL_COMPILE_STATUS):
+                Log.error(f"Failed to compile shader: {GL.glGetShaderInfoLog(shader)}")
+        linked: bool = bool(GL.glGetProgramiv(program, GL.GL_LINK_STATUS))
+        if not linked:
+            Log.error(f"Failed to link shader program: {GL.glGetProgramInfoLog(program)}")
+
+        self._release(delete_program=not linked)
+        return program if linked else None
+
+    def cancel(self) -> None:
+        """Abandon the build and delete all its objects"""
+        self._release(delete_program=True)
+
+    def _release(self, delete_program: bool) -> None:
+        """Delete intermediate shader objects and optionally the program itself"""
+        for shader in self.__shaders:
+            GL.glDeleteShader(shader)
+        self.__shaders.clear()
+        if delete_program and self.__program is not None:
+            GL.glDeleteProgram(self.__program)
+        self.__program = None
+
+
+class GFXStateCache:
+    """
+    Thin layer tracking OpenGL state of single context so redundant state changes are skipped.
+    Uniform locations along with uploaded uniform values are cached per program.
+    All changes of tracked state have to go through the cache, invalidate() must be called
+    whenever other code could have changed the bindings.
+    """
+
+    def __init__(self) -> None:
+        self.issued: int = 0
+        self.skipped: int = 0
+        self.__program: Optional[int] = None
+        self.__vertex_array: Optional[int] = None
+        self.__uniform_locations: dict[int, dict[str, int]] = {}
+        self.__uniform_values: dict[int, dict[int, tuple[float, ...]]] = {}
+
+    def invalidate(self) -> None:
+        """Forget tracked bindings so the next binds are issued unconditionally"""
+        self.__program = None
+        self.__vertex_array = None
+
+    def useProgram(self, program: GL.GLuint) -> None:
+        """Bind shader program unless it is already bound"""
+        if self.__program == int(program):
+            self.skipped += 1
+            return
+        GL.glUseProgram(program)
+        self.__program = int(program)
+        self.issued += 1
+
+    def bindVertexArray(self, vao: GL.GLuint) -> None:
+        """Bind vertex array unless it is already bound"""
+        if self.__vertex_array == int(vao):
+            self.skipped += 1
+            return
+        GL.glBindVertexArray(vao)
+        self.__vertex_array = int(vao)
+        self.issued += 1
+
+    def getUniformLocation(self, program: GL.GLuint, name: str) -> int:
+        """Get location of named uniform of given program, -1 if the program has no such uniform"""
+        locations: dict[str, int] = self.__uniform_locations.setdefault(int(program), {})
+        location: Optional[int] = locations.get(name)
+        if location is None:
+            location = int(GL.glGetUniformLocation(program, name))
+            locations[name] = location
+        return location
+
+    def setUniform(self, program: GL.GLuint, name: str, value: object) -> None:
+        """
+        Upload float or Vec3F uniform value of given program unless the program already holds it.
+        Program has to be bound through the cache first.
+        """
+        assertTrue(self.__program == int(program), "Uniforms can only be set on bound program")
+
+        # Compiler drops uniforms which do not contribute to the output
+        location: int = self.getUniformLocation(program, name)
+        if location == -1:
+            return
+
+        components: tuple[float, ...] = (value.x, value.y, value.z) if isinstance(value, Vec3F) else (value,)
+        values: dict[int, tuple[float, ...]] = self.__uniform_values.setdefault(int(program), {})
+        if values.get(location) == components:
+            self.skipped += 1
+            return
+
+        if len(components) == 3:
+            GL.glUniform3f(location, *components)
+        else:
+            GL.glUniform1f(location, *components)
+        values[location] = components
+        self.issued += 1
+
+    def forgetProgram(self, program: GL.GLuint) -> None:
+        """Drop everything cached for given program, must be called once the program is deleted"""
+        self.__uniform_locations.pop(int(program), None)
+        self.__uniform_values.pop(int(program), None)
+        if self.__program == int(program):
+            self.__program = None
+
+    def onResourceDeleted(self, resource: GFXResource) -> None:
+        """Forget state referring to OpenGL object deleted by resource manager"""
+        if resource.kind == GFXResourceKind.PROGRAM:
+            self.forgetProgram(resource.handle)
+        elif resource.kind == GFXResourceKind.VERTEX_ARRAY and self.__vertex_array == resource.handle:
+            self.__vertex_array = None
 
 
 class GFX:
@@ -45,48 +538,45 @@ class GFX:
         GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, ebo)
         GL.glBufferData(
             GL.GL_ELEMENT_ARRAY_BUFFER,
-            len(renderable.indices),
+            renderable.indices.nbytes,
             renderable.indices,
             GL.GL_STATIC_DRAW
         )
 
-        vbo: GL.GLuint = GL.glGenBuffers(3)
-
-        # Vertex position buffer data
-        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, vbo[0])
+        # Interleaved vertex buffer data
+        # Attribute locations are fixed by the layout so the vertex array is valid for any shader program
+        layout: GFXVertexLayout = renderable.layout or GFXVertexLayout.fromArrays(renderable.getVertexArrays())
+        vertex_data: np.ndarray = layout.interleave(renderable.getVertexArrays())
+        vbo: GL.GLuint = GL.glGenBuffers(1)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, vbo)
         GL.glBufferData(
             GL.GL_ARRAY_BUFFER,
-            renderable.vertices.nbytes,
-            renderable.vertices,
+            vertex_data.nbytes,
+            vertex_data,
             GL.GL_STATIC_DRAW
         )
 
-        # Vertex color buffer data
-        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, vbo[1])
-        GL.glBufferData(
-            GL.GL_ARRAY_BUFFER,
-            renderable.colors.nbytes,
-            renderable.colors,
-            GL.GL_STATIC_DRAW
-        )
-
-        # Vertex normal buffer data
-        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, vbo[2])
-        GL.glBufferData(
-            GL.GL_ARRAY_BUFFER,
-            renderable.normals.nbytes,
-            renderable.normals,
-            GL.GL_STATIC_DRAW
-        )
+        for attribute in layout.attributes:
+            GL.glVertexAttribPointer(
+                attribute.location,
+                attribute.size,
+                GL.GL_FLOAT,
+                GL.GL_FALSE,
+                layout.stride,
+                ctypes.c_void_p(attribute.offset)
+            )
+            GL.glEnableVertexAttribArray(attribute.location)
 
         # Unbind all buffers
+        # Vertex array has to be unbound first so it keeps its element buffer binding
+        GL.glBindVertexArray(0)
         GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
         GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, 0)
-        GL.glBindVertexArray(0)
 
         renderable.vbo = vbo
         renderable.vao = vao
         renderable.ebo = ebo
+        renderable.layout = layout
 
     @staticmethod
     def createTriangleRenderable() -> GFXRenderable:
@@ -94,7 +584,7 @@ class GFX:
             -0.5, -0.5, 0.0,
             0.5, -0.5, 0.0,
             0.0, 0.5, 0.0
-        ], dtype=np.float32)
+        ], dtype=np.float32).reshape(-1, 3)
 
         indices: np.array = np.array([
             0,
@@ -106,13 +596,13 @@ class GFX:
             1.0, 1.0, 1.0,
             1.0, 1.0, 1.0,
             1.0, 1.0, 1.0
-        ], dtype=np.float32)
+        ], dtype=np.float32).reshape(-1, 3)
 
         normals: np.array = np.array([
             0.0, 0.0, 1.0,
             0.0, 0.0, 1.0,
             0.0, 0.0, 1.0
-        ], dtype=np.float32)
+        ], dtype=np.float32).reshape(-1, 3)
 
 
         renderable: GFXRenderable = GFXRenderable(
@@ -141,119 +631,63 @@ class GFX:
         Returns:
             Renderable (GFXRenderable): Renderable structure containing sphere geometry
         """
+        return GFX.createMeshRenderable(GFXMeshes.sphere(radius, vsubdiv, hsubdiv))
+
+    @staticmethod
+    def createMeshRenderable(mesh: GFXMeshData) -> GFXRenderable:
+        """
+        Create renderable from given mesh data and upload its buffers.
 
-        # Generate sphere vertex positions and normal vector
-        vertices: list[float] = []
-        normals: list[float] = []
-        colors: list[float] = []
-        for i in range(vsubdiv + 1):
-            vangle: float = np.pi / 2 - i * (np.pi / vsubdiv)
-            xy: float = np.cos(vangle)
-            z: float = np.sin(vangle)
-
-            for j in range(hsubdiv + 1):
-                hangle: float = j * (2 * np.pi / hsubdiv)
-                x: float = xy * np.cos(hangle)
-                y: float = xy * np.sin(hangle)
-                vertices.append([x, y, z])
-
-                mag: float = np.sqrt(x*x + y*y + z*z)
-                normals.append([x/mag, y/mag, z/mag])
-                colors.append([1.0, 1.0, 1.0])
-
-        # Generate sphere vertex indices
-        indices: list[int] = []
-        for i in range(vsubdiv):
-            for j in range(hsubdiv):
-                t0: int = i * (hsubdiv + 1) + j
-                t1: int = t0 + hsubdiv + 1
-
-                # First triangle of sphere quad at given subdivision
-                indices.append(t0)
-                indices.append(t1)
-                indices.append(t0 + 1)
-
-                # Second triangle of sphere quad at given subdivision
-                indices.append(t1)
-                indices.append(t1 + 1)
-                indices.append(t0 + 1)
+        Parameters:
+            mesh (GFXMeshData): Mesh geometry data.
 
+        Returns:
+            Renderable (GFXRenderable): Renderable structure containing mesh geometry
+        """
+        assertRef(mesh)
         renderable: GFXRenderable = GFXRenderable(
             0,
             0,
             0,
-            np.array(vertices, dtype=np.float32),
-            np.array(indices, dtype=np.uint32),
-            np.array(colors, dtype=np.float32),
-            np.array(normals, dtype=np.float32)
+            mesh.vertices,
+            mesh.indices,
+            mesh.colors,
+            mesh.normals,
+            dict(mesh.attributes)
         )
 
         GFX.initRenderableBuffers(renderable)
         return renderable
 
     @staticmethod
-    def bindRenderableShader(renderable: GFXRenderable, shader: GL.GLuint) -> None:
+    def enableParallelShaderCompile() -> bool:
         """
-        Binds renderable buffer data to given shader vertex attributes.
-
-        Parameters:
-            renderable (GFXRenderable) : Renderable structure with buffer data.
-            shader (Gl.GLuint) : Compiled shader object handle.
+        Let the driver compile shaders on its own threads when KHR or ARB parallel shader compile
+        extension is available in current OpenGL context.
 
         Returns:
-            None
+            bool : True if parallel shader compilation is enabled, False otherwise.
         """
-        assertTrue(renderable.vbo is not None, "Invalid vertex buffer object")
-        assertTrue(renderable.vao != 0, "Invalid vertex attribute object")
-        assertTrue(renderable.ebo != 0, "Invalid element buffer object")
-        assertRef(shader != 0)
-
-        GL.glBindVertexArray(renderable.vao)
-
-        # Vertex positon vertex attributes
-        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, renderable.vbo[0])
-        layout_position: int = GL.glGetAttribLocation(shader, "position")
-        assertTrue(layout_position != -1, "Failed to resolve 'position' vertex layout ID")
-        GL.glVertexAttribPointer(
-            layout_position,
-            3,
-            GL.GL_FLOAT,
-            GL.GL_FALSE,
-            3 * renderable.vertices.itemsize,
-            None
-        )
-        GL.glEnableVertexAttribArray(layout_position)
-
-        # Vertex color vertex attributes
-        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, renderable.vbo[1])
-        layout_color: int = GL.glGetAttribLocation(shader, "color")
-        if layout_color != -1:
-            GL.glVertexAttribPointer(
-                layout_color,
-                3,
-                GL.GL_FLOAT,
-                GL.GL_TRUE,
-                3 * renderable.colors.itemsize,
-                None
-            )
-            GL.glEnableVertexAttribArray(layout_color)
+        try:
+            if KHRParallel.glInitParallelShaderCompileKHR():
+                KHRParallel.glMaxShaderCompilerThreadsKHR(0xFFFFFFFF)
+                return True
+            if ARBParallel.glInitParallelShaderCompileARB():
+                ARBParallel.glMaxShaderCompilerThreadsARB(0xFFFFFFFF)
+                return True
+        except GLError as err:
+            Log.warning(f"Failed to enable parallel shader compilation: {err}")
+        return False
 
-        # Vertex normal vertex attributes
-        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, renderable.vbo[2])
-        layout_normal: int = GL.glGetAttribLocation(shader, "normal")
-        if layout_normal != -1:
-            GL.glVertexAttribPointer(
-                layout_normal,
-                3,
-                GL.GL_FLOAT,
-                GL.GL_TRUE,
-                3 * renderable.normals.itemsize,
-                None
-            )
-            GL.glEnableVertexAttribArray(layout_normal)
-
-        GL.glBindVertexArray(0)
-        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+    @staticmethod
+    def bindStandardAttribLocations(program: GL.GLuint) -> None:
+        """
+        Bind vertex attribute names to standard vertex layout locations, must be called before linking.
+        Shaders declaring explicit attribute locations are expected to use the same locations.
+        """
+        assertRef(program)
+        for name, location in GFXVertexLayout.standard_locations.items():
+            GL.glBindAttribLocation(program, location, name)
 
     @staticmethod
     def createFallbackShaderProgram() -> Optional[GL.GLuint]:
@@ -261,14 +695,13 @@ class GFX:
         Creates minimalistic shader program which draws magenta solid color.
         """
 
-        vs_src: str = res.files(r"shadercraft.resources.shaders").joinpath("fallback.vs")
-        ps_src: str = res.files(r"shadercraft.resources.shaders").joinpath("fallback.ps")
+        vs_src: str = ShaderTemplateRegistry.default().getSource("fallback.vs")
+        ps_src: str = ShaderTemplateRegistry.default().getSource("fallback.ps")
         assertRef(vs_src)
         assertRef(ps_src)
 
-        vs: GL.GLuint = GFX.compileShaderSourcefile(str(vs_src), GL.GL_VERTEX_SHADER)
-        ps: GL.GLuint = GFX.compileShaderSourcefile(str(ps_src), GL.GL_FRAGMENT_SHADER,
-                                                    console_output=True)
+        vs: GL.GLuint = GFX.compileShaderSource(vs_src, GL.GL_VERTEX_SHADER)
+        ps: GL.GLuint = GFX.compileShaderSource(ps_src, GL.GL_FRAGMENT_SHADER, console_output=True)
         assertRef(vs, "Failed to compile fallback vertex shader")
         assertRef(ps, "Failed to compile fallback pixel shader")
 
@@ -277,6 +710,7 @@ class GFX:
 
         GL.glAttachShader(program, vs)
         GL.glAttachShader(program, ps)
+        GFX.bindStandardAttribLocations(program)
         GL.glLinkProgram(program)
 
         GL.glDeleteShader(vs)
@@ -302,21 +736,57 @@ class GFX:
         assertTrue(os.path.exists(vs))
         assertTrue(os.path.exists(ps))
 
-        vertex: GL.GLuint = GFX.compileShaderSourcefile(str(vs), GL.GL_VERTEX_SHADER)
-        pixel: GL.GLuint = GFX.compileShaderSourcefile(str(ps), GL.GL_FRAGMENT_SHADER, console_output=True)
-        assertRef(vertex, "Failed to compile vertex shader")
-        assertRef(pixel, "Failed to compile pixel shader")
+        with open(vs, "r", encoding="utf-8") as file:
+            vs_src: str = file.read()
+        with open(ps, "r", encoding="utf-8") as file:
+            ps_src: str = file.read()
+
+        return GFX.createShaderFromSource(vs_src, ps_src)
+
+    @staticmethod
+    def createShaderFromSource(vs_src: str, ps_src: str, retrievable: bool = False) -> Optional[GL.GLuint]:
+        """
+        Compiles and links shader program from given in memory shader sources.
+
+        Parameters:
+            vs_src (str) : Vertex shader source code.
+            ps_src (str) : Pixel shader source code.
+            retrievable (bool) : Hint that program binary is going to be retrieved after linking.
+
+        Returns:
+            GL.GLuint : OpenGL handle to linked shader program, None if failed.
+        """
+
+        assertType(vs_src, str)
+        assertType(ps_src, str)
+
+        vertex: GL.GLuint = GFX.compileShaderSource(vs_src, GL.GL_VERTEX_SHADER)
+        pixel: GL.GLuint = GFX.compileShaderSource(ps_src, GL.GL_FRAGMENT_SHADER, console_output=True)
+        if vertex is None or pixel is None:
+            Log.error("Failed to compile shader program sources")
+            for shader in (vertex, pixel):
+                if shader is not None:
+                    GL.glDeleteShader(shader)
+            return None
 
         program: GL.GLuint = GL.glCreateProgram()
         assertRef(program, "Failed to initialise OpenGL shader program")
 
         GL.glAttachShader(program, vertex)
         GL.glAttachShader(program, pixel)
+        GFX.bindStandardAttribLocations(program)
+        if retrievable:
+            GL.glProgramParameteri(program, GL.GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL.GL_TRUE)
         GL.glLinkProgram(program)
 
         GL.glDeleteShader(vertex)
         GL.glDeleteShader(pixel)
 
+        if not GL.glGetProgramiv(program, GL.GL_LINK_STATUS):
+            Log.error(f"Failed to link shader program: {GL.glGetProgramInfoLog(program)}")
+            GL.glDeleteProgram(program)
+            return None
+
         return program
 
     @staticmethod
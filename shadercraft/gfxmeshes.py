@@ -0,0 +1,230 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from functools import lru_cache
+import numpy as np
+
+from .asserts import assertTrue
+
+
+@dataclass
+class GFXMeshData:
+    """
+    Class holding CPU side geometry data of a mesh.
+    Vertex attribute arrays are (N, 3) float32 arrays and indices are flat uint32 triangle list.
+    Additional attributes such as uv or tangent are (N, size) float32 arrays keyed by attribute name.
+    Mesh data is shared between callers and is therefore read only.
+    """
+    vertices: np.ndarray
+    indices: np.ndarray
+    colors: np.ndarray
+    normals: np.ndarray
+    attributes: dict[str, np.ndarray] = field(default_factory=dict)
+
+    @staticmethod
+    def fromArrays(
+            vertices: np.ndarray,
+            indices: np.ndarray,
+            normals: np.ndarray,
+            attributes: dict[str, np.ndarray] = None
+    ) -> GFXMeshData:
+        """Create read only mesh data with white vertex colors from given arrays"""
+        vertices = np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 3)
+        normals = np.ascontiguousarray(normals, dtype=np.float32).reshape(-1, 3)
+        indices = np.ascontiguousarray(indices, dtype=np.uint32).reshape(-1)
+        colors = np.ones_like(vertices)
+        assertTrue(vertices.shape == normals.shape, "Mesh normals do not match vertices")
+
+        extra: dict[str, np.ndarray] = {}
+        for name, array in (attributes or {}).items():
+            array = np.ascontiguousarray(array, dtype=np.float32).reshape(len(vertices), -1)
+            extra[name] = array
+
+        for array in (vertices, indices, colors, normals, *extra.values()):
+            array.flags.writeable = False
+        return GFXMeshData(vertices, indices, colors, normals, extra)
+
+
+class GFXMeshes:
+    """
+    Utility class for generating preview primitive meshes.
+    Generated meshes are memoized by their parameters.
+    """
+
+    @staticmethod
+    def gridIndices(rows: int, cols: int) -> np.ndarray:
+        """
+        Generate triangle indices for grid of (rows + 1) x (cols + 1) vertices.
+        Every grid quad is split into two triangles.
+        """
+        i, j = np.meshgrid(np.arange(rows), np.arange(cols), indexing="ij")
+        t0: np.ndarray = (i * (cols + 1) + j).astype(np.uint32)
+        t1: np.ndarray = t0 + cols + 1
+        return np.stack([t0, t1, t0 + 1, t1, t1 + 1, t0 + 1], axis=-1).reshape(-1)
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def sphere(radius: float, vsubdiv: int, hsubdiv: int) -> GFXMeshData:
+        """
+        Generate sphere mesh.
+
+        Parameters:
+            radius (float): Sphere radius.
+            vsubdiv (int): Number of vertecal subdivisions.
+            hsubdiv (int): Number of horizontal subdivisions.
+        """
+        assertTrue(vsubdiv > 0 and hsubdiv > 0, "Invalid sphere subdivisions")
+
+        vangle: np.ndarray = np.pi / 2 - np.arange(vsubdiv + 1) * (np.pi / vsubdiv)
+        hangle: np.ndarray = np.arange(hsubdiv + 1) * (2 * np.pi / hsubdiv)
+        xy: np.ndarray = np.cos(vangle)[:, None]
+        z: np.ndarray = np.broadcast_to(np.sin(vangle)[:, None], (vsubdiv + 1, hsubdiv + 1))
+
+        normals: np.ndarray = np.stack([
+            xy * np.cos(hangle)[None, :],
+            xy * np.sin(hangle)[None, :],
+            z
+        ], axis=-1).reshape(-1, 3)
+        normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+        v, u = np.meshgrid(np.linspace(0.0, 1.0, vsubdiv + 1), np.linspace(0.0, 1.0, hsubdiv + 1), indexing="ij")
+
+        return GFXMeshData.fromArrays(
+            normals * radius,
+            GFXMeshes.gridIndices(vsubdiv, hsubdiv),
+            normals,
+            {"uv": np.stack([u, v], axis=-1)}
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def plane(size: float, subdiv: int = 1) -> GFXMeshData:
+        """
+        Generate square plane mesh lying in XY plane facing positive Z axis.
+
+        Parameters:
+            size (float): Length of the plane edge.
+            subdiv (int): Number of subdivisions along each edge.
+        """
+        assertTrue(subdiv > 0, "Invalid plane subdivisions")
+
+        steps: np.ndarray = np.linspace(-0.5 * size, 0.5 * size, subdiv + 1)
+        y, x = np.meshgrid(steps, steps, indexing="ij")
+        vertices: np.ndarray = np.stack([x, y, np.zeros_like(x)], axis=-1).reshape(-1, 3)
+        normals: np.ndarray = np.broadcast_to([0.0, 0.0, 1.0], vertices.shape)
+        uvs: np.ndarray = vertices[:, :2] / size + 0.5
+
+        return GFXMeshData.fromArrays(vertices, GFXMeshes.gridIndices(subdiv, subdiv), normals, {"uv": uvs})
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def cube(size: float) -> GFXMeshData:
+        """
+        Generate axis aligned cube mesh with separate vertices for every face.
+
+        Parameters:
+            size (float): Length of the cube edge.
+        """
+
+        # Face normals along with two tangent axes spanning each face
+        normals: np.ndarray = np.array([
+            [1, 0, 0], [-1, 0, 0], [0, 1, 0], [0, -1, 0], [0, 0, 1], [0, 0, -1]
+        ], dtype=np.float32)
+        tangents: np.ndarray = np.roll(np.abs(normals), 1, axis=1)
+        bitangents: np.ndarray = np.cross(normals, tangents)
+
+        # Quad corners expressed in tangent space of every face
+        corners: np.ndarray = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]], dtype=np.float32)
+        vertices: np.ndarray = (
+            normals[:, None, :]
+            + corners[None, :, 0, None] * tangents[:, None, :]
+            + corners[None, :, 1, None] * bitangents[:, None, :]
+        ) * (0.5 * size)
+
+        base: np.ndarray = (np.arange(6, dtype=np.uint32) * 4)[:, None]
+        indices: np.ndarray = base + np.array([0, 1, 2, 0, 2, 3], dtype=np.uint32)[None, :]
+
+        return GFXMeshData.fromArrays(
+            vertices,
+            indices,
+            np.repeat(normals, 4, axis=0)
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def torus(radius: float, tube_radius: float, rings: int, sides: int) -> GFXMeshData:
+        """
+        Generate torus mesh lying in XY plane.
+
+        Parameters:
+            radius (float): Distance from torus center to the center of the tube.
+            tube_radius (float): Radius of the tube.
+            rings (int): Number of subdivisions around the torus center.
+            sides (int): Number of subdivisions around the tube.
+        """
+        assertTrue(rings > 2 and sides > 2, "Invalid torus subdivisions")
+
+        u: np.ndarray = np.linspace(0.0, 2 * np.pi, rings + 1)[:, None]
+        v: np.ndarray = np.linspace(0.0, 2 * np.pi, sides + 1)[None, :]
+        normals: np.ndarray = np.stack(np.broadcast_arrays(
+            np.cos(v) * np.cos(u),
+            np.cos(v) * np.sin(u),
+            np.sin(v)
+        ), axis=-1).reshape(-1, 3)
+        centers: np.ndarray = np.stack(np.broadcast_arrays(
+            radius * np.cos(u),
+            radius * np.sin(u),
+            np.zeros_like(u) + np.zeros_like(v)
+        ), axis=-1).reshape(-1, 3)
+
+        return GFXMeshData.fromArrays(
+            centers + normals * tube_radius,
+            GFXMeshes.gridIndices(rings, sides),
+            normals
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def cylinder(radius: float, height: float, segments: int) -> GFXMeshData:
+        """
+        Generate capped cylinder mesh aligned with Z axis.
+
+        Parameters:
+            radius (float): Cylinder radius.
+            height (float): Cylinder height.
+            segments (int): Number of subdivisions around the cylinder.
+        """
+        assertTrue(segments > 2, "Invalid cylinder subdivisions")
+
+        angle: np.ndarray = np.linspace(0.0, 2 * np.pi, segments + 1)
+        ring: np.ndarray = np.stack([np.cos(angle), np.sin(angle), np.zeros_like(angle)], axis=-1)
+        top: np.ndarray = np.array([0.0, 0.0, 0.5 * height])
+
+        # Side wall is a grid of two vertex rings
+        side_vertices: np.ndarray = np.concatenate([ring * radius + top, ring * radius - top])
+        side_normals: np.ndarray = np.concatenate([ring, ring])
+        side_indices: np.ndarray = GFXMeshes.gridIndices(1, segments)
+
+        # Caps are triangle fans around center vertex followed by their own vertex ring
+        cap_vertices: list[np.ndarray] = []
+        cap_normals: list[np.ndarray] = []
+        cap_indices: list[np.ndarray] = []
+        segment: np.ndarray = np.arange(segments, dtype=np.uint32)
+        for sign in (1.0, -1.0):
+            base: int = len(side_vertices) + sum(len(v) for v in cap_vertices)
+            center: np.ndarray = top * sign
+            cap_vertices.append(np.concatenate([center[None, :], ring * radius + center]))
+            cap_normals.append(np.broadcast_to([0.0, 0.0, sign], (segments + 2, 3)))
+
+            fan: np.ndarray = np.stack([
+                np.zeros_like(segment),
+                segment + 1,
+                segment + 2
+            ], axis=-1)
+            if sign < 0:
+                fan = fan[:, ::-1]
+            cap_indices.append(fan.reshape(-1) + base)
+
+        return GFXMeshData.fromArrays(
+            np.concatenate([side_vertices] + cap_vertices),
+            np.concatenate([side_indices] + cap_indices),
+            np.concatenate([side_normals] + cap_normals)
+        )
@@ -0,0 +1,180 @@
+from __future__ import annotations
+from typing import Optional, Callable, TYPE_CHECKING
+from enum import Enum
+from dataclasses import dataclass
+import logging as Log
+import OpenGL.GL as GL
+from OpenGL.error import GLError
+
+from .asserts import assertRef, assertTrue, assertType
+
+if TYPE_CHECKING:
+    from .gfx import GFXRenderable
+
+
+class GFXResourceKind(Enum):
+    """
+    Enum class denoting types of OpenGL objects owned by resource manager.
+    """
+
+    PROGRAM = 0
+    BUFFER = 1
+    VERTEX_ARRAY = 2
+
+
+@dataclass
+class GFXResource:
+    """
+    Class holding tracked OpenGL object along with its reference count and estimated size in bytes.
+    """
+    kind: GFXResourceKind
+    handle: int
+    label: str = ""
+    size: int = 0
+    refs: int = 1
+
+
+class GFXResourceManager:
+    """
+    Class owning OpenGL objects created for single GL context.
+    Objects are reference counted and deleted as soon as their last reference is released.
+    Manager must be used with its GL context current.
+    """
+
+    def __init__(self) -> None:
+        self.__resources: dict[tuple[GFXResourceKind, int], GFXResource] = {}
+        self.__delete_listeners: list[Callable[[GFXResource], None]] = []
+        self.created: dict[GFXResourceKind, int] = {kind: 0 for kind in GFXResourceKind}
+        self.deleted: dict[GFXResourceKind, int] = {kind: 0 for kind in GFXResourceKind}
+
+    def addDeleteListener(self, listener: Callable[[GFXResource], None]) -> None:
+        """Register callback invoked after owned OpenGL object gets deleted"""
+        assertRef(listener)
+        self.__delete_listeners.append(listener)
+
+    def track(self, kind: GFXResourceKind, handle: int, label: str = "", size: int = 0) -> int:
+        """
+        Take ownership of given OpenGL object, tracking already owned object adds a reference.
+
+        Parameters:
+            kind (GFXResourceKind) : Type of the OpenGL object.
+            handle (int) : OpenGL object handle.
+            label (str) : Name of the object used in diagnostics.
+            size (int) : Estimated size of the object in bytes.
+
+        Returns:
+            int : Tracked object handle.
+        """
+        assertType(kind, GFXResourceKind)
+        assertTrue(int(handle) != 0, "Cannot track invalid OpenGL object")
+
+        key: tuple[GFXResourceKind, int] = (kind, int(handle))
+        resource: Optional[GFXResource] = self.__resources.get(key)
+        if resource is not None:
+            resource.refs += 1
+            return handle
+
+        self.__resources[key] = GFXResource(kind, int(handle), label, size)
+        self.created[kind] += 1
+        return handle
+
+    def trackProgram(self, program: int, label: str = "") -> int:
+        """Take ownership of linked shader program"""
+        return self.track(GFXResourceKind.PROGRAM, program, label, GFXResourceManager.getProgramSize(program))
+
+    def trackRenderable(self, renderable: GFXRenderable, label: str = "") -> None:
+        """Take ownership of all buffers and vertex array of given renderable"""
+        assertRef(renderable)
+        vertex_size: int = renderable.layout.stride * len(renderable.vertices) if renderable.layout else 0
+        self.track(GFXResourceKind.VERTEX_ARRAY, renderable.vao, label)
+        self.track(GFXResourceKind.BUFFER, renderable.vbo, f"{label} vertices", vertex_size)
+        self.track(GFXResourceKind.BUFFER, renderable.ebo, f"{label} indices", renderable.indices.nbytes)
+
+    def acquire(self, kind: GFXResourceKind, handle: int) -> None:
+        """Add reference to owned OpenGL object"""
+        resource: Optional[GFXResource] = self.__resources.get((kind, int(handle)))
+        assertRef(resource, f"Acquiring OpenGL object not owned by resource manager -> {kind.name} {handle}")
+        resource.refs += 1
+
+    def release(self, kind: GFXResourceKind, handle: int) -> bool:
+        """
+        Release reference to owned OpenGL object, object is deleted once no references remain.
+
+        Returns:
+            bool : True if the object was deleted, False otherwise.
+        """
+        key: tuple[GFXResourceKind, int] = (kind, int(handle))
+        resource: Optional[GFXResource] = self.__resources.get(key)
+        assertRef(resource, f"Releasing OpenGL object not owned by resource manager -> {kind.name} {handle}")
+
+        resource.refs -= 1
+        if resource.refs > 0:
+            return False
+
+        del self.__resources[key]
+        self._delete(resource)
+        return True
+
+    def releaseRenderable(self, renderable: GFXRenderable) -> None:
+        """Release buffers and vertex array of given renderable"""
+        assertRef(renderable)
+        self.release(GFXResourceKind.VERTEX_ARRAY, renderable.vao)
+        self.release(GFXResourceKind.BUFFER, renderable.vbo)
+        self.release(GFXResourceKind.BUFFER, renderable.ebo)
+
+    def releaseAll(self) -> None:
+        """Delete all owned OpenGL objects regardless of their references, eg. before context is destroyed"""
+        if self.__resources:
+            Log.debug(f"Deleting {len(self.__resources)} OpenGL objects owned by resource manager")
+        for resource in self.__resources.values():
+            self._delete(resource)
+        self.__resources.clear()
+
+    def isOwned(self, kind: GFXResourceKind, handle: int) -> bool:
+        """Get value indicating if given OpenGL object is owned by this manager"""
+        return (kind, int(handle)) in self.__resources
+
+    def getRefCount(self, kind: GFXResourceKind, handle: int) -> int:
+        """Get number of references held to given OpenGL object, 0 if the object is not owned"""
+        resource: Optional[GFXResource] = self.__resources.get((kind, int(handle)))
+        return resource.refs if resource is not None else 0
+
+    def getLiveCount(self, kind: Optional[GFXResourceKind] = None) -> int:
+        """Get number of live OpenGL objects, optionally only of given type"""
+        return sum(1 for resource in self.__resources.values() if kind is None or resource.kind == kind)
+
+    def getLiveBytes(self, kind: Optional[GFXResourceKind] = None) -> int:
+        """Get estimated size in bytes of live OpenGL objects, optionally only of given type"""
+        return sum(resource.size for resource in self.__resources.values() if kind is None or resource.kind == kind)
+
+    def getResources(self) -> list[GFXResource]:
+        """Get all live OpenGL objects"""
+        return list(self.__resources.values())
+
+    def logStats(self) -> None:
+        """Log live object counts and sizes for diagnostics"""
+        for kind in GFXResourceKind:
+            Log.info(
+                f"GL {kind.name.lower()} objects: {self.getLiveCount(kind)} live "
+                f"({self.getLiveBytes(kind)} bytes), {self.created[kind]} created, {self.deleted[kind]} deleted"
+            )
+
+    @staticmethod
+    def getProgramSize(program: int) -> int:
+        """Get estimated size of linked shader program, binary length is used when available"""
+        try:
+            return int(GL.glGetProgramiv(program, GL.GL_PROGRAM_BINARY_LENGTH))
+        except GLError:
+            return 0
+
+    def _delete(self, resource: GFXResource) -> None:
+        """Delete OpenGL object of given resource"""
+        if resource.kind == GFXResourceKind.PROGRAM:
+            GL.glDeleteProgram(resource.handle)
+        elif resource.kind == GFXResourceKind.BUFFER:
+            GL.glDeleteBuffers(1, [resource.handle])
+        elif resource.kind == GFXResourceKind.VERTEX_ARRAY:
+            GL.glDeleteVertexArrays(1, [resource.handle])
+        self.deleted[resource.kind] += 1
+        for listener in self.__delete_listeners:
+            listener(resource)
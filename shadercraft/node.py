@@ -1,14 +1,14 @@
 from __future__ import annotations
 from typing import Optional, Type
 from dataclasses import dataclass
-from collections import OrderedDict
 from uuid import UUID, uuid1
 from enum import Enum
 import logging as Log
 from PySide6.QtCore import QObject, QPointF, Slot, Signal
 
-from .connection_widget import ConnectionWidget
-from .node_widget import NodeProxyWidget, NodePropetyInfo
+from .connection_widget import ConnectionLayer
+from .node_widget import NodeProxyWidget, NodeItem, NodePropetyInfo
+from .nodescheduler import NodeScheduler
 from .asserts import assertRef, assertTrue, assertType
 
 
@@ -46,6 +46,7 @@ class NodeIO:
         self.uuid: UUID = uuid1()
         self.name: str = name
         self.label: str = label
+        self.owner: Optional[Node] = None
 
     def getInfo(self) -> NodePropetyInfo:
         """Get minimal information representing this connection"""
@@ -66,27 +67,55 @@ class NodeConnection():
         self.source_uuid: UUID = src_uuid
         self.target: Node = target
         self.target_uuid = target_uuid
-        self._widget: ConnectionWidget = self._createWidget()
+        self._layer: Optional[ConnectionLayer] = None
+        self.__released: bool = False
 
         self.source.positionChanged.connect(self.onConnectedNodePositionChanged)
         self.target.positionChanged.connect(self.onConnectedNodePositionChanged)
 
-    def _createWidget(self) -> ConnectionWidget:
-        """Create a widget representing this connection line on the graph"""
-        assertRef(self.source.getWidget())
-        assertRef(self.target.getWidget())
+    def isReleased(self) -> bool:
+        """Check whether this connection has been torn down"""
+        return self.__released
+
+    def release(self) -> None:
+        """
+        Tear down this connection once it was removed from its nodes.
+        Stops tracking position of connected nodes and removes the connection from its layer.
+        """
+        if self.__released:
+            return
+
+        self.__released = True
+        self.source.positionChanged.disconnect(self.onConnectedNodePositionChanged)
+        self.target.positionChanged.disconnect(self.onConnectedNodePositionChanged)
+        self.setLayer(None)
+
+    def getEndPoints(self) -> Optional[tuple[QPointF, QPointF]]:
+        """Get graph scene positions of source and target pins, None if nodes have no widgets"""
+        if self.source.getWidget() is None or self.target.getWidget() is None:
+            return None
 
         start: QPointF = self.source.getWidget().getPinScenePos(self.source_uuid)
         end: QPointF = self.target.getWidget().getPinScenePos(self.target_uuid)
         assertRef(start)
         assertRef(end)
+        return start, end
+
+    def getLayer(self) -> Optional[ConnectionLayer]:
+        """Get connection layer drawing this connection"""
+        return self._layer
 
-        widget = ConnectionWidget(self.uuid, start, end)
-        return widget
+    def setLayer(self, layer: Optional[ConnectionLayer]) -> None:
+        """Set connection layer drawing this connection, None removes the connection from its current layer"""
+        if self._layer is not None:
+            self._layer.removeConnection(self.uuid)
 
-    def getWidget(self) -> ConnectionWidget:
-        """Get reference to widget linked to this node connection"""
-        return self._widget
+        self._layer = layer
+        if layer is not None:
+            assertTrue(not self.__released, "Released connection can not be drawn")
+            ends: Optional[tuple[QPointF, QPointF]] = self.getEndPoints()
+            assertRef(ends, "Connected nodes have no widgets")
+            layer.addConnection(self.uuid, *ends)
 
     def getSourceValue(self) -> Optional[NodeValue]:
         """Get node value from source end of this connection"""
@@ -100,17 +129,9 @@ class NodeConnection():
     @Slot(QPointF)
     def onConnectedNodePositionChanged(self, value: QPointF) -> None:
         """Event handler invoked when either source or target node changes position"""
-        assertRef(self.getWidget())
         assertRef(value)
-        assertRef(self.source.getWidget())
-        assertRef(self.target.getWidget())
-
-        start: QPointF = self.source.getWidget().getPinScenePos(self.source_uuid)
-        end: QPointF = self.target.getWidget().getPinScenePos(self.target_uuid)
-        assertRef(start)
-        assertRef(end)
-
-        self.getWidget().updateConnectionPoints(start, end)
+        if self._layer is not None:
+            self._layer.scheduleUpdate(self.uuid, self.getEndPoints)
 
 
 class Node(QObject):
@@ -124,20 +145,90 @@ class Node(QObject):
     connectionRemoved = Signal(NodeConnection)
     selectionChanged = Signal(QObject, bool)
     positionChanged = Signal(QPointF)
+    nameChanged = Signal(str, str)
+
+    # Revision counter bumped every time any connection in any graph changes
+    _topology_revision: int = 0
+
+    # Graphics item type representing nodes in the graph scene.
+    # NodeProxyWidget hosts full widget tree per node, NodeItem is opt-in lightweight item painting the node directly.
+    widget_type: type = NodeProxyWidget
 
     def __init__(self) -> None:
         QObject.__init__(self, None)
 
-        self.name: str = "Node_Name"
+        self.__revision: int = 0
+        self.__dirty: bool = True
+        self.__outputs: dict[UUID, NodeIO] = {}
+        self.__inputs: dict[UUID, NodeIO] = {}
+        self.__connections: dict[UUID, NodeConnection] = {}
+        self.__input_connections: dict[UUID, NodeConnection] = {}
+        self.__output_connections: dict[UUID, NodeConnection] = {}
+        self.__selected: bool = False
+
+        self.__name: str = "Node_Name"
         self.uuid: UUID = uuid1()
-        self.widget: NodeProxyWidget = None
+        self.widget: NodeProxyWidget | NodeItem = None
         self.posx: float = 0.0
         self.posy: float = 0.0
 
-        self.__outputs: dict[UUID, NodeIO] = {}
-        self.__inputs: dict[UUID, NodeIO] = {}
-        self.__connections: list[NodeConnection] = []
-        self.__selected: bool = False
+    @property
+    def name(self) -> str:
+        """Name of this node, unique within the node graph"""
+        return self.__name
+
+    @name.setter
+    def name(self, value: str) -> None:
+        assertType(value, str)
+        if value == self.__name:
+            return
+
+        # Nodes consuming our outputs reference this node by name so they change as well
+        old_name: str = self.__name
+        self.__name = value
+        if self.widget is not None:
+            self.widget.setNameText(value)
+        self.bumpRevision()
+        for con in self.__output_connections.values():
+            con.target.bumpRevision()
+        self.nameChanged.emit(old_name, value)
+
+    def getRevision(self) -> int:
+        """Get revision number of this node, changes whenever node contents change"""
+        return self.__revision
+
+    def bumpRevision(self) -> None:
+        """Mark this node as changed, flags this node and all of its consumers as dirty"""
+        self.__revision += 1
+        self.markDirty()
+
+    def isDirty(self) -> bool:
+        """Get value indicating if this node or any of its inputs changed since last clean"""
+        return self.__dirty
+
+    def clearDirty(self) -> None:
+        """Flag this node as up to date"""
+        self.__dirty = False
+
+    def markDirty(self) -> None:
+        """
+        Flag this node as dirty and push dirtiness to all nodes consuming its outputs,
+        either directly or through other nodes.
+        """
+        visited: set[UUID] = {self.uuid}
+        stack: list[Node] = [self]
+        while stack:
+            node: Node = stack.pop()
+            node.__dirty = True
+            for con in node.__output_connections.values():
+                if con.target.uuid not in visited:
+                    visited.add(con.target.uuid)
+                    stack.append(con.target)
+
+    def _onInputValueChanged(self, node_input: NodeIO) -> None:
+        """Event handler invoked when static value of one of this node inputs changes"""
+        assertRef(node_input)
+        self.bumpRevision()
 
     def _registerInput(self, node_input: NodeIO) -> NodeIO:
         assertRef(node_input)
@@ -145,6 +236,7 @@ class Node(QObject):
         if node_input.uuid in self.__inputs:
             raise ValueError("Node input with matching UUID already exists!")
 
+        node_input.owner = self
         self.__inputs[node_input.uuid] = node_input
         return self.__inputs[node_input.uuid]
 
@@ -154,6 +246,7 @@ class Node(QObject):
         if node_output.uuid in self.__outputs:
             raise ValueError("Node output with matching UUID already exists!")
 
+        node_output.owner = self
         self.__outputs[node_output.uuid] = node_output
         return self.__outputs[node_output.uuid]
 
@@ -223,7 +316,7 @@ class Node(QObject):
         assertRef(src)
         assertRef(src_uuid)
 
-        if self.getConnection(uuid):
+        if uuid in self.__input_connections:
             Log.debug("Connection rejected, connection already exists for this input")
             return False
 
@@ -232,7 +325,11 @@ class Node(QObject):
             return False
 
         con = NodeConnection(src, src_uuid, self, uuid)
-        self.__connections.append(con)
+        self.__connections[con.uuid] = con
+        self.__input_connections[con.target_uuid] = con
+        src._registerOutputConnection(con)
+        Node._topology_revision += 1
+        self.bumpRevision()
         self.connectionAdded.emit(con)
 
         return True
@@ -243,13 +340,19 @@ class Node(QObject):
         con: NodeConnection = self.getConnection(uuid)
         if con is not None:
             Log.debug(f"Removing node connection: {uuid}")
-            self.__connections.remove(con)
+            del self.__connections[con.uuid]
+            del self.__input_connections[con.target_uuid]
+            con.source._unregisterOutputConnection(con)
+            Node._topology_revision += 1
+            self.bumpRevision()
             self.connectionRemoved.emit(con)
+            con.release()
 
     def canConnect(self, uuid: UUID, src_node: Node, src_uuid: UUID) -> bool:
         """
         Method to be overriden in derived classes to moderate node connection requests.
-        Base class accepts all connections.
+        Base class accepts all connections which do not close a cycle in the graph,
+        derived classes are expected to call it before applying their own rules.
 
         Parameters:
             uuid (UUID) : UUID of this node IO property connection is requested to.
@@ -259,38 +362,51 @@ class Node(QObject):
         Returns: 
             (bool) : True if connection is valid.
         """
+        if src_node is self or NodeScheduler.isSourceOf(self, src_node):
+            Log.debug(f"Connection rejected, connecting {src_node.name} -> {self.name} would create a cycle")
+            return False
         return True
 
+    def _registerOutputConnection(self, con: NodeConnection) -> None:
+        """Track connection which sources its value from output of this node"""
+        assertRef(con)
+        assertTrue(con.source is self, "Connection does not originate from this node")
+        self.__output_connections[con.uuid] = con
+
+    def _unregisterOutputConnection(self, con: NodeConnection) -> None:
+        """Stop tracking connection which sourced its value from output of this node"""
+        assertRef(con)
+        self.__output_connections.pop(con.uuid, None)
+
     def getConnection(self, uuid: UUID) -> Optional[NodeConnection]:
         """Get connection on this node that matches given UUID"""
-        for con in self.__connections:
-            if con.uuid == uuid:
-                return con
-        return None
+        return self.__connections.get(uuid)
 
     def getConnectionFromInput(self, node_in: NodeIO) -> Optional[NodeConnection]:
         """Get connection on this node given input on this node forms traget of the connection"""
-        for con in self.__connections:
-            if con.target_uuid == node_in.uuid:
-                return con
-        return None
+        return self.__input_connections.get(node_in.uuid)
 
     def getAllConnections(self) -> list[NodeConnection]:
         """Get all input connection from this node"""
-        return list(self.__connections)
+        return list(self.__connections.values())
+
+    def getOutputConnections(self) -> list[NodeConnection]:
+        """Get all connections from other nodes which source values from outputs of this node"""
+        return list(self.__output_connections.values())
 
     def initWidget(self) -> None:
         """Create widget object representing this node"""
         input_infos: list[NodePropetyInfo] = [i.getInfo() for i in self.__inputs.values()]
         output_infos: list[NodePropetyInfo] = [i.getInfo() for i in self.__outputs.values()]
 
-        self.widget = NodeProxyWidget(self.uuid, input_infos, output_infos)
-        self.widget.getWidget().setLabelText(self.label)
-        self.widget.getWidget().setNameText(self.name)
+        self.widget = self.widget_type(self.uuid, input_infos, output_infos)
+        self.widget.setLabelText(self.label)
+        self.widget.setNameText(self.name)
         self.widget.positionChanged.connect(self.onWidgetPositionChanged)
         self.widget.selectionChanged.connect(self.onWidgetSelectionChanged)
+        self.widget.pinsChanged.connect(self.onWidgetPinsChanged)
 
-    def getWidget(self) -> NodeProxyWidget:
+    def getWidget(self) -> NodeProxyWidget | NodeItem:
         """Get handle to the widget representing this node"""
         return self.widget
 
@@ -304,6 +420,11 @@ class Node(QObject):
         self.posy = value.y()
         self.positionChanged.emit(QPointF(self.posx, self.posy))
 
+    @Slot()
+    def onWidgetPinsChanged(self) -> None:
+        """Event handler invoked when pins move within bound widget, pin positions are refreshed as on node move"""
+        self.positionChanged.emit(QPointF(self.widget.pos()))
+
     @Slot(bool)
     def onWidgetSelectionChanged(self, value: bool) -> None:
         """Event handler invoked when the widget bound to this node changes its selection state"""
@@ -322,16 +443,16 @@ class Node(QObject):
         self.positionChanged.emit(QPointF(x, y))
 
     def getDownstreamNodes(self) -> list[Node]:
-        """Recursively gets list of this node down stream descendants"""
-        nodes: list[Node] = []
-        for node_in in self.getNodeInputs():
-            con: Optional[NodeConnection] = self.getConnectionFromInput(node_in)
-            if con:
-                child_nodes: list[Node] = con.source.getDownstreamNodes()
-                nodes.extend(child_nodes)
-        nodes.append(self)
-        nodes = list(OrderedDict.fromkeys(nodes))
-        return nodes
+        """
+        Get list of this node down stream descendants in evaluation order.
+        This node is always the last item of the list.
+        """
+        return NodeScheduler.default().schedule(self)
+
+    @staticmethod
+    def getTopologyRevision() -> int:
+        """Get revision number of node connections topology, changes whenever connections change"""
+        return Node._topology_revision
 
     def getSelectedStatate(self) -> bool:
         """Get value indicating if this node is currently selected or not"""
@@ -3,9 +3,10 @@ from typing import Optional
 from enum import Enum
 from dataclasses import dataclass
 from uuid import UUID, uuid1
-from PySide6.QtGui import QPainter, QColor, QMouseEvent
+from PySide6.QtGui import QPainter, QColor, QMouseEvent, QFont, QStaticText, QPalette, QPaintEvent, QShowEvent
 from PySide6.QtWidgets import (
     QGraphicsItem,
+    QGraphicsObject,
     QStyleOptionGraphicsItem,
     QWidget,
     QGraphicsWidget,
@@ -19,7 +20,24 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import QRectF, Qt, QPointF, QPoint, Signal, QObject, Slot
 
 from .asserts import assertRef, assertTrue
-from .styles import node_widget_style, node_selected_widget_style
+from .styles import (
+    node_border_color,
+    node_selected_border_color,
+    node_label_area_color,
+    node_area_color,
+    node_pin_color,
+    node_label_text_color,
+    node_text_color
+)
+
+class NodeDetailLevel(Enum):
+    """
+    Enum class representing how much detail graph items are drawn with.
+    Graph view lowers the detail level when zoomed out far enough for details to be unreadable.
+    """
+    FULL = 0
+    SIMPLE = 1
+
 
 @dataclass
 class NodePropetyInfo:
@@ -49,7 +67,7 @@ class NodePinShapeWidget(QWidget):
     def paintEvent(self, event) -> None:
         painter: QPainter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing, True)
-        painter.setBrush(QColor(0, 255, 0))
+        painter.setBrush(node_pin_color)
 
         x: int = self.rect().center().x() - self.radius
         y: int = self.rect().center().y() - self.radius
@@ -112,6 +130,7 @@ class NodePropertyWidget(QWidget):
 class NodeWidget(QWidget):
     """
     Actual widget representation of the node.
+    Node is styled through shared colors and fonts, selection only repaints the node border.
     """
     def __init__(
         self,
@@ -124,7 +143,7 @@ class NodeWidget(QWidget):
         self.node_uuid = node_uuid
         self.setMinimumSize(160, 160)
         self.setObjectName("NodeWidget")
-        self.setStyleSheet(node_widget_style)
+        self.__selected: bool = False
         self.root_layout: QVBoxLayout = QVBoxLayout()
         self.root_layout.setSpacing(0)
         self.root_layout.setContentsMargins(2, 2, 2, 2)
@@ -162,14 +181,22 @@ class NodeWidget(QWidget):
         self.label_layout.setContentsMargins(0, 0, 0, 0)
         self.label_frame: QFrame = QFrame()
         self.label_frame.setObjectName("NodeLabelArea")
+        self._fillBackground(self.label_frame, node_label_area_color)
         self.label_frame.setLayout(QVBoxLayout())
         self.label_frame.layout().setSpacing(0)
         self.label_frame.layout().setContentsMargins(4, 4, 4, 4)
         self.node_label: QLabel = QLabel("Node Label")
         self.node_label.setObjectName("NodeLabelText")
+        label_font: QFont = self.node_label.font()
+        label_font.setPixelSize(14)
+        label_font.setBold(True)
+        self.node_label.setFont(label_font)
         self.label_frame.layout().addWidget(self.node_label)
         self.node_name: QLabel = QLabel("Node Name")
         self.node_name.setObjectName("NodeNameText")
+        name_font: QFont = self.node_name.font()
+        name_font.setPixelSize(10)
+        self.node_name.setFont(name_font)
         self.label_frame.layout().addWidget(self.node_name)
         self.label_layout.addWidget(self.label_frame)
         self.root_layout.addLayout(self.label_layout)
@@ -178,6 +205,7 @@ class NodeWidget(QWidget):
         self.bottom_layout: QVBoxLayout = QVBoxLayout()
         self.bottom_frame: QFrame = QFrame()
         self.bottom_frame.setObjectName("NodeArea")
+        self._fillBackground(self.bottom_frame, node_area_color)
         self.bottom_frame.setMinimumHeight(136)
         self.bottom_layout.addWidget(self.bottom_frame)
         self.root_layout.addLayout(self.bottom_layout)
@@ -195,6 +223,29 @@ class NodeWidget(QWidget):
         self.property_layout.addLayout(self.outputs_layout)
         self.bottom_frame.setLayout(self.property_layout)
 
+    @staticmethod
+    def _fillBackground(widget: QWidget, color: QColor) -> None:
+        """Fill background of given widget with solid color"""
+        palette: QPalette = widget.palette()
+        palette.setColor(QPalette.Window, color)
+        widget.setPalette(palette)
+        widget.setAutoFillBackground(True)
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        """Draws node border, its color reflects node selection"""
+        painter: QPainter = QPainter(self)
+        painter.fillRect(self.rect(), node_selected_border_color if self.__selected else node_border_color)
+
+    def isSelected(self) -> bool:
+        """Check whether the node is drawn as selected"""
+        return self.__selected
+
+    def setSelected(self, selected: bool) -> None:
+        """Set whether the node is drawn as selected"""
+        if selected != self.__selected:
+            self.__selected = selected
+            self.update()
+
     def setLabelText(self, text: str) -> None:
         """Set text value of the node label widget"""
         assertRef(text)
@@ -220,6 +271,7 @@ class NodeProxyWidget(QGraphicsWidget):
     """
     positionChanged: Signal = Signal(QPointF)
     selectionChanged: Signal = Signal(bool)
+    pinsChanged: Signal = Signal()
     depth_order: int = 100
 
     def __init__(self, node_uuid: UUID, inputs: list[NodePropetyInfo], outputs: list[NodePropetyInfo]) -> None:
@@ -231,16 +283,65 @@ class NodeProxyWidget(QGraphicsWidget):
         self.__proxy: QGraphicsProxyWidget = QGraphicsProxyWidget(parent=self)
         self.__proxy.setWidget(self.__widget)
 
+        # Pin offsets are cached and only resolved again when the embedded widget is shown or changes geometry
+        self.__pin_offsets: dict[UUID, QPointF] = {}
+        self.updatePinOffsets()
+        self.__proxy.geometryChanged.connect(self.updatePinOffsets)
+
         self.uuid = uuid1()
+        self.detail_level: NodeDetailLevel = NodeDetailLevel.FULL
         self.setZValue(self.depth_order)
         self.setFlag(QGraphicsItem.ItemIsMovable)
         self.setFlag(QGraphicsItem.ItemIsSelectable)
         self.setFlag(QGraphicsItem.ItemSendsGeometryChanges)
 
+    def setDetailLevel(self, level: NodeDetailLevel) -> None:
+        """Set detail level of the node, embedded widget is hidden when drawn with simple detail"""
+        if level is self.detail_level:
+            return
+
+        self.detail_level = level
+        self.__proxy.setVisible(level is NodeDetailLevel.FULL)
+        self.update()
+
+    def updatePinOffsets(self) -> None:
+        """Resolve positions of node pins within the embedded widget, emits pinsChanged if any pin moved"""
+        self.__widget.layout().activate()
+        offsets: dict[UUID, QPointF] = {}
+        for widget in self.__widget.property_widgets:
+            pin: NodePinShapeWidget = widget.pin_widget
+            offsets[widget.property_uuid] = self.__proxy.mapToParent(
+                QPointF(pin.mapTo(self.__widget, pin.rect().center()))
+            )
+
+        if offsets != self.__pin_offsets:
+            self.__pin_offsets = offsets
+            self.pinsChanged.emit()
+
+    def showEvent(self, event: QShowEvent) -> None:
+        """Refresh pin offsets once the embedded widget is laid out for display"""
+        super().showEvent(event)
+        self.updatePinOffsets()
+
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: QWidget = None) -> None:
+        """Draws node as plain rectangle when embedded widget is hidden"""
+        if self.detail_level is NodeDetailLevel.SIMPLE:
+            rect: QRectF = self.boundingRect()
+            painter.fillRect(rect, node_selected_border_color if self.isSelected() else node_border_color)
+            painter.fillRect(rect.adjusted(2, 2, -2, -2), node_area_color)
+
     def getWidget(self) -> NodeWidget:
         """Get handle to the inner widget object"""
         return self.__widget
 
+    def setLabelText(self, text: str) -> None:
+        """Set text of the node label"""
+        self.__widget.setLabelText(text)
+
+    def setNameText(self, text: str) -> None:
+        """Set text of the node name"""
+        self.__widget.setNameText(text)
+
     def boundingRect(self) -> QRectF:
         """Get bounding area representing the entire node widget"""
         return QRectF(0, 0, self.min_size, self.min_size)
@@ -251,22 +352,175 @@ class NodeProxyWidget(QGraphicsWidget):
             self.positionChanged.emit(value)
 
         if change == QGraphicsItem.ItemSelectedChange:
-            if value:
-                self.__widget.setStyleSheet(node_selected_widget_style)
-            else:
-                self.__widget.setStyleSheet(node_widget_style)
+            self.__widget.setSelected(bool(value))
             self.selectionChanged.emit(value)
 
         return super().itemChange(change, value)
 
+    def getPinOffset(self, uuid: UUID) -> Optional[QPointF]:
+        """Get position of node pin matching given UUID relative to the node position"""
+        return self.__pin_offsets.get(uuid)
+
     def getPinScenePos(self, uuid: UUID) -> Optional[QPointF]:
         """Get graph scene relative position of node pin matching given UUID"""
         assertRef(uuid)
-        assertRef(self.getWidget())
+        offset: Optional[QPointF] = self.__pin_offsets.get(uuid)
+        if offset is not None:
+            return self.pos() + offset
+        return None
+
+
+class NodeItem(QGraphicsObject):
+    """
+    Lightweight graphics item representing node.
+    Node header, property labels and pins are painted directly without any embedded widgets.
+    Pin positions are computed once on creation and reused for pin indexing and connection drawing.
+    Exposes the same signals and pin API as NodeProxyWidget.
+    """
+    positionChanged: Signal = Signal(QPointF)
+    selectionChanged: Signal = Signal(bool)
+    pinsChanged: Signal = Signal()
+    depth_order: int = NodeProxyWidget.depth_order
+
+    width: float = 160
+    min_height: float = 160
+    header_height: float = 40
+    row_height: float = 24
+    padding: float = 4
+    border: float = 2
+    pin_radius: float = NodePinShapeWidget.radius
+
+    border_color: QColor = node_border_color
+    selected_border_color: QColor = node_selected_border_color
+    header_color: QColor = node_label_area_color
+    body_color: QColor = node_area_color
+    pin_color: QColor = node_pin_color
+    header_text_color: QColor = node_label_text_color
+    text_color: QColor = node_text_color
+
+    def __init__(self, node_uuid: UUID, inputs: list[NodePropetyInfo], outputs: list[NodePropetyInfo]) -> None:
+        super().__init__()
+        self.node_uuid: UUID = node_uuid
+        self.uuid = uuid1()
+        self.detail_level: NodeDetailLevel = NodeDetailLevel.FULL
+
+        self.label_font: QFont = QFont()
+        self.label_font.setPixelSize(14)
+        self.label_font.setBold(True)
+        self.name_font: QFont = QFont()
+        self.name_font.setPixelSize(10)
+        self.property_font: QFont = QFont()
+        self.property_font.setPixelSize(12)
+        self.__label_text: QStaticText = QStaticText("")
+        self.__name_text: QStaticText = QStaticText("")
+
+        # Pin centers and property labels in item local coordinates
+        self.__pins: dict[UUID, QPointF] = {}
+        self.__property_texts: list[tuple[QPointF, QStaticText, bool]] = []
+        self._layoutPins(inputs, outputs)
+        height: float = self.header_height + self.padding * 2 + self.row_height * max(len(inputs), len(outputs))
+        self.__rect: QRectF = QRectF(0, 0, self.width, max(self.min_height, height))
 
-        pin: NodePinShapeWidget = self.__widget.getPinWidget(uuid)
-        if pin is not None:
-            center: QPoint = pin.rect().center()
-            proxy_pos: QPoint = pin.mapTo(self.__widget, center)
-            return self.mapToScene(proxy_pos)
+        self.setZValue(self.depth_order)
+        self.setFlag(QGraphicsItem.ItemIsMovable)
+        self.setFlag(QGraphicsItem.ItemIsSelectable)
+        self.setFlag(QGraphicsItem.ItemSendsGeometryChanges)
+
+    def _layoutPins(self, inputs: list[NodePropetyInfo], outputs: list[NodePropetyInfo]) -> None:
+        """Compute pin and label positions, inputs are stacked on the left and outputs on the right"""
+        top: float = self.header_height + self.padding
+        left: float = self.border + self.padding + self.pin_radius
+        right: float = self.width - left
+        for infos, x, is_input in ((inputs, left, True), (outputs, right, False)):
+            for idx, info in enumerate(infos):
+                center: QPointF = QPointF(x, top + self.row_height * (idx + 0.5))
+                self.__pins[info.uuid] = center
+
+                text: QStaticText = QStaticText(info.label)
+                text.prepare(font=self.property_font)
+                self.__property_texts.append((center, text, is_input))
+
+    def setLabelText(self, text: str) -> None:
+        """Set text of the node label"""
+        assertRef(text)
+        self.__label_text = QStaticText(text.upper())
+        self.__label_text.prepare(font=self.label_font)
+        self.update()
+
+    def setNameText(self, text: str) -> None:
+        """Set text of the node name"""
+        assertRef(text)
+        self.__name_text = QStaticText(text)
+        self.__name_text.prepare(font=self.name_font)
+        self.update()
+
+    def getNameText(self) -> str:
+        """Get text of the node name"""
+        return self.__name_text.text()
+
+    def setDetailLevel(self, level: NodeDetailLevel) -> None:
+        """Set detail level of the node, text and pins are omitted when drawn with simple detail"""
+        if level is not self.detail_level:
+            self.detail_level = level
+            self.update()
+
+    def boundingRect(self) -> QRectF:
+        """Get bounding area representing the entire node"""
+        return self.__rect
+
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: QWidget = None) -> None:
+        """Draws the entire node"""
+        rect: QRectF = self.__rect
+        border: QColor = self.selected_border_color if self.isSelected() else self.border_color
+        painter.fillRect(rect, border)
+        inner: QRectF = rect.adjusted(self.border, self.border, -self.border, -self.border)
+        if self.detail_level is NodeDetailLevel.SIMPLE:
+            painter.fillRect(inner, self.body_color)
+            return
+
+        header: QRectF = QRectF(inner.left(), inner.top(), inner.width(), self.header_height - self.border)
+        painter.fillRect(header, self.header_color)
+        body: QRectF = QRectF(inner.left(), header.bottom(), inner.width(), inner.bottom() - header.bottom())
+        painter.fillRect(body, self.body_color)
+
+        painter.setPen(self.header_text_color)
+        painter.setFont(self.label_font)
+        painter.drawStaticText(QPointF(header.left() + self.padding, header.top() + self.padding), self.__label_text)
+        painter.setFont(self.name_font)
+        name_top: float = header.top() + self.padding + self.__label_text.size().height()
+        painter.drawStaticText(QPointF(header.left() + self.padding, name_top), self.__name_text)
+
+        painter.setPen(self.text_color)
+        painter.setFont(self.property_font)
+        for center, text, is_input in self.__property_texts:
+            offset: float = self.pin_radius + self.padding
+            x: float = center.x() + offset if is_input else center.x() - offset - text.size().width()
+            painter.drawStaticText(QPointF(x, center.y() - text.size().height() / 2), text)
+
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.pin_color)
+        for center in self.__pins.values():
+            painter.drawEllipse(center, self.pin_radius, self.pin_radius)
+
+    def itemChange(self, change, value):
+        """Override for handling item changes"""
+        if change == QGraphicsItem.ItemPositionChange:
+            self.positionChanged.emit(value)
+
+        if change == QGraphicsItem.ItemSelectedChange:
+            self.selectionChanged.emit(value)
+
+        return super().itemChange(change, value)
+
+    def getPinOffset(self, uuid: UUID) -> Optional[QPointF]:
+        """Get position of node pin matching given UUID relative to the node position"""
+        return self.__pins.get(uuid)
+
+    def getPinScenePos(self, uuid: UUID) -> Optional[QPointF]:
+        """Get graph scene relative position of node pin matching given UUID"""
+        assertRef(uuid)
+        center: Optional[QPointF] = self.__pins.get(uuid)
+        if center is not None:
+            return self.pos() + center
         return None
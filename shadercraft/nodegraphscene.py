@@ -5,17 +5,15 @@ import logging as Log
 
 from PySide6.QtWidgets import (
     QGraphicsScene,
-    QWidget,
-    QGraphicsItem,
-    QGraphicsProxyWidget,
     QGraphicsView
 )
 from PySide6.QtGui import QMouseEvent
-from PySide6.QtCore import Signal, Slot, QObject, QPoint, Qt, QPointF
+from PySide6.QtCore import Signal, Slot, QObject, QPoint, Qt, QPointF, QRectF
 
 from .node import Node, NodeConnection, NodeIO
-from .node_widget import NodeProxyWidget, NodePinShapeWidget
-from .connection_widget import ConnectionWidget
+from .node_widget import NodeProxyWidget, NodeItem, NodeDetailLevel
+from .connection_widget import ConnectionWidget, ConnectionLayer
+from .pinindex import PinIndex, PinKey
 from .shadernodes import FloatShaderNode, MulShaderNode, OutputShaderNode
 from .asserts import assertRef, assertFalse, assertTrue
 
@@ -26,20 +24,32 @@ class NodeGraphScene(QGraphicsScene):
     All the nodes and their connections are stored in the scene
     """
     selected_node_changed: Signal = Signal(Node)
+    node_added: Signal = Signal(Node)
     preview_redraw_requested: Signal = Signal()
 
+    # Distance from the pin within which mouse presses pick the pin and connection drops snap to it
+    pin_pick_radius: float = NodeItem.pin_radius * 1.5
+    pin_snap_radius: float = NodeItem.pin_radius * 3
+
     def __init__(self):
         """Default constructor"""
         super().__init__()
-        self.__nodes: list[Node] = []
-        self.__names: list[str] = []
-        self.__names_lookup: dict[str, int] = {}
+        self.__nodes: dict[UUID, Node] = {}
+        self.__widget_nodes: dict[UUID, Node] = {}
+        self.__names: set[str] = set()
+        self.__renamed_node: Optional[Node] = None
         self.__drag_pin: Optional[UUID] = None
         self.__drag_pin_owner: Optional[Node] = None
         self.__drop_pin: Optional[UUID] = None
         self.__drop_pin_owner: Optional[Node] = None
         self.__drag_drop_preview: Optional[ConnectionWidget] = None
         self.__selected_node: Optional[Node] = None
+        self.__node_detail_level: NodeDetailLevel = NodeDetailLevel.FULL
+        self.pin_index: PinIndex = PinIndex()
+
+        # All established connections are drawn by single layer item
+        self.connection_layer: ConnectionLayer = ConnectionLayer()
+        self.addItem(self.connection_layer)
 
     def getView(self) -> Optional[QGraphicsView]:
         """Get handle to the first view which this scene is bound to"""
@@ -55,6 +65,28 @@ class NodeGraphScene(QGraphicsScene):
         local_pos: QPointF = view.mapFromGlobal(screen_coords)
         return view.mapToScene(local_pos)
 
+    def getNodeDetailLevel(self) -> NodeDetailLevel:
+        """Get detail level nodes in the graph are drawn with"""
+        return self.__node_detail_level
+
+    def setNodeDetailLevel(self, level: NodeDetailLevel) -> None:
+        """Set detail level all nodes in the graph are drawn with"""
+        if level is self.__node_detail_level:
+            return
+
+        Log.debug(f"Changing node detail level -> {level}")
+        self.__node_detail_level = level
+        for node in self.__nodes.values():
+            node.getWidget().setDetailLevel(level)
+
+    def getConnectionDetailLevel(self) -> NodeDetailLevel:
+        """Get detail level node connections in the graph are drawn with"""
+        return self.connection_layer.getDetailLevel()
+
+    def setConnectionDetailLevel(self, level: NodeDetailLevel) -> None:
+        """Set detail level node connections in the graph are drawn with"""
+        self.connection_layer.setDetailLevel(level)
+
     def getSelectedNode(self) -> Optional[Node]:
         """Get currently selected node in the graph"""
         return self.__selected_node
@@ -65,25 +97,31 @@ class NodeGraphScene(QGraphicsScene):
         Added node will be renamed if needed to ensure name uniquness.
         """
         assertRef(node)
-        assertFalse(node in self.__nodes, "Node already present in the scene")
+        assertFalse(node.uuid in self.__nodes, "Node already present in the scene")
 
         self.assignNodeName(node)
-        self.__nodes.append(node)
+        self.__nodes[node.uuid] = node
         node.selectionChanged.connect(self.onNodeSelectionChanged)
         node.connectionAdded.connect(self.onNodeConnectionAdded)
         node.connectionRemoved.connect(self.onNodeConnectionRemoved)
+        node.positionChanged.connect(self.onNodePositionChanged)
+        node.nameChanged.connect(self.onNodeNameChanged)
         if node.getWidget() is None:
             node.initWidget()
 
+        self.__widget_nodes[node.getWidget().uuid] = node
+        self.indexNodePins(node, node.getWidget().pos())
+        node.getWidget().setDetailLevel(self.__node_detail_level)
         self.addItem(node.getWidget())
         Log.info(f"NodeGraphScene: Adding new node -> {node.uuid}")
+        self.node_added.emit(node)
 
     def deleteNode(self, node: Node) -> None:
         """
         Removes given node from the graph.
         Any connection to or from the node will be removed as well.
         """
-        assertTrue(node in self.__nodes, "Node does not exists within the node graph!")
+        assertTrue(node.uuid in self.__nodes, "Node does not exists within the node graph!")
         Log.info(f"Removing node from node graph: {node.uuid}")
 
         # Remove active connections to given node
@@ -93,9 +131,24 @@ class NodeGraphScene(QGraphicsScene):
         for con in in_cons + out_cons:
             con.target.removeConnection(con.uuid)
 
-        # Remove the actual node
-        self.__nodes.remove(node)
+        # Deselect the node while the graph still listens to it and drop any drag in progress
+        if node.getWidget() is not None:
+            node.getWidget().setSelected(False)
+        if self.__drag_pin_owner is node or self.__drop_pin_owner is node:
+            self.resetPinDragDrop()
+
+        node.selectionChanged.disconnect(self.onNodeSelectionChanged)
+        node.connectionAdded.disconnect(self.onNodeConnectionAdded)
+        node.connectionRemoved.disconnect(self.onNodeConnectionRemoved)
+        node.positionChanged.disconnect(self.onNodePositionChanged)
+        node.nameChanged.disconnect(self.onNodeNameChanged)
+        self.pin_index.removeNode(node.uuid)
+
+        # Remove the actual node and release its name for reuse
+        del self.__nodes[node.uuid]
+        self.__names.discard(node.name)
         if node.getWidget() is not None:
+            self.__widget_nodes.pop(node.getWidget().uuid, None)
             self.removeItem(node.getWidget())
 
     def deleteSelectedNode(self) -> bool:
@@ -125,30 +178,27 @@ class NodeGraphScene(QGraphicsScene):
 
     def getAllNodes(self) -> list[Node]:
         """Get list of all nodes present in the graph"""
-        return list(self.__nodes)
+        return list(self.__nodes.values())
 
     def getAllNodeOfClass(self, cls) -> list[Node]:
         """Get List of all nodes present in the graph that match given class type"""
         nodes: list[Node] = []
-        for node in self.__nodes:
+        for node in self.__nodes.values():
             if isinstance(node, cls):
                 nodes.append(node)
         return nodes
 
     def getNodeFromUUID(self, uuid: UUID) -> Optional[Node]:
         """Get node in the scene that matches given UUID"""
-        for node in self.__nodes:
-            if node.uuid == uuid:
-                return node
-        return None
+        return self.__nodes.get(uuid)
 
-    def getNodeFromWidget(self, widget: NodeProxyWidget) -> Optional[Node]:
+    def getNodeFromWidget(self, widget: NodeProxyWidget | NodeItem) -> Optional[Node]:
         """Get handle to the node linked to given node widget"""
 
         assertRef(widget)
-        match = [node for node in self.__nodes if node.getWidget() is widget]
-        if match:
-            return match[0]
+        node: Optional[Node] = self.__widget_nodes.get(widget.uuid)
+        if node is not None and node.getWidget() is widget:
+            return node
         return None
 
     def getNodeFromWidgetUUID(self, uuid: UUID) -> Optional[Node]:
@@ -160,67 +210,100 @@ class NodeGraphScene(QGraphicsScene):
             return self.getNodeFromWidget(widget)
         return None
 
-    def getWidgetFromUUID(self, uuid: UUID) -> Optional[NodeProxyWidget]:
+    def getWidgetFromUUID(self, uuid: UUID) -> Optional[NodeProxyWidget | NodeItem]:
         """Get node widget matching given UUID"""
 
         assertRef(uuid)
-        match = [node.getWidget() for node in self.__nodes if node.getWidget() and node.getWidget().uuid is uuid]
-        assertTrue(len(match) <= 1)
-        if match:
-            return match[0]
+        node: Optional[Node] = self.__widget_nodes.get(uuid)
+        if node is not None:
+            return node.getWidget()
         return None
 
     def getNodeDownstreamConnections(self, node: Node) -> list[NodeConnection]:
         """Get all incoming connections in the node graph from given node"""
         assertRef(node)
-        assertTrue (node in self.__nodes)
+        assertTrue(node.uuid in self.__nodes)
         return node.getAllConnections()
 
     def getNodeUpstreamConnections(self, node: Node) -> list[NodeConnection]:
         """Get all outgoing connections in the node graph to given node"""
         assertRef(node)
-        assertTrue(node in self.__nodes)
-
-        connections: list[NodeConnection] = []
-        for inode in self.__nodes:
-            if inode.uuid is node.uuid:
-                continue
-            node_connections: list[NodeConnection] = inode.getAllConnections()
-            for con in node_connections:
-                if con.source.uuid is node.uuid:
-                    connections.append(con)
-
-        return connections
-
-    def getWidgetUnderMouse(self, scene_pos: QPointF) -> Optional[QWidget]:
-        """Get hadle to the windget currently under mouse pointer"""
-        item: QGraphicsItem = self.itemAt(scene_pos, self.views()[0].transform())
-        if item is not None and isinstance(item, QGraphicsProxyWidget):
-            if item.widget() is None:
-                return None
-            pos: QPoint = item.mapFromScene(scene_pos)
-            widget: QWidget = item.widget().childAt(pos)
-            return widget
+        assertTrue(node.uuid in self.__nodes)
+        return node.getOutputConnections()
+
+    def indexNodePins(self, node: Node, pos: QPointF) -> None:
+        """Update pin index with pins of given node placed at given scene position"""
+        widget: NodeProxyWidget | NodeItem = node.getWidget()
+        assertRef(widget)
+        for prop in node.getNodeInputs() + node.getNodeOutputs():
+            offset: Optional[QPointF] = widget.getPinOffset(prop.uuid)
+            if offset is not None:
+                self.pin_index.setPosition(node.uuid, prop.uuid, pos + offset)
+
+    def getPinUnderMouse(self, scene_pos: QPointF, radius: Optional[float] = None) -> Optional[tuple[Node, UUID]]:
+        """
+        Get node and property UUID of the pin nearest to the mouse pointer.
+
+        Parameters:
+            scene_pos (QPointF) : Scene position of the mouse pointer.
+            radius (float) : Maximum distance of the pin from the pointer, defaults to pin pick radius.
+
+        Returns:
+            (Optional[tuple[Node, UUID]]) : Pin owner node and property UUID, None if there is no pin in range.
+        """
+        assertRef(scene_pos)
+        if self.__node_detail_level is not NodeDetailLevel.FULL:
+            return None
+
+        key: Optional[PinKey] = self.pin_index.findNearest(scene_pos, radius or self.pin_pick_radius)
+        if key is None:
+            return None
+
+        node: Optional[Node] = self.getNodeFromUUID(key[0])
+        assertRef(node)
+        if self.getTopNodeAt(scene_pos) not in (None, node):
+            # Pin is covered by another node which takes the mouse input instead
+            return None
+        return node, key[1]
+
+    def getTopNodeAt(self, scene_pos: QPointF) -> Optional[Node]:
+        """Get node whose widget is topmost at given scene position, None if there is no node"""
+        assertRef(scene_pos)
+        for item in self.items(scene_pos):
+            widget = item.topLevelItem()
+            if isinstance(widget, (NodeProxyWidget, NodeItem)):
+                node: Optional[Node] = self.getNodeFromWidget(widget)
+                if node is not None:
+                    return node
         return None
 
+    def getPinsInRect(self, rect: QRectF) -> list[tuple[Node, UUID]]:
+        """Get nodes and property UUIDs of all pins within given scene rectangle"""
+        return [(self.__nodes[node_uuid], pin_uuid) for node_uuid, pin_uuid in self.pin_index.query(rect)]
+
+    def getVisiblePins(self) -> list[tuple[Node, UUID]]:
+        """Get nodes and property UUIDs of all pins within the visible area of the graph view"""
+        view: Optional[QGraphicsView] = self.getView()
+        if view is None:
+            return []
+        return self.getPinsInRect(view.mapToScene(view.viewport().rect()).boundingRect())
+
     def mousePressEvent(self, event: QMouseEvent) -> None:
         """Event handler invoked when mouse button press happens inside the graph scene"""
         if event.button() == Qt.MouseButton.LeftButton:
-            widget: QWidget = self.getWidgetUnderMouse(event.scenePos())
-            if widget is not None and isinstance(widget, NodePinShapeWidget):
-                node: Node = self.getNodeFromUUID(widget.node_uuid)
-                assertRef(node)
-                self.beginPinDragDrop(node, widget.property_uuid)
+            pin: Optional[tuple[Node, UUID]] = self.getPinUnderMouse(event.scenePos())
+            if pin is not None:
+                self.beginPinDragDrop(*pin)
                 return
         self.resetPinDragDrop()
         super().mousePressEvent(event)
 
     def mouseReleaseEvent(self, event: QMouseEvent) -> None:
         """Event handler invoked when mouse button is released inside graph scene"""
-        widget: QWidget = self.getWidgetUnderMouse(event.scenePos())
-        if widget is not None and isinstance(widget, NodePinShapeWidget):
-            node: Node = self.getNodeFromUUID(widget.node_uuid)
-            pin_uuid: UUID = widget.property_uuid
+        radius: float = self.pin_snap_radius if self.__drag_pin is not None else self.pin_pick_radius
+        pin: Optional[tuple[Node, UUID]] = self.getPinUnderMouse(event.scenePos(), radius)
+        if pin is not None:
+            node, pin_uuid = pin
             assertRef(node)
             assertRef(pin_uuid)
             if event.button() == Qt.MouseButton.LeftButton:
@@ -250,8 +333,13 @@ class NodeGraphScene(QGraphicsScene):
             end: QPoint = self.screenCoordsToScene(event.screenPos())
             assertRef(start)
             assertRef(end)
+
+            # Snap preview line to the pin the connection would be dropped on
+            target: Optional[tuple[Node, UUID]] = self.getPinUnderMouse(end, self.pin_snap_radius)
+            if target is not None and target[0] is not start_node:
+                end = self.pin_index.getPosition(target[0].uuid, target[1])
             if self.__drag_drop_preview is None:
-                self.__drag_drop_preview = ConnectionWidget(uuid1(), start, end)
+                self.__drag_drop_preview = ConnectionWidget(uuid1(), start, end, self.connection_layer.isCurved())
                 self.addItem(self.__drag_drop_preview)
             else:
                 self.__drag_drop_preview.updateConnectionPoints(start, end)
@@ -348,6 +436,11 @@ class NodeGraphScene(QGraphicsScene):
         assertRef(node_out, "Source connection has no matching node output")
         assertRef(node_in, "Target connection has no matching node input")
 
+        # Rejected connections, ie. ones closing a cycle, keep existing connection of the input intact
+        if not target_node.canConnect(node_in.uuid, source_node, node_out.uuid):
+            Log.debug("Node connection rejected")
+            return False
+
         # Remove existing connection if one is present
         excon: NodeConnection = target_node.getConnectionFromInput(node_in)
         if excon is not None:
@@ -363,17 +456,20 @@ class NodeGraphScene(QGraphicsScene):
     def onNodeConnectionAdded(self, connection: NodeConnection) -> None:
         """Event handler invoked when new connection between two nodes happens in the graph"""
         assertRef(connection)
-        assertRef(connection.getWidget)
-        self.addItem(connection.getWidget())
+        connection.setLayer(self.connection_layer)
 
     def onNodeConnectionRemoved(self, connection: NodeConnection) -> None:
         """Event handler invoked when existing connection between nodes is severed"""
         assertRef(connection)
-        assertRef(connection.getWidget())
-
-        self.removeItem(connection.getWidget())
+        connection.setLayer(None)
         self.preview_redraw_requested.emit()
 
+    def onNodePositionChanged(self, pos: QPointF) -> None:
+        """Event handler invoked when any of the nodes changes position"""
+        node: QObject = self.sender()
+        assertTrue(isinstance(node, Node))
+        self.indexNodePins(node, pos)
+
     def onNodeSelectionChanged(self, node: QObject, selected: bool) -> None:
         """Event handler invoked when selection state changes on any of the nodes"""
         assertRef(node)
@@ -386,15 +482,43 @@ class NodeGraphScene(QGraphicsScene):
             self.__selected_node = None
         self.selected_node_changed.emit(self.__selected_node)
 
+    def getFreeNodeName(self, name: str) -> str:
+        """
+        Get given name if no node in the graph uses it, otherwise the given name
+        with the lowest numeric suffix not used by any node.
+        """
+        if name not in self.__names:
+            return name
+
+        index: int = 1
+        while f"{name}_{index}" in self.__names:
+            index += 1
+        return f"{name}_{index}"
+
     def assignNodeName(self, node: Node) -> str:
-        """Generates unqiue node name"""
-        if node.name not in self.__names:
-            self.__names_lookup[node.name] = 0
-            self.__names.append(node.name)
-            return node.name
-        else:
-            self.__names_lookup[node.name] += 1
-            name = f"{node.name}_{self.__names_lookup[node.name]}"
-            self.__names.append(name)
+        """
+        Generates unqiue node name.
+        Names of nodes deleted from the graph are released and can be assigned again.
+        """
+        name: str = self.getFreeNodeName(node.name)
+        node.name = name
+        self.__names.add(name)
+        return name
+
+    def onNodeNameChanged(self, old_name: str, new_name: str) -> None:
+        """
+        Event handler invoked when any of the nodes is renamed.
+        Node renamed to a name used by another node gets unique name derived from it.
+        """
+        node: QObject = self.sender()
+        assertTrue(isinstance(node, Node))
+        if node is self.__renamed_node:
+            return
+
+        self.__names.discard(old_name)
+        name: str = self.getFreeNodeName(new_name)
+        self.__names.add(name)
+        if name != new_name:
+            self.__renamed_node = node
             node.name = name
-            return name
+            self.__renamed_node = None
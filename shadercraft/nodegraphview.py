@@ -6,6 +6,7 @@ from PySide6.QtCore import QPointF, Qt, QPoint
 
 from .asserts import assertRef, assertTrue
 from .nodegraphscene import NodeGraphScene
+from .node_widget import NodeDetailLevel
 
 
 class NodeGraphView(QGraphicsView):
@@ -27,6 +28,10 @@ class NodeGraphView(QGraphicsView):
         self._scale: float = 1.0
         self._scale_increment: float = 0.1
 
+        # Zoom levels below which nodes and connections are drawn with simple detail
+        self.node_detail_scale: float = 0.5
+        self.connection_detail_scale: float = 0.35
+
         self._pan_enabled: bool = False
         self._pan_ongoing: bool = False
         self._pan_mouse_pos: QPointF = QPointF()
@@ -35,6 +40,27 @@ class NodeGraphView(QGraphicsView):
         """Bind graphics scene to this view"""
         self.__scene = scene
         super().setScene(scene)
+        self.updateDetailLevel()
+
+    def getScale(self) -> float:
+        """Get current zoom factor of the view"""
+        return self._scale
+
+    def zoom(self, factor: float) -> None:
+        """Scale the view by given factor and update detail level of the graph"""
+        self.scale(factor, factor)
+        self._scale *= factor
+        self.updateDetailLevel()
+
+    def updateDetailLevel(self) -> None:
+        """Update detail level of graph nodes and connections according to current zoom factor"""
+        if self.__scene is None:
+            return
+
+        simple: NodeDetailLevel = NodeDetailLevel.SIMPLE
+        full: NodeDetailLevel = NodeDetailLevel.FULL
+        self.__scene.setNodeDetailLevel(simple if self._scale < self.node_detail_scale else full)
+        self.__scene.setConnectionDetailLevel(simple if self._scale < self.connection_detail_scale else full)
 
     def wheelEvent(self, event: QWheelEvent) -> None:
         """
@@ -50,8 +76,7 @@ class NodeGraphView(QGraphicsView):
             # Zoom out graph viewport
             factor -= (1.0 / self._scale) * self._scale_increment
 
-        self.scale(factor, factor)
-        self._scale *= factor
+        self.zoom(factor)
 
     def mousePressEvent(self, event: QMouseEvent) -> None:
         """Event handler invoken when a mouse button is pressed on top of the view"""
@@ -0,0 +1,116 @@
+from __future__ import annotations
+from typing import Optional, Iterator
+from uuid import UUID
+import math
+
+from PySide6.QtCore import QPointF, QRectF
+
+from .asserts import assertRef, assertTrue
+
+# Pins are identified by UUID of their owner node and UUID of the node property they represent
+PinKey = tuple[UUID, UUID]
+
+
+class PinIndex:
+    """
+    Spatial index of node pin positions within the graph scene.
+    Pins are bucketed into uniform grid cells so lookups only visit the cells around the queried area,
+    keeping the cost independent of the total number of pins in the graph.
+    """
+
+    def __init__(self, cell_size: float = 64.0) -> None:
+        assertTrue(cell_size > 0, "Invalid pin index cell size")
+        self.cell_size: float = cell_size
+        self.__cells: dict[tuple[int, int], set[PinKey]] = {}
+        self.__positions: dict[PinKey, QPointF] = {}
+        self.__node_pins: dict[UUID, set[UUID]] = {}
+
+    def __len__(self) -> int:
+        return len(self.__positions)
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def _cellsInRect(self, rect: QRectF) -> Iterator[set[PinKey]]:
+        """Iterate over non empty cells overlapping given rectangle"""
+        left, top = self._cell(rect.left(), rect.top())
+        right, bottom = self._cell(rect.right(), rect.bottom())
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                cell: Optional[set[PinKey]] = self.__cells.get((cx, cy))
+                if cell:
+                    yield cell
+
+    def getPosition(self, node_uuid: UUID, pin_uuid: UUID) -> Optional[QPointF]:
+        """Get indexed scene position of given pin"""
+        return self.__positions.get((node_uuid, pin_uuid))
+
+    def setPosition(self, node_uuid: UUID, pin_uuid: UUID, pos: QPointF) -> None:
+        """Insert pin into the index or move already indexed pin to given scene position"""
+        assertRef(pos)
+        key: PinKey = (node_uuid, pin_uuid)
+        cell: tuple[int, int] = self._cell(pos.x(), pos.y())
+
+        old: Optional[QPointF] = self.__positions.get(key)
+        if old is not None:
+            old_cell: tuple[int, int] = self._cell(old.x(), old.y())
+            if old_cell == cell:
+                self.__positions[key] = pos
+                return
+            self._discard(old_cell, key)
+
+        self.__positions[key] = pos
+        self.__cells.setdefault(cell, set()).add(key)
+        self.__node_pins.setdefault(node_uuid, set()).add(pin_uuid)
+
+    def _discard(self, cell: tuple[int, int], key: PinKey) -> None:
+        bucket: set[PinKey] = self.__cells[cell]
+        bucket.discard(key)
+        if not bucket:
+            del self.__cells[cell]
+
+    def remove(self, node_uuid: UUID, pin_uuid: UUID) -> None:
+        """Remove given pin from the index"""
+        key: PinKey = (node_uuid, pin_uuid)
+        pos: Optional[QPointF] = self.__positions.pop(key, None)
+        if pos is None:
+            return
+
+        self._discard(self._cell(pos.x(), pos.y()), key)
+        pins: set[UUID] = self.__node_pins[node_uuid]
+        pins.discard(pin_uuid)
+        if not pins:
+            del self.__node_pins[node_uuid]
+
+    def removeNode(self, node_uuid: UUID) -> None:
+        """Remove all pins of given node from the index"""
+        for pin_uuid in list(self.__node_pins.get(node_uuid, ())):
+            self.remove(node_uuid, pin_uuid)
+
+    def findNearest(self, pos: QPointF, radius: float) -> Optional[PinKey]:
+        """
+        Find pin closest to given scene position.
+
+        Parameters:
+            pos (QPointF) : Scene position to search around.
+            radius (float) : Maximum distance of the pin from given position.
+
+        Returns:
+            (Optional[PinKey]) : Owner node UUID and property UUID of the nearest pin, None if there is no pin in range.
+        """
+        assertRef(pos)
+        nearest: Optional[PinKey] = None
+        nearest_dist: float = radius * radius
+        for cell in self._cellsInRect(QRectF(pos.x() - radius, pos.y() - radius, radius * 2, radius * 2)):
+            for key in cell:
+                delta: QPointF = self.__positions[key] - pos
+                dist: float = delta.x() * delta.x() + delta.y() * delta.y()
+                if dist <= nearest_dist:
+                    nearest = key
+                    nearest_dist = dist
+        return nearest
+
+    def query(self, rect: QRectF) -> list[PinKey]:
+        """Get all pins positioned within given scene rectangle"""
+        assertRef(rect)
+        return [key for cell in self._cellsInRect(rect) for key in cell if rect.contains(self.__positions[key])]
@@ -0,0 +1,72 @@
+import logging as Log
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from .asserts import assertTrue, assertType
+
+
+class RebuildScheduler(QObject):
+    """
+    Class collapsing bursts of preview rebuild requests into single rebuild.
+    Requests made within the same event loop turn or debounce window are merged and
+    only the latest state of the graph is rebuilt once the window elapses.
+    """
+    rebuild_requested: Signal = Signal(bool)
+
+    def __init__(self, debounce: int = 0, parent: QObject = None) -> None:
+        super().__init__(parent)
+        assertTrue(debounce >= 0, "Rebuild debounce window cannot be negative")
+        self.requests: int = 0
+        self.rebuilds: int = 0
+        self.__pending: bool = False
+        self.__rebuild_shader: bool = False
+        self.__timer: QTimer = QTimer(self)
+        self.__timer.setSingleShot(True)
+        self.__timer.setInterval(debounce)
+        self.__timer.timeout.connect(self.flush)
+
+    def getDebounce(self) -> int:
+        """Get rebuild debounce window in milliseconds"""
+        return self.__timer.interval()
+
+    def setDebounce(self, debounce: int) -> None:
+        """Set rebuild debounce window in milliseconds, 0 rebuilds once per event loop turn"""
+        assertType(debounce, int)
+        assertTrue(debounce >= 0, "Rebuild debounce window cannot be negative")
+        self.__timer.setInterval(debounce)
+
+    def isPending(self) -> bool:
+        """Get value indicating if there is rebuild waiting to be flushed"""
+        return self.__pending
+
+    def request(self, rebuild_shader: bool = True) -> None:
+        """
+        Request preview rebuild.
+        Window is not restarted by subsequent requests so continuous edits still rebuild periodically.
+
+        Parameters:
+            rebuild_shader (bool) : Request shader regeneration rather than plain redraw.
+        """
+        self.requests += 1
+        self.__pending = True
+        self.__rebuild_shader = self.__rebuild_shader or rebuild_shader
+        if not self.__timer.isActive():
+            self.__timer.start()
+
+    def cancel(self) -> None:
+        """Drop pending rebuild request"""
+        self.__timer.stop()
+        self.__pending = False
+        self.__rebuild_shader = False
+
+    def flush(self) -> None:
+        """Perform pending rebuild immediately"""
+        self.__timer.stop()
+        if not self.__pending:
+            return
+
+        rebuild_shader: bool = self.__rebuild_shader
+        self.__pending = False
+        self.__rebuild_shader = False
+        self.rebuilds += 1
+        Log.debug(f"Flushing preview rebuild, {self.requests} requests served by {self.rebuilds} rebuilds")
+        self.rebuild_requested.emit(rebuild_shader)
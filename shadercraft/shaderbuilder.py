@@ -0,0 +1,120 @@
+from typing import Optional
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import logging as Log
+from PySide6.QtCore import QObject, Signal
+
+from .asserts import assertRef
+from .shadernodes import ShaderNodeBase
+from .shadergen import ShaderGen, ShaderGenSnapshot, ShaderGenResult
+from .nodescheduler import GraphCycleError
+
+
+@dataclass
+class ShaderBuildResult:
+    """Shader sources generated by background build along with graph snapshot they were built from"""
+    build_id: int
+    snapshot: ShaderGenSnapshot
+    sources: Optional[ShaderGenResult]
+
+
+class ShaderBuilder(QObject):
+    """
+    Class generating shader sources from the graph on a worker thread.
+    Graph is snapshotted on the calling thread and code generation runs in the background.
+    Every new request cancels the build in flight so only result of the latest request is delivered.
+    """
+    build_finished: Signal = Signal(object)
+    _build_done: Signal = Signal(object)
+
+    def __init__(self, shader_gen: ShaderGen, parent: QObject = None) -> None:
+        super().__init__(parent)
+        assertRef(shader_gen)
+        self.shader_gen: ShaderGen = shader_gen
+        self.builds_requested: int = 0
+        self.builds_dropped: int = 0
+        self.__build_id: int = 0
+        self.__cancel: Optional[threading.Event] = None
+        self.__executor: Optional[ThreadPoolExecutor] = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="ShaderBuilder"
+        )
+
+        # Signal emitted from worker thread is queued and handled on the thread owning the builder
+        self._build_done.connect(self._onBuildDone)
+
+    def request(self, nodes: list[ShaderNodeBase]) -> Optional[int]:
+        """
+        Request shader build of the graph, any build in flight is cancelled.
+        Graphs which cannot be built are rejected and builds in flight are left running.
+
+        Parameters:
+            nodes (list[ShaderNodeBase]) : graph nodes - must contain one OutputShaderNode
+
+        Returns:
+            int : ID of requested build, None if the graph contains a cycle.
+        """
+        assertRef(self.__executor, "Shader builder was shut down")
+        try:
+            snapshot: ShaderGenSnapshot = self.shader_gen.snapshot(nodes)
+        except GraphCycleError as err:
+            Log.error(f"Shader build rejected: {err}")
+            return None
+
+        self.cancel()
+        self.__build_id += 1
+        self.__cancel = threading.Event()
+        self.builds_requested += 1
+        self.__executor.submit(self._build, self.__build_id, snapshot, self.__cancel)
+        return self.__build_id
+
+    def cancel(self) -> None:
+        """Cancel build in flight, its result is never delivered"""
+        if self.__cancel is not None:
+            self.__cancel.set()
+            self.__cancel = None
+
+    def isBusy(self) -> bool:
+        """Get value indicating if there is build in flight"""
+        return self.__cancel is not None
+
+    def shutdown(self) -> None:
+        """Cancel build in flight and wait for the worker thread to finish"""
+        self.cancel()
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True)
+            self.__executor = None
+
+    def _build(self, build_id: int, snapshot: ShaderGenSnapshot, cancel: threading.Event) -> None:
+        """Generate shader sources from given snapshot, runs on worker thread"""
+        if cancel.is_set():
+            return
+
+        try:
+            sources: Optional[ShaderGenResult] = self.shader_gen.generateFromSnapshot(snapshot, cancel)
+        except Exception as err:
+            Log.error(f"Failed to generate shader sources: {err}")
+            sources = None
+
+        if not cancel.is_set():
+            self._build_done.emit(ShaderBuildResult(build_id, snapshot, sources))
+
+    def _onBuildDone(self, result: ShaderBuildResult) -> None:
+        """Event handler invoked on owning thread when worker finishes generating shader sources"""
+        if result.build_id != self.__build_id:
+            self.builds_dropped += 1
+            return
+
+        self.__cancel = None
+        if result.sources is None:
+            return
+
+        if not ShaderGen.isSnapshotCurrent(result.snapshot):
+            # Graph changed while generating, newer request supersedes this build
+            Log.debug("Dropping shader build of outdated graph snapshot")
+            self.builds_dropped += 1
+            return
+
+        ShaderGen.acceptSnapshot(result.snapshot)
+        self.build_finished.emit(result)
@@ -1,50 +1,141 @@
 from __future__ import annotations
 from typing import Optional
-import importlib.resources as res
+from dataclasses import dataclass, field
+from uuid import UUID
 from string import Template as StringTemplate
 import os
 from pathlib import Path
 import logging as Log
 import textwrap
+import threading
 
 from .asserts import assertRef, assertTrue, assertType
-from .shadernodes import ShaderNodeBase, OutputShaderNode
+from .node import Node
+from .shadernodes import ShaderNodeBase, ShaderNodeState, OutputShaderNode
+from .shadertemplates import ShaderTemplateRegistry
+from .vectors import Vec3F
+
+
+@dataclass
+class ShaderGenSnapshot:
+    """
+    State of the graph captured for shader generation.
+    Snapshot records revisions of all nodes contributing to the output so generated
+    code can be validated against the graph once generation finishes.
+    Node references are only to be used on the thread owning the graph,
+    code is generated from the immutable node states captured along with them.
+    """
+    topology_revision: int = 0
+    nodes: list[ShaderNodeBase] = field(default_factory=list)
+    revisions: list[int] = field(default_factory=list)
+    states: list[ShaderNodeState] = field(default_factory=list)
+
+
+@dataclass
+class ShaderGenResult:
+    """Shader sources generated from graph snapshot"""
+    vs_source: str = ""
+    ps_source: str = ""
+    uniform_values: dict[str, object] = field(default_factory=dict)
+
 
 class ShaderGen(object):
-    def __init__(self) -> None:
+    def __init__(self, bake_uniforms: bool = False, template: str = "standard") -> None:
+        # Name of the template shader files pair that generated code is injected into
+        self.template: str = template
         self.vs_source: str = ""
         self.ps_source: str = ""
         self.vertex_shader: str = None
         self.pixel_shader: str = None
 
+        # Node inputs promoted to uniforms are declared as uniforms set by the host application.
+        # When baked they are declared as constants initialised with current input values instead,
+        # so generated shaders stay self contained, ie. when exported.
+        self.bake_uniforms: bool = bake_uniforms
+
+        # Generated node code snippets keyed by node UUID along with node revision they match
+        self.__snippets: dict[UUID, tuple[int, str]] = {}
+        self.snippet_hits: int = 0
+        self.snippet_misses: int = 0
+
+        # Generation can run on worker thread, snippet cache is guarded by this lock
+        self.__lock: threading.Lock = threading.Lock()
+
+    def _generateNodeSnippet(self, state: ShaderNodeState) -> str:
+        """
+        Get shader code snippet for node of given state along with its debug summary.
+        Snippets are only regenerated when node revision changes since last generation.
+        """
+        assertType(state, ShaderNodeState)
+
+        cached: Optional[tuple[int, str]] = self.__snippets.get(state.uuid)
+        if cached is not None and cached[0] == state.revision:
+            self.snippet_hits += 1
+            return cached[1]
+
+        summary: str = ShaderNodeBase.generateShaderCodeSummary(state)
+        code: str = state.node.generateShaderCode(state)
+        snippet: str = textwrap.indent(f"{summary}\n{code}\n\n", "    ")
+        self.__snippets[state.uuid] = (state.revision, snippet)
+        self.snippet_misses += 1
+        return snippet
+
+    def clearSnippetCache(self) -> None:
+        """Drop all cached node code snippets"""
+        with self.__lock:
+            self.__snippets.clear()
+
+    @staticmethod
+    def collectUniformValues(nodes: list[ShaderNodeBase]) -> dict[str, object]:
+        """
+        Collect current values of all node inputs promoted to shader uniforms.
+
+        Parameters:
+            nodes (list[ShaderNodeBase]) : Shader nodes to collect uniform values from.
+
+        Returns:
+            dict[str, object] : Uniform values keyed by uniform name.
+        """
+        values: dict[str, object] = {}
+        for node in nodes:
+            for node_input in node.getUniformInputs():
+                values[node_input.getUniformName()] = node_input.static_value
+        return values
+
+    def _generateUniformDeclaration(self, name: str, value: object) -> str:
+        """Generate GLSL declaration for promoted node input of given uniform name and value"""
+        if isinstance(value, Vec3F):
+            if self.bake_uniforms:
+                return f"const vec3 {name} = vec3({value.x}, {value.y}, {value.z});"
+            return f"uniform vec3 {name};"
+
+        if self.bake_uniforms:
+            return f"const float {name} = {value};"
+        return f"uniform float {name};"
+
     def _generateVertexShader(self) -> str:
         """
         Generate vertex shader source code.
         """
 
         # For the time being vertex shader is static data not influenced by shader nodes.
-        # This means we can simply load template file and return contents.
-        template: str = res.files(r"shadercraft.resources.shaders").joinpath("template_standard.vs")
-        assertTrue(os.path.exists(template), "Failed to locate vertex shader template file")
-
-        src: str = None
-        with open(template, "r", encoding="utf-8") as file:
-            src = file.read()
-
+        # This means we can simply return contents of the template file.
+        src: str = ShaderTemplateRegistry.default().getSource(f"template_{self.template}.vs")
         assertRef(src, "Failed to read vertex shader template file")
         return src
 
-    def _generatePixelShader(self, nodes: list[ShaderNodeBase]) -> str:
+    def snapshot(self, nodes: list[ShaderNodeBase]) -> ShaderGenSnapshot:
         """
-        Generate shader source grom given node.
-        The logic serialised from node is wrapped in interpretGraph() function.
+        Capture state of the graph for shader generation, must be called from the thread owning the graph.
 
         Parameters:
             nodes (list[ShaderNodeBase]) : graph nodes - must contain one OutputShaderNode
 
         Returns:
-            str : Shader source code
+            ShaderGenSnapshot : Nodes contributing to the output in evaluation order along with their revisions
+                and captured states.
         """
+        assertTrue(len(nodes) > 0)
 
         # Find OutputShader node.
         output_node: OutputShaderNode = None
@@ -57,47 +148,124 @@ class ShaderGen(object):
         assertRef(output_node, "Cannot find OuputShaderNode")
         logic_nodes: list[ShaderNodeBase] = output_node.getDownstreamNodes()
 
-        # Serialise shader code along with debug summary text.
+        # Only plain node data is captured here, code itself is generated from it by generateFromSnapshot()
+        states: list[ShaderNodeState] = [node.captureState() for node in logic_nodes]
+        return ShaderGenSnapshot(
+            Node.getTopologyRevision(),
+            logic_nodes,
+            [state.revision for state in states],
+            states
+        )
+
+    @staticmethod
+    def isSnapshotCurrent(snapshot: ShaderGenSnapshot) -> bool:
+        """Get value indicating if none of the snapshot nodes changed since the snapshot was taken"""
+        assertRef(snapshot)
+        if snapshot.topology_revision != Node.getTopologyRevision():
+            return False
+        return all(node.getRevision() == rev for node, rev in zip(snapshot.nodes, snapshot.revisions))
+
+    @staticmethod
+    def acceptSnapshot(snapshot: ShaderGenSnapshot) -> None:
+        """Mark snapshot nodes as up to date with generated shader code"""
+        for node in snapshot.nodes:
+            node.clearDirty()
+
+    def _generatePixelShader(
+            self,
+            snapshot: ShaderGenSnapshot,
+            cancel: Optional[threading.Event]
+    ) -> Optional[tuple[str, dict[str, object]]]:
+        """
+        Generate shader source from given graph snapshot.
+        The logic serialised from node is wrapped in interpretGraph() function.
+        Code is generated from captured node states only so it can run outside of the thread owning the graph.
+
+        Parameters:
+            snapshot (ShaderGenSnapshot) : Graph snapshot to generate code from.
+            cancel (threading.Event) : Optional event aborting the generation once set.
+
+        Returns:
+            tuple[str, dict[str, object]] : Shader source code and uniform values, None if generation was cancelled.
+        """
         src_items: list[str] = []
-        for node in logic_nodes:
-            assertType(node, ShaderNodeBase)
-            summary: str = node.generateShaderCodeSummary()
-            code: str = node.generateShaderCode()
-            src_items.append(summary)
-            src_items.append("\n")
-            src_items.append(code)
-            src_items.append("\n\n")
+        uniform_items: list[str] = []
+        uniform_values: dict[str, object] = {}
+        for state in snapshot.states:
+            if cancel is not None and cancel.is_set():
+                return None
+
+            src_items.append(self._generateNodeSnippet(state))
+            for node_input in state.getUniformInputs():
+                uniform_items.append(self._generateUniformDeclaration(node_input.uniform_name, node_input.value))
+                uniform_values[node_input.uniform_name] = node_input.value
+
+        # Drop snippets of nodes which are no longer part of the graph.
+        if len(self.__snippets) > len(snapshot.states):
+            live: set[UUID] = {state.uuid for state in snapshot.states}
+            self.__snippets = {k: v for k, v in self.__snippets.items() if k in live}
 
         # Load template pixel shader file and inject node generated code.
         node_src: str = "".join(src_items)
-        node_src = textwrap.indent(node_src, "    ")
-        template: str = res.files(r"shadercraft.resources.shaders").joinpath("template_standard.ps")
-        assertTrue(os.path.exists(template), "Failed to locate pixel shader template file")
-        src: str = None
-        with open(template, "r", encoding="utf-8") as file:
-            src = file.read()
+        src_template: StringTemplate = ShaderTemplateRegistry.default().getTemplate(
+            f"template_{self.template}.ps"
+        )
+        assertRef(src_template, "Failed to read pixel shader template file")
+        final_src: str = src_template.substitute(
+            graph_src=node_src,
+            uniform_src="\n".join(uniform_items)
+        )
+        return final_src, uniform_values
+
+    def generateFromSnapshot(
+            self,
+            snapshot: ShaderGenSnapshot,
+            cancel: Optional[threading.Event] = None
+    ) -> Optional[ShaderGenResult]:
+        """
+        Generates shader sources from given graph snapshot.
+        Only data captured by the snapshot is read so it is safe to call from worker thread.
+
+        Parameters:
+            snapshot (ShaderGenSnapshot) : Graph snapshot to generate code from.
+            cancel (threading.Event) : Optional event aborting the generation once set.
 
-        assertRef(src, "Failed to read pixel shader template file")
-        src_template: StringTemplate = StringTemplate(src)
-        final_src: str = src_template.substitute(graph_src=node_src)
+        Returns:
+            ShaderGenResult : Generated shader sources, None if generation was cancelled.
+        """
+        assertRef(snapshot)
+        with self.__lock:
+            Log.info("Generating shader sources...")
+            vs_source: str = self._generateVertexShader()
+            pixel_shader: Optional[tuple[str, dict[str, object]]] = self._generatePixelShader(snapshot, cancel)
+            if pixel_shader is None:
+                Log.debug("Shader source generation cancelled")
+                return None
 
-        return final_src
+            assertRef(vs_source)
+            ps_source, uniform_values = pixel_shader
+            return ShaderGenResult(vs_source, ps_source, uniform_values)
 
-    def generateSource(self, nodes: list[ShaderNodeBase]) -> None:
+    def generateSource(self, nodes: list[ShaderNodeBase]) -> ShaderGenResult:
         """
         Generates shader sources based on the given list of shader node.
         List of shader nodes must contain OutputShaderNode
 
         Parameters:
             nodes (list[ShaderNodeBase]) : List of shader nodes to build source from.
+
+        Returns:
+            ShaderGenResult : Generated shader sources along with values of promoted uniforms.
         """
-        assertTrue(len(nodes) > 0)
+        snapshot: ShaderGenSnapshot = self.snapshot(nodes)
+        result: ShaderGenResult = self.generateFromSnapshot(snapshot)
+        ShaderGen.acceptSnapshot(snapshot)
 
-        Log.info("Generating shader sources...")
-        self.vs_source = self._generateVertexShader()
-        self.ps_source = self._generatePixelShader(nodes)
+        self.vs_source = result.vs_source
+        self.ps_source = result.ps_source
         assertRef(self.vs_source)
         assertRef(self.ps_source)
+        return result
 
     def writeSource(self, output_dir: str) -> None:
         """
@@ -1,6 +1,7 @@
 from __future__ import annotations
+from typing import Optional
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from uuid import UUID
 import textwrap
 
@@ -41,7 +42,87 @@ class ShaderNodeIO(NodeIO):
 
         assertType(encoded_type, ShaderValueHint)
         self.encoded_type: ShaderValueHint = encoded_type
-        self.static_value: object = static_value
+        self.revision: int = 0
+        self.__static_value: object = static_value
+
+    @property
+    def static_value(self) -> object:
+        """Value used by this input property when it is not connected to any other node"""
+        return self.__static_value
+
+    @static_value.setter
+    def static_value(self, value: object) -> None:
+        self.__static_value = value
+        self.revision += 1
+        if self.owner is not None:
+            self.owner._onInputValueChanged(self)
+
+    def getUniformName(self) -> str:
+        """Get name of shader uniform this property static value is promoted to"""
+        return f"u_{self.uuid.hex}"
+
+    def isUniformPromotable(self) -> bool:
+        """Get value indicating if static value of this property can be promoted to shader uniform"""
+        return type(self.__static_value) in (float, Vec3F)
+
+
+@dataclass(frozen=True)
+class ShaderInputState:
+    """
+    Copy of shader node input data captured for code generation.
+    Connected inputs record the source node along with its output and name, static value is not captured for them.
+    """
+    uuid: UUID
+    uniform_name: str
+    value: object = None
+    source: Optional[tuple[ShaderNodeBase, UUID, str]] = None
+
+
+@dataclass(frozen=True)
+class ShaderNodeState:
+    """
+    Immutable copy of all shader node data its code is generated from.
+    State is captured on the thread owning the graph, generating code from it does not read any node data
+    that can change afterwards so it can run on any thread.
+    Node reference is only used to dispatch code generation, node IO definitions never change once created.
+    """
+    node: ShaderNodeBase
+    uuid: UUID
+    name: str
+    label: str
+    revision: int
+    promote_uniforms: bool = False
+    inputs: dict[UUID, ShaderInputState] = field(default_factory=dict)
+
+    def getInputValue(self, uuid: UUID) -> Optional[NodeValue]:
+        """
+        Get shader expression of node input matching given UUID.
+        Connected inputs resolve to output expression of the source node.
+
+        Returns:
+            (Optional[NodeValue]) : Input value expression, None if node has no input matching given UUID.
+        """
+        node_input: Optional[ShaderInputState] = self.inputs.get(uuid)
+        if node_input is None:
+            return None
+
+        if node_input.source is not None:
+            source, output_uuid, source_name = node_input.source
+            return source.generateOutputValue(source.getNodeOutput(output_uuid), source_name)
+        return ShaderNodeBase.formatInputValue(node_input.value, node_input.uniform_name, self.promote_uniforms)
+
+    def getOutputValue(self, uuid: UUID) -> Optional[NodeValue]:
+        """Get shader expression of node output matching given UUID"""
+        node_output: Optional[NodeIO] = self.node.getNodeOutput(uuid)
+        if node_output is None:
+            return None
+        return self.node.generateOutputValue(node_output, self.name)
+
+    def getUniformInputs(self) -> list[ShaderInputState]:
+        """Get all captured inputs which are promoted to shader uniforms"""
+        if not self.promote_uniforms:
+            return []
+        return [i for i in self.inputs.values() if i.source is None and type(i.value) in (float, Vec3F)]
 
 
 class ShaderNodeBase(Node):
@@ -51,32 +132,116 @@ class ShaderNodeBase(Node):
     shader code used to compile shaders.
     """
     label = "Shader Node"
+    # Nodes whose output changes over time keep the preview viewport redrawing continuously
+    time_dependent: bool = False
 
     def __init__(self) -> None:
         super().__init__()
+        self.__promote_uniforms: bool = False
 
-    def generateShaderCode(self) -> str:
+    def setUniformPromotion(self, enabled: bool) -> None:
+        """
+        Set value indicating if unconnected input static values are emitted as shader uniforms
+        rather than literals baked into generated code.
+        """
+        assertType(enabled, bool)
+        if enabled != self.__promote_uniforms:
+            self.__promote_uniforms = enabled
+            self.bumpRevision()
+
+    def getUniformPromotion(self) -> bool:
+        """Get value indicating if unconnected input static values are emitted as shader uniforms"""
+        return self.__promote_uniforms
+
+    def getUniformInputs(self) -> list[ShaderNodeIO]:
+        """Get all unconnected inputs of this node which are promoted to shader uniforms"""
+        if not self.__promote_uniforms:
+            return []
+
+        inputs: list[ShaderNodeIO] = []
+        for node_input in self.getNodeInputs():
+            if not isinstance(node_input, ShaderNodeIO) or not node_input.isUniformPromotable():
+                continue
+            if self.getConnectionFromInput(node_input) is None:
+                inputs.append(node_input)
+        return inputs
+
+    def _onInputValueChanged(self, node_input: NodeIO) -> None:
+        """
+        Event handler invoked when static value of one of this node inputs changes.
+        Promoted values do not change generated code so the node is not marked as changed.
+        """
+        if self.__promote_uniforms and isinstance(node_input, ShaderNodeIO):
+            if node_input.isUniformPromotable():
+                return
+        super()._onInputValueChanged(node_input)
+
+    def captureState(self) -> ShaderNodeState:
+        """
+        Capture copy of node data shader code is generated from.
+        Must be called from the thread owning the graph.
+        """
+        inputs: dict[UUID, ShaderInputState] = {}
+        for node_input in self.getNodeInputs():
+            assertType(node_input, ShaderNodeIO)
+            con = self.getConnectionFromInput(node_input)
+            if con is not None:
+                source: tuple[ShaderNodeBase, UUID, str] = (con.source, con.source_uuid, con.source.name)
+                inputs[node_input.uuid] = ShaderInputState(node_input.uuid, node_input.getUniformName(), source=source)
+            else:
+                value: object = node_input.static_value
+                if isinstance(value, Vec3F):
+                    value = Vec3F(value.x, value.y, value.z)
+                inputs[node_input.uuid] = ShaderInputState(node_input.uuid, node_input.getUniformName(), value)
+
+        return ShaderNodeState(
+            self,
+            self.uuid,
+            self.name,
+            self.label,
+            self.getRevision(),
+            self.__promote_uniforms,
+            inputs
+        )
+
+    def generateShaderCode(self, state: ShaderNodeState) -> str:
         """
         Get node generated shader code in a string form.
+        Code is generated only from given captured node state.
 
         Every shader node type must implement this method.
         """
         return ""
 
-    def generateShaderCodeSummary(self) -> str:
+    @staticmethod
+    def generateShaderCodeSummary(state: ShaderNodeState) -> str:
         """
-        Get summary for this shader node in a comment block format.
+        Get summary for shader node of given state in a comment block format.
         """
         summary: str = f"""
         /// -------------------------------------------------------------------
-        /// Node Class: {type(self)}
-        /// Node Label: {self.label}
-        /// Node Name: {self.name}
-        /// Node UUID: {self.uuid}
+        /// Node Class: {type(state.node)}
+        /// Node Label: {state.label}
+        /// Node Name: {state.name}
+        /// Node UUID: {state.uuid}
         ///--------------------------------------------------------------------
         """
         return textwrap.dedent(summary).strip()
 
+    def generateOutputValue(self, node_output: NodeIO, name: str) -> NodeValue:
+        """
+        Generate shader variable name of given output property for this node named with given name.
+        Shader variables of node outputs are derived from node name and output property name.
+        """
+        assertRef(node_output)
+        if self.getNodeOutput(node_output.uuid) is node_output:
+            return NodeValue(str, f"{name}_{node_output.name}")
+        return NodeValue.noValue()
+
+    def _generateOutput(self, node_output: NodeIO) -> NodeValue:
+        """Generate value for given node output property"""
+        return self.generateOutputValue(node_output, self.name)
+
     def canConnect(self, uuid: UUID, src_node: Node, src_uuid: UUID) -> bool:
         """
         Moderates connection requests to this shader node.
@@ -85,6 +250,9 @@ class ShaderNodeBase(Node):
             Good: FLOAT3 <-> FLOAT3
             Bad: FLOAT3 <-> FLOAT
         """
+        if not super().canConnect(uuid, src_node, src_uuid):
+            return False
+
         io0: ShaderNodeIO = self.getNodeInput(uuid)
         io1: ShaderNodeIO = src_node.getNodeOutput(src_uuid)
         assertRef(io0)
@@ -104,10 +272,28 @@ class ShaderNodeBase(Node):
         """
         assertType(node_input, ShaderNodeIO)
 
+        return ShaderNodeBase.formatInputValue(
+            node_input.static_value,
+            node_input.getUniformName(),
+            self.__promote_uniforms
+        )
+
+    @staticmethod
+    def formatInputValue(value: object, uniform_name: str, promote: bool) -> NodeValue:
+        """
+        Format static value of unconnected input property as shader expression.
+
+        Parameters:
+            value (object) : Static value of the input.
+            uniform_name (str) : Name of the uniform the value is promoted to.
+            promote (bool) : Reference the uniform instead of the literal value.
+        """
         # For the time being we only accept Float or Vec3F value types.
-        value: object = node_input.static_value
         assertTrue(type(value) in (float, Vec3F))
 
+        if promote:
+            return NodeValue(str, uniform_name)
+
         if isinstance(value, float):
             return NodeValue(str, f"{value}")
 
@@ -142,10 +328,10 @@ class OutputShaderNode(ShaderNodeBase):
         self.alpha_input = ShaderNodeIO("Alpha", "Alpha", ShaderValueHint.FLOAT, 1.0)
         self._registerInput(self.alpha_input)
 
-    def generateShaderCode(self) -> str:
+    def generateShaderCode(self, state: ShaderNodeState) -> str:
         """Generate shader code for this node"""
-        albedo_value: NodeValue = self.getNodeInputValue(self.albedo_input.uuid)
-        alpha_value: NodeValue = self.getNodeInputValue(self.alpha_input.uuid)
+        albedo_value: NodeValue = state.getInputValue(self.albedo_input.uuid)
+        alpha_value: NodeValue = state.getInputValue(self.alpha_input.uuid)
         assertRef(albedo_value)
         assertRef(alpha_value)
 
@@ -178,18 +364,12 @@ class FloatShaderNode(ShaderNodeBase):
         self.float_output = ShaderNodeIO("FloatOutput", "Out", ShaderValueHint.FLOAT)
         self._registerOutput(self.float_output)
 
-    def _generateOutput(self, node_output: NodeIO) -> NodeValue:
-        """Generate value for given node output property"""
-        if node_output is self.float_output:
-            return NodeValue(str, f"{self.name}_{self.float_output.name}")
-        return NodeValue.noValue()
-
-    def generateShaderCode(self) -> str:
+    def generateShaderCode(self, state: ShaderNodeState) -> str:
         """Generates float node shader code"""
-        val: NodeValue = self.getNodeInputValue(self.float_input.uuid)
+        val: NodeValue = state.getInputValue(self.float_input.uuid)
         assertRef(val)
 
-        src: str = f"float  {self.name}_{self.float_output.name} = {val.value};"
+        src: str = f"float  {state.name}_{self.float_output.name} = {val.value};"
         return src.strip()
 
 
@@ -215,14 +395,9 @@ class MulShaderNode(ShaderNodeBase):
         self.float_output = ShaderNodeIO("MulOutput", "Value", ShaderValueHint.FLOAT)
         self._registerOutput(self.float_output)
 
-    def _generateOutput(self, node_output: NodeIO) -> NodeValue:
-        if node_output is self.float_output:
-            return NodeValue(str, f"{self.name}_{self.float_output.name}")
-        return NodeValue.noValue()
-
-    def generateShaderCode(self) -> str:
-        val_a = self.getNodeInputValue(self.input_a.uuid)
-        val_b = self.getNodeInputValue(self.input_b.uuid)
+    def generateShaderCode(self, state: ShaderNodeState) -> str:
+        val_a = state.getInputValue(self.input_a.uuid)
+        val_b = state.getInputValue(self.input_b.uuid)
 
         assertRef(val_a)
         assertRef(val_b)
@@ -230,7 +405,7 @@ class MulShaderNode(ShaderNodeBase):
         src: str = f"""
         float {self.input_a.name} = {val_a.value};
         float {self.input_b.name} = {val_b.value};
-        float {self.name}_{self.float_output.name} = {self.input_a.name} * {self.input_b.name};
+        float {state.name}_{self.float_output.name} = {self.input_a.name} * {self.input_b.name};
 
         """
         return textwrap.dedent(src).strip()
@@ -259,28 +434,19 @@ class MakeVec3Node(ShaderNodeBase):
         self.output: ShaderNodeIO = ShaderNodeIO("Vec3Output", "Vec3", ShaderValueHint.FLOAT3)
         self._registerOutput(self.output)
 
-    def _generateOutput(self, node_output: NodeIO) -> NodeValue:
-        """
-        Generates vec3 output value shader reference.
-        """
-        if node_output is self.output:
-            return NodeValue(str, f"{self.name}_{self.output.name}")
-
-        return NodeValue.noValue()
-
-    def generateShaderCode(self) -> str:
+    def generateShaderCode(self, state: ShaderNodeState) -> str:
         """
         Generate GLSL shader source code for this node.
         """
 
-        x: NodeValue = self.getNodeInputValue(self.input_x.uuid)
-        y: NodeValue = self.getNodeInputValue(self.input_y.uuid)
-        z: NodeValue = self.getNodeInputValue(self.input_z.uuid)
+        x: NodeValue = state.getInputValue(self.input_x.uuid)
+        y: NodeValue = state.getInputValue(self.input_y.uuid)
+        z: NodeValue = state.getInputValue(self.input_z.uuid)
         assertRef(x)
         assertRef(y)
         assertRef(z)
 
-        output: NodeValue = self.getNodeOutputValue(self.output.uuid)
+        output: NodeValue = state.getOutputValue(self.output.uuid)
         assertRef(output)
         src: str = f"""
                 vec3 {output.value} = vec3({x.value}, {y.value}, {z.value});
@@ -311,28 +477,19 @@ class LerpNode(ShaderNodeBase):
         self.output: ShaderNodeIO = ShaderNodeIO("LerpOutput", "Out", ShaderValueHint.FLOAT)
         self._registerOutput(self.output)
 
-    def _generateOutput(self, node_output: NodeIO) -> NodeValue:
-        """
-        Generates vec3 output value shader reference.
-        """
-        if node_output is self.output:
-            return NodeValue(str, f"{self.name}_{self.output.name}")
-
-        return NodeValue.noValue()
-
-    def generateShaderCode(self) -> str:
+    def generateShaderCode(self, state: ShaderNodeState) -> str:
         """
         Generate GLSL shader source code for this node.
         """
 
-        a: NodeValue = self.getNodeInputValue(self.input_a.uuid)
-        b: NodeValue = self.getNodeInputValue(self.input_b.uuid)
-        t: NodeValue = self.getNodeInputValue(self.input_t.uuid)
+        a: NodeValue = state.getInputValue(self.input_a.uuid)
+        b: NodeValue = state.getInputValue(self.input_b.uuid)
+        t: NodeValue = state.getInputValue(self.input_t.uuid)
         assertRef(a)
         assertRef(b)
         assertRef(t)
 
-        output: NodeValue = self.getNodeOutputValue(self.output.uuid)
+        output: NodeValue = state.getOutputValue(self.output.uuid)
         assertRef(output)
         src: str = f"""
                 float {output.value} = mix({a.value}, {b.value}, {t.value});
@@ -376,28 +533,19 @@ class LerpVecNode(ShaderNodeBase):
         self.output: ShaderNodeIO = ShaderNodeIO("LerpOutput", "Out", ShaderValueHint.FLOAT3)
         self._registerOutput(self.output)
 
-    def _generateOutput(self, node_output: NodeIO) -> NodeValue:
-        """
-        Generates vec3 output value shader reference.
-        """
-        if node_output is self.output:
-            return NodeValue(str, f"{self.name}_{self.output.name}")
-
-        return NodeValue.noValue()
-
-    def generateShaderCode(self) -> str:
+    def generateShaderCode(self, state: ShaderNodeState) -> str:
         """
         Generate GLSL shader source code for this node.
         """
 
-        a: NodeValue = self.getNodeInputValue(self.input_a.uuid)
-        b: NodeValue = self.getNodeInputValue(self.input_b.uuid)
-        t: NodeValue = self.getNodeInputValue(self.input_t.uuid)
+        a: NodeValue = state.getInputValue(self.input_a.uuid)
+        b: NodeValue = state.getInputValue(self.input_b.uuid)
+        t: NodeValue = state.getInputValue(self.input_t.uuid)
         assertRef(a)
         assertRef(b)
         assertRef(t)
 
-        output: NodeValue = self.getNodeOutputValue(self.output.uuid)
+        output: NodeValue = state.getOutputValue(self.output.uuid)
         assertRef(output)
         src: str = f"""
                 vec3 {output.value} = mix({a.value}, {b.value}, {t.value});
@@ -420,16 +568,10 @@ class VertexColorShaderNode(ShaderNodeBase):
         self.output = ShaderNodeIO("VertexColorOutput", "Color", ShaderValueHint.FLOAT3)
         self._registerOutput(self.output)
 
-    def _generateOutput(self, node_output: NodeIO) -> NodeValue:
-        """Generate value for given node output property"""
-        if node_output is self.output:
-            return NodeValue(str, f"{self.name}_{self.output.name}")
-        return NodeValue.noValue()
-
-    def generateShaderCode(self) -> str:
+    def generateShaderCode(self, state: ShaderNodeState) -> str:
         """Generates float node shader code"""
 
-        src: str = f"vec3  {self.name}_{self.output.name} = pix_color;"
+        src: str = f"vec3  {state.name}_{self.output.name} = pix_color;"
         return src.strip()
 
 
@@ -447,16 +589,10 @@ class VertexNormalShaderNode(ShaderNodeBase):
         self.output = ShaderNodeIO("VertexNormalOutput", "Normal", ShaderValueHint.FLOAT3)
         self._registerOutput(self.output)
 
-    def _generateOutput(self, node_output: NodeIO) -> NodeValue:
-        """Generate value for given node output property"""
-        if node_output is self.output:
-            return NodeValue(str, f"{self.name}_{self.output.name}")
-        return NodeValue.noValue()
-
-    def generateShaderCode(self) -> str:
+    def generateShaderCode(self, state: ShaderNodeState) -> str:
         """Generates float node shader code"""
 
-        src: str = f"vec3  {self.name}_{self.output.name} = pix_normal;"
+        src: str = f"vec3  {state.name}_{self.output.name} = pix_normal;"
         return src.strip()
 
 
@@ -474,16 +610,10 @@ class VertexPositionShaderNode(ShaderNodeBase):
         self.output = ShaderNodeIO("VertexPositionOutput", "Position", ShaderValueHint.FLOAT3)
         self._registerOutput(self.output)
 
-    def _generateOutput(self, node_output: NodeIO) -> NodeValue:
-        """Generate value for given node output property"""
-        if node_output is self.output:
-            return NodeValue(str, f"{self.name}_{self.output.name}")
-        return NodeValue.noValue()
-
-    def generateShaderCode(self) -> str:
+    def generateShaderCode(self, state: ShaderNodeState) -> str:
         """Generates float node shader code"""
 
-        src: str = f"vec3  {self.name}_{self.output.name} = pix_position;"
+        src: str = f"vec3  {state.name}_{self.output.name} = pix_position;"
         return src.strip()
 
 
@@ -510,16 +640,10 @@ class VectorToColor(ShaderNodeBase):
         self.output = ShaderNodeIO("ColorOutput", "Color", ShaderValueHint.FLOAT3)
         self._registerOutput(self.output)
 
-    def _generateOutput(self, node_output: NodeIO) -> NodeValue:
-        """Generate value for given node output property"""
-        if node_output is self.output:
-            return NodeValue(str, f"{self.name}_{self.output.name}")
-        return NodeValue.noValue()
-
-    def generateShaderCode(self) -> str:
+    def generateShaderCode(self, state: ShaderNodeState) -> str:
         """Generates float node shader code"""
-        input_val: NodeValue = self.getNodeInputValue(self.input.uuid)
+        input_val: NodeValue = state.getInputValue(self.input.uuid)
         assertType(input_val, NodeValue)
 
-        src: str = f"vec3 {self.name}_{self.output.name} = {input_val.value} * 0.5 + 0.5;"
+        src: str = f"vec3 {state.name}_{self.output.name} = {input_val.value} * 0.5 + 0.5;"
         return src.strip()
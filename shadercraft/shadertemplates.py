@@ -0,0 +1,112 @@
+from __future__ import annotations
+from typing import Optional
+from dataclasses import dataclass
+from string import Template as StringTemplate
+import importlib.resources as res
+import os
+import logging as Log
+
+from .asserts import assertRef, assertTrue, assertType
+
+
+@dataclass
+class ShaderTemplate:
+    """
+    Class holding loaded shader template file.
+    Source is kept both as raw text and pre-parsed string template.
+    """
+    name: str = None
+    path: str = None
+    mtime: float = 0.0
+    source: str = None
+    template: StringTemplate = None
+
+
+class ShaderTemplateRegistry:
+    """
+    Process wide registry of shader template files.
+    Templates are loaded and parsed once, with file watching enabled they are reloaded when the file on disk changes.
+    Template names not registered explicitly are resolved from the shipped shader resources.
+    """
+    __default: Optional[ShaderTemplateRegistry] = None
+    resource_package: str = r"shadercraft.resources.shaders"
+
+    def __init__(self, watch_files: bool = False) -> None:
+        # Development only, when enabled template file modification time is checked on every access
+        # so edited templates are picked up without restarting the app.
+        self.watch_files: bool = watch_files
+        self.__paths: dict[str, str] = {}
+        self.__templates: dict[str, ShaderTemplate] = {}
+
+    @classmethod
+    def default(cls) -> ShaderTemplateRegistry:
+        """
+        Get process wide template registry instance.
+        Template files are watched for changes if SHADERCRAFT_WATCH_TEMPLATES environment variable is set to 1.
+        """
+        if cls.__default is None:
+            cls.__default = ShaderTemplateRegistry(os.environ.get("SHADERCRAFT_WATCH_TEMPLATES", "0") == "1")
+        return cls.__default
+
+    def register(self, name: str, path: str) -> None:
+        """
+        Register named template file.
+
+        Parameters:
+            name (str) : Name to access the template by.
+            path (str) : Filepath to the template file.
+        """
+        assertType(name, str)
+        assertType(path, str)
+        assertTrue(os.path.exists(path), f"Shader template file does not exist -> {path}")
+
+        self.__paths[name] = path
+        self.__templates.pop(name, None)
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drop loaded template of given name, all templates are dropped if no name is given"""
+        if name is None:
+            self.__templates.clear()
+        else:
+            self.__templates.pop(name, None)
+
+    def getPath(self, name: str) -> str:
+        """Get filepath of the template of given name"""
+        assertType(name, str)
+        path: Optional[str] = self.__paths.get(name)
+        if path is None:
+            path = str(res.files(self.resource_package).joinpath(name))
+            self.__paths[name] = path
+        return path
+
+    def get(self, name: str) -> ShaderTemplate:
+        """
+        Get loaded template of given name.
+        Template file is only read from disk on first access or, with file watching enabled, when it changed since.
+        """
+        template: Optional[ShaderTemplate] = self.__templates.get(name)
+        if template is not None and not self.watch_files:
+            return template
+
+        path: str = self.getPath(name)
+        assertTrue(os.path.exists(path), f"Failed to locate shader template file -> {path}")
+        mtime: float = os.path.getmtime(path)
+        if template is not None and template.mtime == mtime:
+            return template
+
+        Log.debug(f"Loading shader template '{name}' -> {path}")
+        with open(path, "r", encoding="utf-8") as file:
+            src: str = file.read()
+        assertRef(src, f"Failed to read shader template file -> {path}")
+
+        template = ShaderTemplate(name, path, mtime, src, StringTemplate(src))
+        self.__templates[name] = template
+        return template
+
+    def getSource(self, name: str) -> str:
+        """Get raw source of the template of given name"""
+        return self.get(name).source
+
+    def getTemplate(self, name: str) -> StringTemplate:
+        """Get pre-parsed string template of the template of given name"""
+        return self.get(name).template
@@ -1,52 +1,16 @@
 
 
-node_widget_style = """
-   #NodeWidget {
-        background-color: black;
-   }
-
-   #NodeLabelArea {
-        background-color: grey;
-   }
-
-   #NodeLabelText {
-        font-weight: bold;
-        font-size: 14px;
-   }
-
-   #NodeNameText {
-        font-weight: normal;
-        font-size: 10px;
-   }
-
-   #NodeArea {
-        background-color: #303030;
-   }
-"""
-
-node_selected_widget_style = """
-   #NodeWidget {
-        background-color: orange;
-   }
-
-   #NodeLabelArea {
-        background-color: grey;
-   }
-
-   #NodeLabelText {
-        font-weight: bold;
-        font-size: 14px;
-   }
-
-   #NodeNameText {
-        font-weight: normal;
-        font-size: 10px;
-   }
-
-   #NodeArea {
-        background-color: #303030;
-   }
-"""
+from PySide6.QtGui import QColor
+
+# Node colors are shared by all nodes and applied through palettes and painting.
+# Per node stylesheets are avoided as Qt re-parses and re-polishes them for every widget.
+node_border_color: QColor = QColor(0, 0, 0)
+node_selected_border_color: QColor = QColor(255, 165, 0)
+node_label_area_color: QColor = QColor(128, 128, 128)
+node_area_color: QColor = QColor(48, 48, 48)
+node_pin_color: QColor = QColor(0, 255, 0)
+node_label_text_color: QColor = QColor(0, 0, 0)
+node_text_color: QColor = QColor(200, 200, 200)
 
 app_style = """
     QMainWindow {
@@ -1,32 +1,88 @@
 import os
 import ctypes
+from typing import Optional, Callable
 import logging as Log
 import OpenGL.GL as GL
 from PySide6.QtWidgets import QWidget
 from PySide6.QtOpenGLWidgets import QOpenGLWidget
-from PySide6.QtGui import QOpenGLContext
-from PySide6.QtCore import QTimer
+from PySide6.QtGui import QOpenGLContext, QShowEvent, QHideEvent
+from PySide6.QtCore import QTimer, Signal
 
 from .asserts import assertRef, assertTrue, assertType
-from .gfx import GFX, GFXRenderable
+from .gfx import GFX, GFXRenderable, GFXProgramCache, GFXProgramBinaryCache, GFXProgramBuild, GFXStateCache
+from .gfxmeshes import GFXMeshData, GFXMeshes
+from .gfxresources import GFXResourceManager, GFXResourceKind
 
 
 class ViewportWidget(QOpenGLWidget):
+    shader_build_finished: Signal = Signal(bool)
+
+    # Preview mesh generators keyed by preview mesh name
+    preview_meshes: dict[str, Callable[[], GFXMeshData]] = {
+        "sphere": lambda: GFXMeshes.sphere(1.0, 64, 64),
+        "plane": lambda: GFXMeshes.plane(1.5, 16),
+        "cube": lambda: GFXMeshes.cube(1.0),
+        "torus": lambda: GFXMeshes.torus(0.6, 0.25, 64, 32),
+        "cylinder": lambda: GFXMeshes.cylinder(0.5, 1.2, 64)
+    }
+
     def __init__(self, parent: QWidget = None) -> None:
         super().__init__(parent)
+        self.preview_mesh: str = "sphere"
+        self.__preview_renderables: dict[str, GFXRenderable] = {}
         self.fallback_shader: GL.GLuint = None
         self.active_shader: GL.GLuint = None
         self.preview_geo: GFXRenderable = None
+        # All GL objects of the viewport context are owned by resource manager
+        self.resources: GFXResourceManager = GFXResourceManager()
+        self.program_cache: GFXProgramCache = GFXProgramCache(resources=self.resources)
+        self.gl_state: GFXStateCache = GFXStateCache()
+        self.resources.addDeleteListener(self.gl_state.onResourceDeleted)
+        self.binary_cache: Optional[GFXProgramBinaryCache] = None
+        self.binary_cache_enabled: bool = True
+        self.uniform_values: dict[str, object] = {}
+        self.__uniforms_dirty: bool = False
+
+        # Viewport is only redrawn when its contents change, continuous redraws
+        # are driven by animation timer while previewing time dependent shaders.
+        self.redraw_count: int = 0
+        self.animation_interval: int = 16
+        self.animation_timer: QTimer = QTimer(self)
+        self.animation_timer.timeout.connect(self.requestRedraw)
+        self.__animating: bool = False
+        self.__redraw_suspended: bool = False
+        self.__redraw_pending: bool = False
+
+        # Shader programs requested asynchronously are built while the active program keeps drawing,
+        # build completion is polled when the driver compiles shaders on its own threads.
+        self.parallel_compile: bool = False
+        self.build_poll_interval: int = 5
+        self.build_timer: QTimer = QTimer(self)
+        self.build_timer.timeout.connect(self._pollShaderBuild)
+        self.__pending_build: Optional[tuple[str, GFXProgramBuild]] = None
+        self.__deferred_sources: Optional[tuple[str, str]] = None
 
     def initializeGL(self) -> None:
         """Initialise graphics context for this widget"""
         Log.info("Attempting to initialise OpenGL context")
         Log.info(f"OpenGL Version: {GL.glGetString(GL.GL_VERSION).decode()}")
         self.context().makeCurrent(self.context().surface())
-        self.fallback_shader = GFX.createFallbackShaderProgram()
-        self.active_shader = self.fallback_shader
-        self.preview_geo = GFX.createSphereRenderable(1, 64, 64)
-        GFX.bindRenderableShader(self.preview_geo, self.active_shader)
+        self.context().aboutToBeDestroyed.connect(self._releaseGLResources)
+        self.gl_state.invalidate()
+        if self.binary_cache_enabled:
+            self.binary_cache = GFXProgramBinaryCache()
+        self.fallback_shader = self.resources.trackProgram(GFX.createFallbackShaderProgram(), "fallback")
+        self._setActiveShader(self.fallback_shader)
+        self.__preview_renderables.clear()
+        self.preview_geo = self._getPreviewRenderable(self.preview_mesh)
+        self.parallel_compile = GFX.enableParallelShaderCompile()
+        Log.info(f"Parallel shader compilation enabled: {self.parallel_compile}")
+
+        # Shader requested before the context existed
+        if self.__deferred_sources is not None:
+            vs_src, ps_src = self.__deferred_sources
+            self.__deferred_sources = None
+            self.requestShaderSourceAsync(vs_src, ps_src)
 
         # Enable OpenGL debug logging
         # TODO: We should drive this using app settings
@@ -38,23 +94,26 @@ class ViewportWidget(QOpenGLWidget):
     def paintGL(self) -> None:
         """Redraw GL surface"""
         self.makeCurrent()
+        self.__redraw_pending = False
+        self.redraw_count += 1
 
         # Clear render target
         GL.glClearColor(0.33, 0.33, 0.33, 1.0)
         GL.glClear(GL.GL_COLOR_BUFFER_BIT)
 
-        # Bind geometry buffers and shader
-        GL.glBindVertexArray(self.preview_geo.vao)
-        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.preview_geo.vbo[0])
-        GL.glUseProgram(self.active_shader)
-        GL.glBindVertexArray(self.preview_geo.vao)
+        # Bind geometry and shader, binds are skipped when unchanged since last frame
+        # Vertex array object holds all buffer bindings including element buffer
+        self.gl_state.useProgram(self.active_shader)
+        self.gl_state.bindVertexArray(self.preview_geo.vao)
+        if self.__uniforms_dirty:
+            self._uploadUniformValues()
 
-        # Draw
+        # Draw from index buffer already resident on the GPU
         GL.glDrawElements(
             GL.GL_TRIANGLES,
             len(self.preview_geo.indices),
             GL.GL_UNSIGNED_INT,
-            self.preview_geo.indices
+            None
         )
 
     def resizeGL(self, w: int, h: int) -> None:
@@ -65,9 +124,137 @@ class ViewportWidget(QOpenGLWidget):
         Log.debug("Resizing OpenGL viewport widget")
         GL.glViewport(0, 0, w, h)
 
+    def _getPreviewRenderable(self, name: str) -> GFXRenderable:
+        """Get renderable of given preview mesh, mesh buffers are created on first use"""
+        renderable: Optional[GFXRenderable] = self.__preview_renderables.get(name)
+        if renderable is None:
+            renderable = GFX.createMeshRenderable(self.preview_meshes[name]())
+            self.resources.trackRenderable(renderable, f"{name} mesh")
+            # Buffer creation changes bindings behind the state cache
+            self.gl_state.invalidate()
+            self.__preview_renderables[name] = renderable
+        return renderable
+
+    def _releaseGLResources(self) -> None:
+        """Delete all GL objects of the viewport, invoked before its GL context gets destroyed"""
+        Log.debug("Releasing viewport OpenGL resources")
+        self.makeCurrent()
+        self.cancelShaderBuild()
+        self.program_cache.clear()
+        self.resources.logStats()
+        self.resources.releaseAll()
+        self.active_shader = None
+        self.fallback_shader = None
+        self.preview_geo = None
+        self.__preview_renderables.clear()
+        self.doneCurrent()
+
+    def setPreviewMesh(self, name: str) -> None:
+        """
+        Switch geometry drawn by the viewport.
+
+        Parameters:
+            name (str) : Name of the preview mesh, see ViewportWidget.preview_meshes.
+        """
+        assertTrue(name in self.preview_meshes, f"Unknown preview mesh '{name}'")
+        self.preview_mesh = name
+        if self.preview_geo is None:
+            # Mesh is created once GL context gets initialised
+            return
+
+        self.makeCurrent()
+        self.preview_geo = self._getPreviewRenderable(name)
+        self.requestRedraw()
+
     def requestRedraw(self) -> None:
-        """Redraws the OpenGL viewport"""
-        self.update()
+        """
+        Schedule redraw of the OpenGL viewport.
+        Redraw requests are deferred while the viewport is hidden or redraws are suspended.
+        """
+        self.__redraw_pending = True
+        if not self.isRedrawSuspended():
+            self.update()
+
+    def isRedrawPending(self) -> bool:
+        """Get value indicating if viewport contents changed since last redraw"""
+        return self.__redraw_pending
+
+    def isRedrawSuspended(self) -> bool:
+        """Get value indicating if viewport redraws are currently suspended"""
+        return self.__redraw_suspended or not self.isVisible()
+
+    def setRedrawSuspended(self, suspended: bool) -> None:
+        """
+        Suspend or resume viewport redraws, eg. while the window is minimized.
+        Redraws requested while suspended are performed once redraws are resumed.
+        """
+        assertType(suspended, bool)
+        self.__redraw_suspended = suspended
+        self._updateAnimationTimer()
+        if self.__redraw_pending and not self.isRedrawSuspended():
+            self.update()
+
+    def isAnimating(self) -> bool:
+        """Get value indicating if viewport continuously redraws animated contents"""
+        return self.__animating
+
+    def setAnimating(self, enabled: bool) -> None:
+        """Enable or disable continuous redraws of time dependent viewport contents"""
+        assertType(enabled, bool)
+        self.__animating = enabled
+        self._updateAnimationTimer()
+
+    def _updateAnimationTimer(self) -> None:
+        """Run animation timer only while animating and redraws are not suspended"""
+        if self.__animating and not self.isRedrawSuspended():
+            if not self.animation_timer.isActive():
+                self.animation_timer.start(self.animation_interval)
+        else:
+            self.animation_timer.stop()
+
+    def showEvent(self, event: QShowEvent) -> None:
+        """Event handler invoked when viewport becomes visible, resumes deferred redraws"""
+        super().showEvent(event)
+        self._updateAnimationTimer()
+        if self.__redraw_pending and not self.isRedrawSuspended():
+            self.update()
+
+    def hideEvent(self, event: QHideEvent) -> None:
+        """Event handler invoked when viewport gets hidden, stops animation redraws"""
+        super().hideEvent(event)
+        self._updateAnimationTimer()
+
+    def setUniformValues(self, values: dict[str, object]) -> None:
+        """
+        Set values of active shader uniforms, values are uploaded on next redraw.
+
+        Parameters:
+            values (dict[str, object]) : Float or Vec3F uniform values keyed by uniform name.
+        """
+        assertType(values, dict)
+        self.uniform_values = dict(values)
+        self.__uniforms_dirty = True
+        self.requestRedraw()
+
+    def _setActiveShader(self, shader: GL.GLuint) -> None:
+        """
+        Swap active shader program, uniform values are re-uploaded to the new program.
+        Viewport holds a reference to active program so it is not deleted while drawing with it.
+        """
+        if shader:
+            self.resources.acquire(GFXResourceKind.PROGRAM, shader)
+        if self.active_shader and self.resources.isOwned(GFXResourceKind.PROGRAM, self.active_shader):
+            self.resources.release(GFXResourceKind.PROGRAM, self.active_shader)
+        self.active_shader = shader
+        self.__uniforms_dirty = True
+        self.requestRedraw()
+
+    def _uploadUniformValues(self) -> None:
+        """Upload uniform values to currently bound shader program, unchanged values are skipped"""
+        for name, value in self.uniform_values.items():
+            self.gl_state.setUniform(self.active_shader, name, value)
+
+        self.__uniforms_dirty = False
 
     def requestShader(self, vs: str, ps: str) -> bool:
         """
@@ -86,16 +273,138 @@ class ViewportWidget(QOpenGLWidget):
         assertTrue(os.path.exists(vs))
         assertTrue(os.path.exists(ps))
 
+        with open(vs, "r", encoding="utf-8") as file:
+            vs_src: str = file.read()
+        with open(ps, "r", encoding="utf-8") as file:
+            ps_src: str = file.read()
+
+        return self.requestShaderSource(vs_src, ps_src)
+
+    def requestShaderSource(self, vs_src: str, ps_src: str) -> bool:
+        """
+        Attempts to compile and bind new shader for the preview geometry from in memory sources.
+
+        Parameters:
+            vs_src (str) : Vertex shader source code.
+            ps_src (str) : Pixel shader source code.
+
+        Returns:
+            bool : True of shader compile succeded, False otherwise.
+        """
+
+        assertType(vs_src, str)
+        assertType(ps_src, str)
+
         self.makeCurrent()
-        shader: GL.GLuint = GFX.createShaderFromFiles(vs, ps)
-        if shader == 0:
-            Log.warning("Failed to load or compile shade source files")
-            self.active_shader = self.fallback_shader
-            return False
+        self.cancelShaderBuild()
 
-        self.active_shader = shader
+        # Identical sources were compiled before, simply rebind cached program
+        key: str = GFXProgramCache.hashSources(vs_src, ps_src)
+        shader: Optional[GL.GLuint] = self.program_cache.get(key)
+        if shader is None:
+            shader = self._loadShaderProgram(key, vs_src, ps_src)
+            if shader:
+                self.program_cache.put(key, shader)
+        Log.debug(f"Shader program cache hit rate: {self.program_cache.getHitRate():.2f}")
+
+        return self._bindPreviewShader(shader)
+
+    def requestShaderSourceAsync(self, vs_src: str, ps_src: str) -> None:
+        """
+        Start building shader for the preview geometry without waiting for the driver.
+        Active shader keeps drawing until the new program is ready, any build in flight is cancelled.
+        Emits shader_build_finished once the new program is bound.
+
+        Parameters:
+            vs_src (str) : Vertex shader source code.
+            ps_src (str) : Pixel shader source code.
+        """
+        assertType(vs_src, str)
+        assertType(ps_src, str)
+        if self.fallback_shader is None:
+            Log.debug("Deferring shader build until OpenGL context is initialised")
+            self.__deferred_sources = (vs_src, ps_src)
+            return
+
+        self.makeCurrent()
+        self.cancelShaderBuild()
+
+        # Cached and previously saved programs are bound straight away
+        key: str = GFXProgramCache.hashSources(vs_src, ps_src)
+        shader: Optional[GL.GLuint] = self.program_cache.get(key)
+        if shader is None and self.binary_cache is not None:
+            shader = self.binary_cache.load(key)
+            if shader:
+                self.program_cache.put(key, shader)
+        if shader:
+            self.shader_build_finished.emit(self._bindPreviewShader(shader))
+            return
+
+        build: GFXProgramBuild = GFXProgramBuild(
+            vs_src,
+            ps_src,
+            retrievable=self.binary_cache is not None,
+            parallel=self.parallel_compile
+        )
+        self.__pending_build = (key, build)
+        self.build_timer.start(self.build_poll_interval if self.parallel_compile else 0)
+
+    def isShaderBuildPending(self) -> bool:
+        """Get value indicating if there is shader build in flight"""
+        return self.__pending_build is not None
+
+    def cancelShaderBuild(self) -> None:
+        """Abandon shader build in flight, active shader is kept"""
+        self.build_timer.stop()
+        if self.__pending_build is not None:
+            self.makeCurrent()
+            self.__pending_build[1].cancel()
+            self.__pending_build = None
+
+    def _pollShaderBuild(self) -> None:
+        """Bind shader build in flight once the driver finished building it"""
+        if self.__pending_build is None:
+            self.build_timer.stop()
+            return
+
+        self.makeCurrent()
+        key, build = self.__pending_build
+        if not build.isReady():
+            return
+
+        self.build_timer.stop()
+        self.__pending_build = None
+        shader: Optional[GL.GLuint] = build.finish()
+        if shader:
+            self.program_cache.put(key, shader)
+            if self.binary_cache is not None:
+                self.binary_cache.save(key, shader)
+        self.shader_build_finished.emit(self._bindPreviewShader(shader))
+
+    def _loadShaderProgram(self, key: str, vs_src: str, ps_src: str) -> Optional[GL.GLuint]:
+        """
+        Create shader program from given sources.
+        Programs are loaded from on disk binary cache when possible, compiled otherwise.
+        """
+        if self.binary_cache is None:
+            return GFX.createShaderFromSource(vs_src, ps_src)
+
+        shader: Optional[GL.GLuint] = self.binary_cache.load(key)
+        if shader is None:
+            shader = GFX.createShaderFromSource(vs_src, ps_src, retrievable=True)
+            if shader:
+                self.binary_cache.save(key, shader)
+        return shader
+
+    def _bindPreviewShader(self, shader: Optional[GL.GLuint]) -> bool:
+        """Bind given shader program to preview geometry, fallback shader is used if shader is invalid"""
+        if not shader:
+            Log.warning("Failed to load or compile shader sources")
+            self._setActiveShader(self.fallback_shader)
+            return False
 
-        GFX.bindRenderableShader(self.preview_geo, self.active_shader)
+        # Vertex attribute locations are fixed by the vertex layout, geometry needs no rebinding
+        self._setActiveShader(shader)
         return True
 
     @staticmethod
@@ -0,0 +1,323 @@
+import os
+import struct
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+
+from shadercraft.gfx import (
+    GFXProgramCache, GFXProgramBinaryCache, GFXVertexLayout, GFXVertexAttribute, GFXStateCache
+)
+from shadercraft.gfxmeshes import GFXMeshData, GFXMeshes
+from shadercraft.gfxresources import GFXResourceManager, GFXResourceKind
+from shadercraft.vectors import Vec3F
+
+
+class GFXProgramCacheTest(unittest.TestCase):
+    def testLeastRecentlyUsedEviction(self) -> None:
+        """
+        Test that least recently used programs are evicted and deleted first.
+        """
+        cache: GFXProgramCache = GFXProgramCache(capacity=2)
+        key0: str = GFXProgramCache.hashSources("vs", "ps0")
+        key1: str = GFXProgramCache.hashSources("vs", "ps1")
+        key2: str = GFXProgramCache.hashSources("vs", "ps2")
+        assert key0 != key1, "Different sources should produce different keys"
+        assert key0 == GFXProgramCache.hashSources("vs", "ps0")
+
+        with mock.patch("shadercraft.gfx.GL.glDeleteProgram") as delete_program:
+            cache.put(key0, 10)
+            cache.put(key1, 11)
+            assert cache.get(key0) == 10
+            cache.put(key2, 12)
+            delete_program.assert_called_once_with(11)
+
+        assert cache.get(key1) is None
+        assert cache.get(key2) == 12
+        assert len(cache) == 2
+        assert cache.getHitRate() == 2 / 3
+
+
+class GFXProgramBinaryCacheTest(unittest.TestCase):
+    context_key: str = "Mesa|llvmpipe (LLVM 15.0.7, 256 bits)|4.5 (Core Profile) Mesa 23.2.1"
+
+    def setUp(self) -> None:
+        self.tmp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.binary: bytes = bytes(range(64))
+        self.binary_format: int = 0x8E7C
+
+        # Fake GL driver accepting only binaries it produced itself
+        self.gl_patch = mock.patch("shadercraft.gfx.GL")
+        self.gl: mock.MagicMock = self.gl_patch.start()
+        self.gl.glGetIntegerv.return_value = 1
+        self.gl.glCreateProgram.return_value = 42
+        self.gl.glGetProgramBinary.return_value = (np.frombuffer(self.binary, dtype=np.uint8), self.binary_format, 64)
+        self.loaded: list[tuple[int, bytes]] = []
+        self.gl.glProgramBinary.side_effect = \
+            lambda program, binary_format, binary, length: self.loaded.append((binary_format, bytes(binary)))
+        self.gl.glGetProgramiv.side_effect = self.getProgramiv
+
+    def tearDown(self) -> None:
+        self.gl_patch.stop()
+        self.tmp_dir.cleanup()
+
+    def getProgramiv(self, program: int, pname: object) -> int:
+        if pname is self.gl.GL_PROGRAM_BINARY_LENGTH:
+            return len(self.binary)
+        return int(self.loaded[-1] == (self.binary_format, self.binary))
+
+    def createCache(self, context_key: str) -> GFXProgramBinaryCache:
+        with mock.patch.object(GFXProgramBinaryCache, "getContextKey", return_value=context_key):
+            cache: GFXProgramBinaryCache = GFXProgramBinaryCache(self.tmp_dir.name)
+        assert cache.enabled
+        return cache
+
+    def testRoundTrip(self) -> None:
+        """
+        Test that saved program binaries are loaded back with their binary format.
+        """
+        cache: GFXProgramBinaryCache = self.createCache(self.context_key)
+        key: str = GFXProgramCache.hashSources("vs", "ps")
+        assert cache.load(key) is None, "Missing binary should not create program"
+        self.gl.glCreateProgram.assert_not_called()
+
+        assert cache.save(key, 7)
+        with open(cache.getPath(key), "rb") as file:
+            assert struct.unpack_from("<I", file.read())[0] == self.binary_format
+
+        assert cache.load(key) == 42
+        assert self.loaded == [(self.binary_format, self.binary)]
+        assert self.createCache(self.context_key).load(key) == 42, "Binaries should persist across sessions"
+
+    def testContextKeyMismatch(self) -> None:
+        """
+        Test that binaries produced by different vendor, renderer or driver version are never loaded.
+        """
+        key: str = GFXProgramCache.hashSources("vs", "ps")
+        assert self.createCache(self.context_key).save(key, 7)
+
+        vendor, renderer, version = self.context_key.split("|")
+        for other in (
+            f"NVIDIA Corporation|{renderer}|{version}",
+            f"{vendor}|llvmpipe (LLVM 17.0.6, 256 bits)|{version}",
+            f"{vendor}|{renderer}|4.5 (Core Profile) Mesa 24.0.5"
+        ):
+            cache: GFXProgramBinaryCache = self.createCache(other)
+            assert cache.getPath(key) != self.createCache(self.context_key).getPath(key)
+            assert cache.load(key) is None
+        self.gl.glCreateProgram.assert_not_called()
+        assert len(os.listdir(self.tmp_dir.name)) == 1, "Binaries of other contexts should be left intact"
+
+    def testCorruptBinary(self) -> None:
+        """
+        Test that truncated or corrupt binaries are discarded.
+        """
+        cache: GFXProgramBinaryCache = self.createCache(self.context_key)
+        key: str = GFXProgramCache.hashSources("vs", "ps")
+        path: str = cache.getPath(key)
+
+        # Truncated header and header without binary payload
+        for data in (b"\x7c\x8e", struct.pack("<I", self.binary_format)):
+            with open(path, "wb") as file:
+                file.write(data)
+            assert cache.load(key) is None
+            assert not os.path.exists(path), "Truncated binary should be removed"
+        self.gl.glCreateProgram.assert_not_called()
+
+        # Binary rejected by the driver
+        with open(path, "wb") as file:
+            file.write(struct.pack("<I", self.binary_format) + b"garbage")
+        assert cache.load(key) is None
+        self.gl.glDeleteProgram.assert_called_once_with(42)
+        assert not os.path.exists(path), "Rejected binary should be removed"
+
+
+class GFXResourceManagerTest(unittest.TestCase):
+    def testReferenceCounting(self) -> None:
+        """
+        Test that objects are deleted once their last reference is released.
+        """
+        resources: GFXResourceManager = GFXResourceManager()
+        with mock.patch("shadercraft.gfxresources.GL") as gl:
+            resources.track(GFXResourceKind.BUFFER, 3, "vertices", 1024)
+            resources.track(GFXResourceKind.VERTEX_ARRAY, 4, "mesh")
+            resources.acquire(GFXResourceKind.BUFFER, 3)
+            assert resources.getLiveCount() == 2
+            assert resources.getLiveBytes(GFXResourceKind.BUFFER) == 1024
+
+            assert not resources.release(GFXResourceKind.BUFFER, 3)
+            gl.glDeleteBuffers.assert_not_called()
+            assert resources.release(GFXResourceKind.BUFFER, 3)
+            gl.glDeleteBuffers.assert_called_once_with(1, [3])
+
+            resources.releaseAll()
+            gl.glDeleteVertexArrays.assert_called_once_with(1, [4])
+
+        assert resources.getLiveCount() == 0
+        assert resources.created[GFXResourceKind.BUFFER] == resources.deleted[GFXResourceKind.BUFFER] == 1
+
+    def testCachedProgramLifetime(self) -> None:
+        """
+        Test that program evicted from the cache is kept alive until its last user releases it.
+        """
+        resources: GFXResourceManager = GFXResourceManager()
+        cache: GFXProgramCache = GFXProgramCache(capacity=1, resources=resources)
+        with mock.patch("shadercraft.gfxresources.GL") as gl:
+            gl.glGetProgramiv.return_value = 256
+            cache.put("a", 10)
+            resources.acquire(GFXResourceKind.PROGRAM, 10)
+            assert resources.getLiveBytes(GFXResourceKind.PROGRAM) == 256
+
+            cache.put("b", 11)
+            gl.glDeleteProgram.assert_not_called()
+            resources.release(GFXResourceKind.PROGRAM, 10)
+            gl.glDeleteProgram.assert_called_once_with(10)
+
+            cache.clear()
+            gl.glDeleteProgram.assert_called_with(11)
+
+        assert resources.getLiveCount(GFXResourceKind.PROGRAM) == 0
+
+
+class GFXStateCacheTest(unittest.TestCase):
+    def testRedundantBinds(self) -> None:
+        """
+        Test that unchanged bindings and uniform values are not issued again.
+        """
+        state: GFXStateCache = GFXStateCache()
+        with mock.patch("shadercraft.gfx.GL") as gl:
+            gl.glGetUniformLocation.return_value = 7
+            for _ in range(3):
+                state.useProgram(1)
+                state.bindVertexArray(2)
+                state.setUniform(1, "u_color", Vec3F(1.0, 0.5, 0.0))
+            gl.glUseProgram.assert_called_once_with(1)
+            gl.glBindVertexArray.assert_called_once_with(2)
+            gl.glGetUniformLocation.assert_called_once_with(1, "u_color")
+            gl.glUniform3f.assert_called_once_with(7, 1.0, 0.5, 0.0)
+
+            state.setUniform(1, "u_color", Vec3F(0.0, 0.5, 0.0))
+            assert gl.glUniform3f.call_count == 2, "Changed uniform value should be uploaded"
+
+            state.invalidate()
+            state.useProgram(1)
+            assert gl.glUseProgram.call_count == 2, "Invalidated state should be bound again"
+
+        assert state.skipped == 6
+
+    def testDeletedProgram(self) -> None:
+        """
+        Test that cached state of deleted programs is dropped as GL may reuse their handles.
+        """
+        state: GFXStateCache = GFXStateCache()
+        resources: GFXResourceManager = GFXResourceManager()
+        resources.addDeleteListener(state.onResourceDeleted)
+        with mock.patch("shadercraft.gfx.GL") as gl, mock.patch("shadercraft.gfxresources.GL"):
+            gl.glGetUniformLocation.return_value = 3
+            resources.track(GFXResourceKind.PROGRAM, 5)
+            state.useProgram(5)
+            state.setUniform(5, "u_value", 1.0)
+
+            resources.release(GFXResourceKind.PROGRAM, 5)
+            state.useProgram(5)
+            state.setUniform(5, "u_value", 1.0)
+            assert gl.glUseProgram.call_count == 2
+            assert gl.glGetUniformLocation.call_count == 2
+            assert gl.glUniform1f.call_count == 2
+
+
+class GFXVertexLayoutTest(unittest.TestCase):
+    def testInterleave(self) -> None:
+        """
+        Test that vertex attributes are interleaved into single buffer with matching offsets.
+        """
+        mesh: GFXMeshData = GFXMeshes.sphere(1.0, 4, 4)
+        arrays: dict[str, np.ndarray] = {
+            "position": mesh.vertices,
+            "color": mesh.colors,
+            "normal": mesh.normals,
+            "uv": mesh.attributes["uv"],
+            "custom": np.arange(len(mesh.vertices), dtype=np.float32)
+        }
+        layout: GFXVertexLayout = GFXVertexLayout.fromArrays(arrays)
+        assert layout.stride == (3 + 3 + 3 + 2 + 1) * 4
+
+        uv: GFXVertexAttribute = layout.getAttribute("uv")
+        assert (uv.location, uv.size, uv.offset) == (3, 2, 36)
+        assert layout.getAttribute("custom").location == 5, "Custom attributes should follow standard locations"
+
+        data: np.ndarray = layout.interleave(arrays)
+        assert data.flags.c_contiguous and data.nbytes == layout.stride * len(mesh.vertices)
+        np.testing.assert_array_equal(data[:, 0:3], mesh.vertices)
+        np.testing.assert_array_equal(data[:, 6:9], mesh.normals)
+        np.testing.assert_array_equal(data[:, 9:11], mesh.attributes["uv"])
+
+    def testFlatStandardAttributes(self) -> None:
+        """
+        Test that flat arrays of standard attributes keep their real component counts.
+        """
+        arrays: dict[str, np.ndarray] = {
+            "position": np.zeros(9, dtype=np.float32),
+            "color": np.ones(9, dtype=np.float32),
+            "normal": np.zeros(9, dtype=np.float32)
+        }
+        layout: GFXVertexLayout = GFXVertexLayout.fromArrays(arrays)
+        assert [attribute.size for attribute in layout.attributes] == [3, 3, 3]
+        assert layout.stride == 36
+        assert layout.interleave(arrays).shape == (3, 9)
+
+
+class GFXMeshesTest(unittest.TestCase):
+    @staticmethod
+    def referenceSphere(vsubdiv: int, hsubdiv: int) -> tuple[np.ndarray, np.ndarray]:
+        """Per vertex loop implementation of unit sphere generation"""
+        vertices: list[list[float]] = []
+        for i in range(vsubdiv + 1):
+            vangle: float = np.pi / 2 - i * (np.pi / vsubdiv)
+            for j in range(hsubdiv + 1):
+                hangle: float = j * (2 * np.pi / hsubdiv)
+                vertices.append([np.cos(vangle) * np.cos(hangle), np.cos(vangle) * np.sin(hangle), np.sin(vangle)])
+
+        indices: list[int] = []
+        for i in range(vsubdiv):
+            for j in range(hsubdiv):
+                t0: int = i * (hsubdiv + 1) + j
+                t1: int = t0 + hsubdiv + 1
+                indices.extend([t0, t1, t0 + 1, t1, t1 + 1, t0 + 1])
+
+        return np.array(vertices, dtype=np.float32), np.array(indices, dtype=np.uint32)
+
+    def testSphereMatchesReference(self) -> None:
+        """
+        Test that vectorised sphere generation matches per vertex implementation.
+        """
+        vertices, indices = self.referenceSphere(12, 16)
+        mesh: GFXMeshData = GFXMeshes.sphere(1.0, 12, 16)
+        np.testing.assert_allclose(mesh.vertices, vertices, atol=1e-6)
+        np.testing.assert_array_equal(mesh.indices, indices)
+
+    def testMeshMemoization(self) -> None:
+        """
+        Test that meshes are generated once per unique set of parameters.
+        """
+        assert GFXMeshes.sphere(2.0, 8, 8) is GFXMeshes.sphere(2.0, 8, 8)
+        assert GFXMeshes.sphere(2.0, 8, 8) is not GFXMeshes.sphere(2.0, 8, 10)
+        assert not GFXMeshes.sphere(2.0, 8, 8).vertices.flags.writeable, "Shared mesh data must be read only"
+
+    def testPrimitives(self) -> None:
+        """
+        Test that all preview primitives produce valid geometry.
+        """
+        meshes: list[GFXMeshData] = [
+            GFXMeshes.sphere(1.0, 16, 16),
+            GFXMeshes.plane(1.0, 4),
+            GFXMeshes.cube(1.0),
+            GFXMeshes.torus(1.0, 0.25, 16, 8),
+            GFXMeshes.cylinder(0.5, 1.0, 16)
+        ]
+        for mesh in meshes:
+            assert mesh.vertices.dtype == np.float32 and mesh.vertices.shape[1] == 3
+            assert mesh.indices.dtype == np.uint32 and len(mesh.indices) % 3 == 0
+            assert mesh.indices.max() < len(mesh.vertices), "Mesh index out of range"
+            assert mesh.colors.shape == mesh.vertices.shape
+            np.testing.assert_allclose(np.linalg.norm(mesh.normals, axis=1), 1.0, atol=1e-5)
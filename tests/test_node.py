@@ -0,0 +1,177 @@
+import sys
+import unittest
+from unittest import mock
+from PySide6.QtWidgets import QApplication
+
+from shadercraft.node import Node
+from shadercraft.nodescheduler import NodeScheduler, GraphCycleError
+from shadercraft.shadernodes import FloatShaderNode, MulShaderNode, OutputShaderNode
+
+
+class NodeSchedulerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app: QApplication = QApplication.instance() or QApplication([])
+
+    @staticmethod
+    def createNode(cls) -> Node:
+        node: Node = cls()
+        node.initWidget()
+        return node
+
+    def testDiamondOrder(self) -> None:
+        """
+        Test that node shared by multiple consumers is scheduled once and before its consumers.
+        """
+        source: FloatShaderNode = self.createNode(FloatShaderNode)
+        left: FloatShaderNode = self.createNode(FloatShaderNode)
+        right: FloatShaderNode = self.createNode(FloatShaderNode)
+        mul: MulShaderNode = self.createNode(MulShaderNode)
+
+        left.addConnection(left.float_input.uuid, source, source.float_output.uuid)
+        right.addConnection(right.float_input.uuid, source, source.float_output.uuid)
+        mul.addConnection(mul.input_a.uuid, left, left.float_output.uuid)
+        mul.addConnection(mul.input_b.uuid, right, right.float_output.uuid)
+
+        order: list[Node] = mul.getDownstreamNodes()
+        assert order == [source, left, right, mul], "Invalid diamond graph evaluation order"
+
+    def testLongChain(self) -> None:
+        """
+        Test that scheduling long node chains does not hit the interpreter recursion limit.
+        """
+        count: int = sys.getrecursionlimit() + 100
+        nodes: list[FloatShaderNode] = [self.createNode(FloatShaderNode) for _ in range(count)]
+        for prev, node in zip(nodes, nodes[1:]):
+            node.addConnection(node.float_input.uuid, prev, prev.float_output.uuid)
+
+        order: list[Node] = nodes[-1].getDownstreamNodes()
+        assert order == nodes, "Invalid node chain evaluation order"
+
+    def testCycleDetection(self) -> None:
+        """
+        Test that scheduling graph with a cycle raises an error.
+        """
+        node0: FloatShaderNode = self.createNode(FloatShaderNode)
+        node1: FloatShaderNode = self.createNode(FloatShaderNode)
+        node0.addConnection(node0.float_input.uuid, node1, node1.float_output.uuid)
+
+        # Cycles are rejected by the nodes themselves, bypass it to schedule invalid graph
+        with mock.patch.object(FloatShaderNode, "canConnect", return_value=True):
+            node1.addConnection(node1.float_input.uuid, node0, node0.float_output.uuid)
+
+        with self.assertRaises(GraphCycleError):
+            NodeScheduler().schedule(node0)
+
+    def testCycleRejection(self) -> None:
+        """
+        Test that connections closing a cycle in the graph are rejected.
+        """
+        nodes: list[FloatShaderNode] = [self.createNode(FloatShaderNode) for _ in range(3)]
+        for prev, node in zip(nodes, nodes[1:]):
+            assert node.addConnection(node.float_input.uuid, prev, prev.float_output.uuid)
+
+        first: FloatShaderNode = nodes[0]
+        last: FloatShaderNode = nodes[-1]
+        assert NodeScheduler.isSourceOf(first, last)
+        assert not NodeScheduler.isSourceOf(last, first)
+        assert not first.canConnect(first.float_input.uuid, first, first.float_output.uuid)
+        assert not first.addConnection(first.float_input.uuid, last, last.float_output.uuid), \
+            "Connection closing a cycle should be rejected"
+        assert first.getAllConnections() == []
+        assert last.getDownstreamNodes() == nodes
+
+    def testTopologyInvalidation(self) -> None:
+        """
+        Test that cached evaluation order is refreshed after connections change.
+        """
+        scheduler: NodeScheduler = NodeScheduler()
+        source: FloatShaderNode = self.createNode(FloatShaderNode)
+        output: OutputShaderNode = self.createNode(OutputShaderNode)
+        assert scheduler.schedule(output) == [output]
+
+        output.addConnection(output.alpha_input.uuid, source, source.float_output.uuid)
+        assert scheduler.schedule(output) == [source, output]
+
+        con = output.getConnectionFromInput(output.alpha_input)
+        output.removeConnection(con.uuid)
+        assert scheduler.schedule(output) == [output]
+
+
+class NodeConnectionIndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app: QApplication = QApplication.instance() or QApplication([])
+
+    def testConnectionLookups(self) -> None:
+        """
+        Test that connection lookups stay in sync as connections are added and removed.
+        """
+        source: FloatShaderNode = FloatShaderNode()
+        mul: MulShaderNode = MulShaderNode()
+        source.initWidget()
+        mul.initWidget()
+
+        assert mul.addConnection(mul.input_a.uuid, source, source.float_output.uuid)
+        assert mul.addConnection(mul.input_b.uuid, source, source.float_output.uuid)
+        assert not mul.addConnection(mul.input_b.uuid, source, source.float_output.uuid), \
+            "Connection to already connected input should be rejected"
+
+        con_a = mul.getConnectionFromInput(mul.input_a)
+        con_b = mul.getConnectionFromInput(mul.input_b)
+        assert con_a is not None and con_b is not None
+        assert mul.getConnection(con_a.uuid) is con_a
+        assert mul.getAllConnections() == [con_a, con_b]
+        assert source.getOutputConnections() == [con_a, con_b]
+
+        mul.removeConnection(con_a.uuid)
+        assert mul.getConnection(con_a.uuid) is None
+        assert mul.getConnectionFromInput(mul.input_a) is None
+        assert source.getOutputConnections() == [con_b]
+
+
+class NodeRevisionTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app: QApplication = QApplication.instance() or QApplication([])
+        self.source: FloatShaderNode = FloatShaderNode()
+        self.mul: MulShaderNode = MulShaderNode()
+        self.output: OutputShaderNode = OutputShaderNode()
+        self.source.initWidget()
+        self.mul.initWidget()
+        self.output.initWidget()
+
+        self.mul.addConnection(self.mul.input_a.uuid, self.source, self.source.float_output.uuid)
+        self.output.addConnection(self.output.alpha_input.uuid, self.mul, self.mul.float_output.uuid)
+        for node in (self.source, self.mul, self.output):
+            node.clearDirty()
+
+    def testStaticValueChange(self) -> None:
+        """
+        Test that static value edits bump node revision and dirty all consumers.
+        """
+        revision: int = self.source.getRevision()
+        self.source.float_input.static_value = 2.0
+
+        assert self.source.getRevision() > revision
+        assert self.source.float_input.revision == 1
+        assert self.source.isDirty() and self.mul.isDirty() and self.output.isDirty()
+
+    def testConnectionChange(self) -> None:
+        """
+        Test that connection changes only dirty the target node and its consumers.
+        """
+        revision: int = self.mul.getRevision()
+        con = self.mul.getConnectionFromInput(self.mul.input_a)
+        self.mul.removeConnection(con.uuid)
+
+        assert self.mul.getRevision() > revision
+        assert not self.source.isDirty()
+        assert self.mul.isDirty() and self.output.isDirty()
+
+    def testRename(self) -> None:
+        """
+        Test that renaming a node bumps revision of nodes referencing it.
+        """
+        revision: int = self.mul.getRevision()
+        self.source.name = "RenamedNode"
+
+        assert self.mul.getRevision() > revision
+        assert self.source.isDirty() and self.mul.isDirty() and self.output.isDirty()
@@ -0,0 +1,354 @@
+import gc
+from typing import Optional
+import weakref
+import unittest
+from unittest import mock
+from uuid import UUID, uuid1
+from PySide6.QtCore import QPointF, QRectF, Qt
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication, QGraphicsView, QStyleOptionGraphicsItem, QWidget
+
+from shadercraft.nodegraphscene import NodeGraphScene
+from shadercraft.node import NodeConnection
+from shadercraft.connection_widget import ConnectionLayer, ConnectionWidget
+from shadercraft.node_widget import NodeItem, NodeProxyWidget, NodeWidget, NodePinShapeWidget
+from shadercraft.shadernodes import FloatShaderNode, MulShaderNode
+
+
+class NodeGraphSceneTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app: QApplication = QApplication.instance() or QApplication([])
+        self.scene: NodeGraphScene = NodeGraphScene()
+
+    def tearDown(self) -> None:
+        self.scene.clear()
+        del self.scene
+
+    @staticmethod
+    def getPinWidgetAt(proxy: NodeProxyWidget, scene_pos: QPointF) -> Optional[UUID]:
+        """Get property UUID of pin widget embedded in given node proxy at given scene position"""
+        pin: Optional[QWidget] = proxy.getWidget().childAt(proxy.mapFromScene(scene_pos).toPoint())
+        return pin.property_uuid if isinstance(pin, NodePinShapeWidget) else None
+
+    def testNodeLookups(self) -> None:
+        """
+        Test that nodes can be resolved from their UUID and their widgets.
+        """
+        added: list = []
+        self.scene.node_added.connect(added.append)
+        node: FloatShaderNode = FloatShaderNode()
+        self.scene.addNode(node)
+        widget = node.getWidget()
+
+        assert added == [node]
+        assert self.scene.getNodeFromUUID(node.uuid) is node
+        assert self.scene.getNodeFromWidget(widget) is node
+        assert self.scene.getWidgetFromUUID(widget.uuid) is widget
+        assert self.scene.getNodeFromWidgetUUID(widget.uuid) is node
+
+        self.scene.deleteNode(node)
+        assert self.scene.getNodeFromUUID(node.uuid) is None
+        assert self.scene.getWidgetFromUUID(widget.uuid) is None
+        assert self.scene.getAllNodes() == []
+
+    def testNodeNaming(self) -> None:
+        """
+        Test that node names are unique and released when nodes are deleted.
+        """
+        nodes: list[FloatShaderNode] = [FloatShaderNode() for _ in range(3)]
+        for node in nodes:
+            self.scene.addNode(node)
+
+        base: str = FloatShaderNode().name
+        assert [node.name for node in nodes] == [base, f"{base}_1", f"{base}_2"]
+
+        self.scene.deleteNode(nodes[0])
+        node: FloatShaderNode = FloatShaderNode()
+        self.scene.addNode(node)
+        assert node.name == base, "Name of deleted node should be reused"
+
+        self.scene.deleteNode(nodes[1])
+        node = FloatShaderNode()
+        self.scene.addNode(node)
+        assert node.name == f"{base}_1", "Suffixed name of deleted node should be reused"
+
+        node = FloatShaderNode()
+        self.scene.addNode(node)
+        assert node.name == f"{base}_3"
+
+        # Renames release old name and never collide with names of other nodes
+        nodes[2].name = "Renamed"
+        node = FloatShaderNode()
+        self.scene.addNode(node)
+        assert node.name == f"{base}_2", "Name released by rename should be reused"
+        node.name = "Renamed"
+        assert node.name == "Renamed_1"
+        assert nodes[2].name == "Renamed"
+
+    def testDeleteConnectedNode(self) -> None:
+        """
+        Test that deleting node removes connections to and from the node.
+        """
+        source: FloatShaderNode = FloatShaderNode()
+        mul: MulShaderNode = MulShaderNode()
+        output: FloatShaderNode = FloatShaderNode()
+        for node in (source, mul, output):
+            self.scene.addNode(node)
+
+        self.scene.attemptNodeConnection(source, source.float_output.uuid, mul, mul.input_a.uuid)
+        self.scene.attemptNodeConnection(mul, mul.float_output.uuid, output, output.float_input.uuid)
+        assert len(self.scene.getNodeUpstreamConnections(mul)) == 1
+        assert len(self.scene.getNodeDownstreamConnections(mul)) == 1
+
+        self.scene.deleteNode(mul)
+        assert source.getOutputConnections() == []
+        assert output.getAllConnections() == []
+
+    def testCycleConnection(self) -> None:
+        """
+        Test that scene rejects connections closing a cycle and keeps existing connection of the input.
+        """
+        source: FloatShaderNode = FloatShaderNode()
+        node0: FloatShaderNode = FloatShaderNode()
+        node1: FloatShaderNode = FloatShaderNode()
+        for node in (source, node0, node1):
+            self.scene.addNode(node)
+
+        assert self.scene.attemptNodeConnection(source, source.float_output.uuid, node0, node0.float_input.uuid)
+        assert self.scene.attemptNodeConnection(node0, node0.float_output.uuid, node1, node1.float_input.uuid)
+        assert not self.scene.attemptNodeConnection(node1, node1.float_output.uuid, node0, node0.float_input.uuid)
+
+        con: NodeConnection = node0.getConnectionFromInput(node0.float_input)
+        assert con is not None and con.source is source, "Rejected connection should keep existing connection"
+        assert node1.getDownstreamNodes() == [source, node0, node1]
+
+    def testPinUnderMouse(self) -> None:
+        """
+        Test that node pins painted by node items are resolved from their scene position.
+        """
+        view: QGraphicsView = QGraphicsView(self.scene)
+        node: MulShaderNode = MulShaderNode()
+        with mock.patch.object(MulShaderNode, "widget_type", NodeItem):
+            self.scene.addNode(node)
+        node.setPosition(100.0, 50.0)
+
+        widget: NodeItem = node.getWidget()
+        assert isinstance(widget, NodeItem)
+        for pin_uuid in (node.input_a.uuid, node.input_b.uuid, node.float_output.uuid):
+            pos: QPointF = widget.getPinScenePos(pin_uuid)
+            assert pos == widget.mapToScene(widget.getPinOffset(pin_uuid))
+            assert self.scene.pin_index.getPosition(node.uuid, pin_uuid) == pos
+            assert self.scene.getPinUnderMouse(pos) == (node, pin_uuid)
+
+        assert self.scene.getPinUnderMouse(widget.sceneBoundingRect().center()) is None
+        assert self.scene.getPinUnderMouse(QPointF(-1000, -1000)) is None
+        view.deleteLater()
+
+    def testNodeItemSelection(self) -> None:
+        """
+        Test that node items report selection changes and renames.
+        """
+        node: FloatShaderNode = FloatShaderNode()
+        with mock.patch.object(FloatShaderNode, "widget_type", NodeItem):
+            self.scene.addNode(node)
+        states: list[bool] = []
+        node.getWidget().selectionChanged.connect(states.append)
+
+        node.getWidget().setSelected(True)
+        node.getWidget().setSelected(False)
+        assert states == [True, False]
+
+        node.name = "RenamedNode"
+        assert node.getWidget().getNameText() == "RenamedNode"
+
+    def testProxyWidgetSelection(self) -> None:
+        """
+        Test that selecting widget based nodes does not apply per node stylesheets.
+        """
+        node: FloatShaderNode = FloatShaderNode()
+        self.scene.addNode(node)
+
+        proxy: NodeProxyWidget = node.getWidget()
+        assert isinstance(proxy, NodeProxyWidget), "Widget based nodes should be used by default"
+        widget: NodeWidget = proxy.getWidget()
+        proxy.setPos(QPointF(40, 20))
+        pos: QPointF = proxy.getPinScenePos(node.float_output.uuid)
+        assert self.getPinWidgetAt(proxy, pos) == node.float_output.uuid, "Cached pin offset should match pin widget"
+        assert self.scene.getPinUnderMouse(pos) == (node, node.float_output.uuid)
+        with mock.patch.object(NodeWidget, "setStyleSheet") as set_style:
+            proxy.setSelected(True)
+            assert widget.isSelected()
+            proxy.setSelected(False)
+            assert not widget.isSelected()
+            set_style.assert_not_called()
+        assert widget.styleSheet() == ""
+
+    def testProxyWidgetPinOffsets(self) -> None:
+        """
+        Test that widget based nodes refresh pin positions when embedded widget changes geometry.
+        """
+        source: FloatShaderNode = FloatShaderNode()
+        node: FloatShaderNode = FloatShaderNode()
+        for n in (source, node):
+            self.scene.addNode(n)
+        node.setPosition(300.0, 0.0)
+        self.scene.attemptNodeConnection(source, source.float_output.uuid, node, node.float_input.uuid)
+
+        proxy: NodeProxyWidget = source.getWidget()
+        widget: NodeWidget = proxy.getWidget()
+        offset: QPointF = proxy.getPinOffset(source.float_output.uuid)
+        widget.resize(widget.width() + 100, widget.height())
+        moved: QPointF = proxy.getPinOffset(source.float_output.uuid)
+        assert moved.x() > offset.x(), "Pin offset should follow embedded widget geometry"
+        assert self.getPinWidgetAt(proxy, proxy.getPinScenePos(source.float_output.uuid)) == source.float_output.uuid
+
+        pos: QPointF = proxy.getPinScenePos(source.float_output.uuid)
+        assert self.scene.pin_index.getPosition(source.uuid, source.float_output.uuid) == pos
+        self.scene.connection_layer.flushUpdates()
+        con: NodeConnection = node.getConnectionFromInput(node.float_input)
+        assert self.scene.connection_layer.getConnectionPath(con.uuid).pointAtPercent(0.0) == pos
+
+    def testConnectionLayer(self) -> None:
+        """
+        Test that connections are drawn by single layer and only edges of moved nodes are rebuilt.
+        """
+        source_a: FloatShaderNode = FloatShaderNode()
+        source_b: FloatShaderNode = FloatShaderNode()
+        mul: MulShaderNode = MulShaderNode()
+        for node in (source_a, source_b, mul):
+            self.scene.addNode(node)
+        self.scene.attemptNodeConnection(source_a, source_a.float_output.uuid, mul, mul.input_a.uuid)
+        self.scene.attemptNodeConnection(source_b, source_b.float_output.uuid, mul, mul.input_b.uuid)
+
+        layer: ConnectionLayer = self.scene.connection_layer
+        assert layer.getConnectionCount() == 2
+        assert not any(isinstance(item, ConnectionWidget) for item in self.scene.items())
+
+        builds: int = layer.path_builds
+        for x in range(10):
+            source_a.setPosition(-300.0 - x, 0.0)
+        assert layer.isUpdatePending() and layer.update_requests >= 10
+        QTest.qWait(layer.update_interval * 4)
+        assert not layer.isUpdatePending()
+        con: NodeConnection = mul.getConnectionFromInput(mul.input_a)
+        assert layer.path_builds == builds + 1, "Moved edge should be rebuilt once per frame"
+        assert layer.getConnectionPath(con.uuid).pointAtPercent(0.0) == con.getEndPoints()[0]
+        assert layer.boundingRect().contains(con.getEndPoints()[0])
+
+        layer.setCurved(True)
+        assert layer.path_builds == builds + 3
+        assert layer.getConnectionPath(con.uuid).elementCount() > 2, "Curved edges should be bezier paths"
+
+        mul.removeConnection(con.uuid)
+        assert layer.getConnectionCount() == 1 and not layer.hasConnection(con.uuid)
+
+    def testConnectionCulling(self) -> None:
+        """
+        Test that connection layer only strokes connections overlapping the exposed area.
+        """
+        layer: ConnectionLayer = ConnectionLayer()
+        uuids: list[UUID] = [uuid1() for _ in range(10)]
+        for i, uuid in enumerate(uuids):
+            y: float = i * 1000.0
+            layer.addConnection(uuid, QPointF(0.0, y), QPointF(100.0, y))
+        assert layer.boundingRect().contains(QPointF(100.0, 9000.0))
+
+        image: QImage = QImage(64, 64, QImage.Format.Format_ARGB32)
+        painter: QPainter = QPainter(image)
+        option: QStyleOptionGraphicsItem = QStyleOptionGraphicsItem()
+        option.exposedRect = QRectF(0.0, 1990.0, 100.0, 20.0)
+        layer.paint(painter, option, None)
+        painter.end()
+        assert layer.paths_drawn == 1, "Only exposed connection should be stroked"
+
+        layer.updateConnection(uuids[2], QPointF(0.0, 5000.0), QPointF(100.0, 5000.0))
+        assert layer.getConnectionsInRect(QRectF(0.0, 1990.0, 100.0, 20.0)) == []
+        assert set(layer.getConnectionsInRect(QRectF(0.0, 4990.0, 100.0, 20.0))) == {uuids[2], uuids[5]}
+
+        # Unresolved end points keep the cached path
+        layer.scheduleUpdate(uuids[3], lambda: None)
+        layer.flushUpdates()
+        assert layer.getConnectionPath(uuids[3]).pointAtPercent(0.0) == QPointF(0.0, 3000.0)
+
+        for uuid in uuids:
+            layer.removeConnection(uuid)
+        assert layer.getConnectionCount() == 0 and layer.boundingRect().isNull()
+
+    def testConnectionTeardown(self) -> None:
+        """
+        Test that removed connections stop tracking their nodes and are released.
+        """
+        source: FloatShaderNode = FloatShaderNode()
+        mul: MulShaderNode = MulShaderNode()
+        for node in (source, mul):
+            self.scene.addNode(node)
+        self.scene.attemptNodeConnection(source, source.float_output.uuid, mul, mul.input_a.uuid)
+        con: NodeConnection = mul.getConnectionFromInput(mul.input_a)
+        con_ref: weakref.ref = weakref.ref(con)
+        layer: ConnectionLayer = self.scene.connection_layer
+
+        source.getWidget().setSelected(True)
+        self.scene.deleteNode(source)
+        assert con.isReleased() and con.getLayer() is None
+        assert self.scene.getSelectedNode() is None, "Deleted node should not stay selected"
+
+        requests: int = layer.update_requests
+        source.setPosition(10.0, 10.0)
+        mul.setPosition(20.0, 20.0)
+        assert layer.update_requests == requests, "Removed connection should not track node moves"
+
+        del con
+        gc.collect()
+        assert con_ref() is None, "Removed connection should not be kept alive"
+
+    def testOccludedPin(self) -> None:
+        """
+        Test that pins covered by another node are not picked and presses reach the covering node.
+        """
+        view: QGraphicsView = QGraphicsView(self.scene)
+        view.resize(800, 600)
+        view.show()
+        mul: MulShaderNode = MulShaderNode()
+        top: FloatShaderNode = FloatShaderNode()
+        for node in (mul, top):
+            self.scene.addNode(node)
+        top.setPosition(400.0, 400.0)
+
+        pin_pos: QPointF = mul.getWidget().getPinScenePos(mul.input_a.uuid)
+        assert self.scene.getPinUnderMouse(pin_pos) == (mul, mul.input_a.uuid)
+
+        top.setPosition(pin_pos.x() - 40.0, pin_pos.y() - 40.0)
+        assert self.scene.getTopNodeAt(pin_pos) is top
+        assert self.scene.getPinUnderMouse(pin_pos) is None, "Covered pin should not be picked"
+
+        view.centerOn(pin_pos)
+        QTest.mousePress(view.viewport(), Qt.MouseButton.LeftButton, pos=view.mapFromScene(pin_pos))
+        assert self.scene.mouseGrabberItem() is top.getWidget(), "Press should reach the covering node"
+        assert self.scene.getSelectedNode() is top
+        QTest.mouseRelease(view.viewport(), Qt.MouseButton.LeftButton, pos=view.mapFromScene(pin_pos))
+        view.deleteLater()
+
+    def testPinSnapping(self) -> None:
+        """
+        Test that pin index follows node moves and supports snapping and culling queries.
+        """
+        view: QGraphicsView = QGraphicsView(self.scene)
+        source: FloatShaderNode = FloatShaderNode()
+        mul: MulShaderNode = MulShaderNode()
+        for node in (source, mul):
+            self.scene.addNode(node)
+        mul.setPosition(400.0, 0.0)
+
+        pin_pos: QPointF = mul.getWidget().getPinScenePos(mul.input_a.uuid)
+        near: QPointF = pin_pos + QPointF(self.scene.pin_pick_radius + 2, 0)
+        assert self.scene.getPinUnderMouse(near) is None, "Pick radius should require press close to the pin"
+        assert self.scene.getPinUnderMouse(near, self.scene.pin_snap_radius) == (mul, mul.input_a.uuid)
+
+        visible: list = self.scene.getPinsInRect(mul.getWidget().sceneBoundingRect())
+        assert {pin for _, pin in visible} == {mul.input_a.uuid, mul.input_b.uuid, mul.float_output.uuid}
+
+        self.scene.deleteNode(mul)
+        assert self.scene.getPinUnderMouse(pin_pos) is None
+        assert len(self.scene.pin_index) == 2
+        view.deleteLater()
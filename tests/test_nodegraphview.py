@@ -0,0 +1,48 @@
+import unittest
+from PySide6.QtWidgets import QApplication
+
+from shadercraft.nodegraphview import NodeGraphView
+from shadercraft.nodegraphscene import NodeGraphScene
+from shadercraft.node_widget import NodeDetailLevel
+from shadercraft.shadernodes import FloatShaderNode, MulShaderNode
+
+
+class NodeGraphViewTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app: QApplication = QApplication.instance() or QApplication([])
+        self.scene: NodeGraphScene = NodeGraphScene()
+        self.view: NodeGraphView = NodeGraphView()
+        self.view.setScene(self.scene)
+
+    def tearDown(self) -> None:
+        self.view.deleteLater()
+        self.scene.clear()
+
+    def testZoomDetailLevel(self) -> None:
+        """
+        Test that zooming out lowers detail of nodes and connections at their thresholds.
+        """
+        source: FloatShaderNode = FloatShaderNode()
+        mul: MulShaderNode = MulShaderNode()
+        for node in (source, mul):
+            self.scene.addNode(node)
+        mul.setPosition(300.0, 0.0)
+        self.scene.attemptNodeConnection(source, source.float_output.uuid, mul, mul.input_a.uuid)
+        pin_pos = mul.getWidget().getPinScenePos(mul.input_a.uuid)
+
+        self.view.zoom(0.4)
+        assert mul.getWidget().detail_level is NodeDetailLevel.SIMPLE
+        assert self.scene.getConnectionDetailLevel() is NodeDetailLevel.FULL
+        assert self.scene.getPinUnderMouse(pin_pos) is None, "Hidden pins should not be interactive"
+
+        self.view.zoom(0.5)
+        assert self.scene.getConnectionDetailLevel() is NodeDetailLevel.SIMPLE
+
+        node: FloatShaderNode = FloatShaderNode()
+        self.scene.addNode(node)
+        assert node.getWidget().detail_level is NodeDetailLevel.SIMPLE, "New nodes should use current detail"
+
+        self.view.zoom(1.0 / self.view.getScale())
+        assert all(n.getWidget().detail_level is NodeDetailLevel.FULL for n in self.scene.getAllNodes())
+        assert self.scene.getConnectionDetailLevel() is NodeDetailLevel.FULL
+        assert self.scene.getPinUnderMouse(pin_pos) == (mul, mul.input_a.uuid)
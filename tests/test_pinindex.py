@@ -0,0 +1,46 @@
+import unittest
+from uuid import UUID, uuid1
+from PySide6.QtCore import QPointF, QRectF
+
+from shadercraft.pinindex import PinIndex
+
+
+class PinIndexTest(unittest.TestCase):
+    def testNearestPin(self) -> None:
+        """
+        Test that nearest pin queries respect search radius and follow moved pins.
+        """
+        index: PinIndex = PinIndex(cell_size=32.0)
+        node: UUID = uuid1()
+        pin_a: UUID = uuid1()
+        pin_b: UUID = uuid1()
+        index.setPosition(node, pin_a, QPointF(10, 10))
+        index.setPosition(node, pin_b, QPointF(40, 10))
+
+        assert index.findNearest(QPointF(20, 10), 16) == (node, pin_a)
+        assert index.findNearest(QPointF(30, 12), 16) == (node, pin_b), "Pin in neighbouring cell should be found"
+        assert index.findNearest(QPointF(100, 100), 16) is None
+
+        index.setPosition(node, pin_a, QPointF(-200, -200))
+        assert len(index) == 2
+        assert index.findNearest(QPointF(20, 10), 16) is None
+        assert index.findNearest(QPointF(-195, -205), 16) == (node, pin_a)
+
+        index.removeNode(node)
+        assert len(index) == 0
+        assert index.findNearest(QPointF(40, 10), 16) is None
+
+    def testRectQuery(self) -> None:
+        """
+        Test that rectangle queries return only pins inside the rectangle.
+        """
+        index: PinIndex = PinIndex(cell_size=50.0)
+        pins: dict[UUID, QPointF] = {uuid1(): QPointF(x * 20, y * 20) for x in range(10) for y in range(10)}
+        node: UUID = uuid1()
+        for pin, pos in pins.items():
+            index.setPosition(node, pin, pos)
+
+        rect: QRectF = QRectF(15, 15, 50, 30)
+        found: set[UUID] = {pin for _, pin in index.query(rect)}
+        assert found == {pin for pin, pos in pins.items() if rect.contains(pos)}
+        assert len(found) == 6
@@ -0,0 +1,60 @@
+import time
+import unittest
+from PySide6.QtWidgets import QApplication
+
+from shadercraft.rebuildscheduler import RebuildScheduler
+
+
+class RebuildSchedulerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app: QApplication = QApplication.instance() or QApplication([])
+        self.rebuilds: list[bool] = []
+
+    def onRebuild(self, rebuild_shader: bool) -> None:
+        self.rebuilds.append(rebuild_shader)
+
+    def testCoalesceRequests(self) -> None:
+        """
+        Test that burst of requests within single event loop turn triggers single rebuild.
+        """
+        scheduler: RebuildScheduler = RebuildScheduler()
+        scheduler.rebuild_requested.connect(self.onRebuild)
+        scheduler.request(False)
+        scheduler.request()
+        scheduler.request(False)
+        assert scheduler.isPending()
+        assert self.rebuilds == [], "Rebuild should be deferred to the event loop"
+
+        self.app.processEvents()
+        assert self.rebuilds == [True], "Shader rebuild request should not be dropped by merging"
+        assert not scheduler.isPending()
+
+        self.app.processEvents()
+        assert self.rebuilds == [True]
+
+    def testDebounceWindow(self) -> None:
+        """
+        Test that requests are not rebuilt before debounce window elapses.
+        """
+        scheduler: RebuildScheduler = RebuildScheduler(debounce=50)
+        scheduler.rebuild_requested.connect(self.onRebuild)
+        for _ in range(20):
+            scheduler.request()
+            self.app.processEvents()
+        assert self.rebuilds == []
+
+        time.sleep(0.06)
+        self.app.processEvents()
+        assert self.rebuilds == [True]
+        assert (scheduler.requests, scheduler.rebuilds) == (20, 1)
+
+    def testCancel(self) -> None:
+        """
+        Test that cancelled requests are never rebuilt.
+        """
+        scheduler: RebuildScheduler = RebuildScheduler()
+        scheduler.rebuild_requested.connect(self.onRebuild)
+        scheduler.request()
+        scheduler.cancel()
+        self.app.processEvents()
+        assert self.rebuilds == []
@@ -0,0 +1,246 @@
+import os
+import time
+import tempfile
+import unittest
+from unittest import mock
+from PySide6.QtWidgets import QApplication
+
+from shadercraft.node import Node
+from shadercraft.shadergen import ShaderGen
+from shadercraft.shaderbuilder import ShaderBuilder, ShaderBuildResult
+from shadercraft.shadertemplates import ShaderTemplateRegistry, ShaderTemplate
+from shadercraft.shadernodes import FloatShaderNode, MulShaderNode, OutputShaderNode
+
+
+class ShaderGenTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app: QApplication = QApplication.instance() or QApplication([])
+        self.float_a: FloatShaderNode = FloatShaderNode()
+        self.float_b: FloatShaderNode = FloatShaderNode()
+        self.float_b.name = "ShaderFloatNodeB"
+        self.mul: MulShaderNode = MulShaderNode()
+        self.output: OutputShaderNode = OutputShaderNode()
+        for node in (self.float_a, self.float_b, self.mul, self.output):
+            node.initWidget()
+
+        self.mul.addConnection(self.mul.input_a.uuid, self.float_a, self.float_a.float_output.uuid)
+        self.mul.addConnection(self.mul.input_b.uuid, self.float_b, self.float_b.float_output.uuid)
+        self.output.addConnection(self.output.alpha_input.uuid, self.mul, self.mul.float_output.uuid)
+
+    def getNodes(self) -> list[Node]:
+        return self.output.getDownstreamNodes()
+
+    def testGenerateSource(self) -> None:
+        """
+        Test that pixel shader contains code of all connected nodes in evaluation order.
+        """
+        gen: ShaderGen = ShaderGen()
+        gen.generateSource(self.getNodes())
+
+        assert gen.vs_source, "Vertex shader source is empty"
+        idx_a: int = gen.ps_source.find(f"{self.float_a.name}_{self.float_a.float_output.name} =")
+        idx_mul: int = gen.ps_source.find(f"{self.mul.name}_{self.mul.float_output.name} =")
+        idx_out: int = gen.ps_source.find("float alpha =")
+        assert 0 <= idx_a < idx_mul < idx_out, "Invalid node code order in pixel shader"
+
+    def testSnippetCache(self) -> None:
+        """
+        Test that rebuilds only regenerate code of changed nodes.
+        """
+        gen: ShaderGen = ShaderGen()
+        gen.generateSource(self.getNodes())
+        assert gen.snippet_misses == 4
+
+        gen.generateSource(self.getNodes())
+        assert gen.snippet_misses == 4, "Unchanged nodes should not regenerate code"
+        assert gen.snippet_hits == 4
+
+        self.float_a.float_input.static_value = 3.0
+        gen.generateSource(self.getNodes())
+        assert gen.snippet_misses == 5, "Only edited node should regenerate code"
+        assert "= 3.0;" in gen.ps_source
+
+        fresh: ShaderGen = ShaderGen()
+        fresh.generateSource(self.getNodes())
+        assert fresh.ps_source == gen.ps_source, "Cached source differs from fresh source"
+
+    def testUniformPromotion(self) -> None:
+        """
+        Test that promoted input values are emitted as uniforms and value edits keep code intact.
+        """
+        for node in self.getNodes():
+            node.setUniformPromotion(True)
+        gen: ShaderGen = ShaderGen()
+        gen.generateSource(self.getNodes())
+
+        uniform: str = self.output.albedo_input.getUniformName()
+        assert f"uniform vec3 {uniform};" in gen.ps_source
+        assert f"vec3 albedo = {uniform};" in gen.ps_source
+        assert self.output.alpha_input.getUniformName() not in gen.ps_source, \
+            "Connected inputs should not be promoted to uniforms"
+
+        source: str = gen.ps_source
+        misses: int = gen.snippet_misses
+        self.float_a.float_input.static_value = 5.0
+        assert not self.output.isDirty(), "Promoted value edits should not dirty the graph"
+
+        values: dict[str, object] = ShaderGen.collectUniformValues(self.getNodes())
+        assert values[self.float_a.float_input.getUniformName()] == 5.0
+
+        result = gen.generateSource(self.getNodes())
+        assert gen.ps_source == source
+        assert gen.snippet_misses == misses
+        assert result.uniform_values.keys() == values.keys(), "Uniform values should be returned with the sources"
+        assert result.uniform_values[self.float_a.float_input.getUniformName()] == 5.0
+
+    def testBakedUniforms(self) -> None:
+        """
+        Test that baked sources declare promoted inputs as constants holding current values.
+        """
+        for node in self.getNodes():
+            node.setUniformPromotion(True)
+        self.float_a.float_input.static_value = 4.0
+        revisions: list[int] = [node.getRevision() for node in self.getNodes()]
+
+        gen: ShaderGen = ShaderGen(bake_uniforms=True)
+        gen.generateSource(self.getNodes())
+        assert "uniform " not in gen.ps_source.split("// Structure")[0], "Baked sources should not declare uniforms"
+        assert f"const float {self.float_a.float_input.getUniformName()} = 4.0;" in gen.ps_source
+        assert f"const vec3 {self.output.albedo_input.getUniformName()} = vec3(1.0, 1.0, 1.0);" in gen.ps_source
+
+        gen.snapshot(self.getNodes())
+        assert [node.getRevision() for node in self.getNodes()] == revisions, "Snapshot should not modify nodes"
+        assert not self.output.isDirty()
+
+    def testSnapshotIsolation(self) -> None:
+        """
+        Test that code is generated from data captured by the snapshot and ignores later graph edits.
+        """
+        self.float_a.setUniformPromotion(True)
+        self.float_a.float_input.static_value = 2.0
+        self.float_b.float_input.static_value = 6.0
+
+        gen: ShaderGen = ShaderGen()
+        with mock.patch.object(FloatShaderNode, "generateShaderCode") as generate:
+            snapshot = gen.snapshot(self.getNodes())
+            generate.assert_not_called()
+        assert gen.snippet_misses == 0, "Snapshot should only capture node data"
+
+        self.float_a.float_input.static_value = 7.0
+        self.float_b.float_input.static_value = 8.0
+        self.float_b.name = "ShaderFloatNodeRenamed"
+
+        result = gen.generateFromSnapshot(snapshot)
+        assert "= 6.0;" in result.ps_source, "Generated code should hold value captured by snapshot"
+        assert "8.0" not in result.ps_source
+        assert "ShaderFloatNodeRenamed" not in result.ps_source
+        assert result.uniform_values[self.float_a.float_input.getUniformName()] == 2.0
+        assert not ShaderGen.isSnapshotCurrent(snapshot)
+
+
+class ShaderTemplateRegistryTest(unittest.TestCase):
+    def testTemplateReload(self) -> None:
+        """
+        Test that templates are loaded once and reloaded when watched file changes on disk.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path: str = os.path.join(tmp_dir, "test_template.ps")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("value = $value;")
+
+            registry: ShaderTemplateRegistry = ShaderTemplateRegistry(watch_files=True)
+            registry.register("test", path)
+            template: ShaderTemplate = registry.get("test")
+            assert registry.get("test") is template, "Unchanged template should not be reloaded"
+            assert registry.getTemplate("test").substitute(value=1) == "value = 1;"
+
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("changed = $value;")
+            os.utime(path, (template.mtime + 10, template.mtime + 10))
+            assert registry.getTemplate("test").substitute(value=1) == "changed = 1;"
+
+            unwatched: ShaderTemplateRegistry = ShaderTemplateRegistry()
+            unwatched.register("test", path)
+            template = unwatched.get("test")
+            with mock.patch("os.path.getmtime") as getmtime:
+                assert unwatched.get("test") is template
+                getmtime.assert_not_called()
+
+    def testResourceTemplates(self) -> None:
+        """
+        Test that unregistered template names resolve to shipped shader resources.
+        """
+        registry: ShaderTemplateRegistry = ShaderTemplateRegistry()
+        assert "$graph_src" in registry.getSource("template_standard.ps")
+        assert registry.getSource("fallback.vs")
+
+
+class ShaderBuilderTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app: QApplication = QApplication.instance() or QApplication([])
+        self.float_a: FloatShaderNode = FloatShaderNode()
+        self.output: OutputShaderNode = OutputShaderNode()
+        for node in (self.float_a, self.output):
+            node.initWidget()
+        self.output.addConnection(self.output.alpha_input.uuid, self.float_a, self.float_a.float_output.uuid)
+
+        self.builder: ShaderBuilder = ShaderBuilder(ShaderGen())
+        self.results: list[ShaderBuildResult] = []
+        self.builder.build_finished.connect(self.results.append)
+
+    def tearDown(self) -> None:
+        self.builder.shutdown()
+
+    def waitForBuilds(self) -> None:
+        deadline: float = time.monotonic() + 5.0
+        while self.builder.isBusy() and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.001)
+
+    def testBackgroundBuild(self) -> None:
+        """
+        Test that shader sources are generated in the background and nodes marked clean afterwards.
+        """
+        self.builder.request(self.output.getDownstreamNodes())
+        self.waitForBuilds()
+
+        assert len(self.results) == 1
+        assert "float alpha =" in self.results[0].sources.ps_source
+        assert not self.output.isDirty(), "Accepted build should mark graph up to date"
+
+    def testCycleRequest(self) -> None:
+        """
+        Test that builds of graphs containing a cycle are rejected without cancelling build in flight.
+        """
+        looped: list[FloatShaderNode] = [FloatShaderNode(), FloatShaderNode()]
+        output: OutputShaderNode = OutputShaderNode()
+        for node in (*looped, output):
+            node.initWidget()
+        output.addConnection(output.alpha_input.uuid, looped[0], looped[0].float_output.uuid)
+        looped[0].addConnection(looped[0].float_input.uuid, looped[1], looped[1].float_output.uuid)
+        with mock.patch.object(FloatShaderNode, "canConnect", return_value=True):
+            looped[1].addConnection(looped[1].float_input.uuid, looped[0], looped[0].float_output.uuid)
+
+        self.builder.request(self.output.getDownstreamNodes())
+        nodes: list[Node] = [output, *looped]
+        assert self.builder.request(nodes) is None
+        self.waitForBuilds()
+        assert len(self.results) == 1, "Build in flight should be delivered"
+
+    def testLatestRequestWins(self) -> None:
+        """
+        Test that newer requests cancel builds in flight and outdated snapshots are dropped.
+        """
+        for value in (1.0, 2.0, 3.0):
+            self.float_a.float_input.static_value = value
+            self.builder.request(self.output.getDownstreamNodes())
+        self.waitForBuilds()
+
+        assert len(self.results) == 1, "Only latest build should be delivered"
+        assert "= 3.0;" in self.results[0].sources.ps_source
+
+        self.builder.request(self.output.getDownstreamNodes())
+        self.float_a.float_input.static_value = 4.0
+        self.waitForBuilds()
+        assert len(self.results) == 1, "Build of outdated graph should not be delivered"
+        assert self.output.isDirty()
@@ -0,0 +1,45 @@
+import unittest
+from PySide6.QtWidgets import QApplication
+
+from shadercraft.viewportwidget import ViewportWidget
+
+
+class ViewportRedrawTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app: QApplication = QApplication.instance() or QApplication([])
+        self.viewport: ViewportWidget = ViewportWidget()
+
+    def tearDown(self) -> None:
+        self.viewport.close()
+        del self.viewport
+
+    def testHiddenViewport(self) -> None:
+        """
+        Test that hidden viewport defers redraws and does not animate.
+        """
+        assert self.viewport.isRedrawSuspended(), "Hidden viewport should not redraw"
+        self.viewport.requestRedraw()
+        assert self.viewport.isRedrawPending()
+
+        self.viewport.setAnimating(True)
+        assert self.viewport.isAnimating()
+        assert not self.viewport.animation_timer.isActive(), "Hidden viewport should not run animation timer"
+
+    def testAnimationTimer(self) -> None:
+        """
+        Test that animation timer runs only while animating and redraws are not suspended.
+        """
+        self.viewport.show()
+        assert not self.viewport.animation_timer.isActive(), "Static viewport should not redraw continuously"
+
+        self.viewport.setAnimating(True)
+        assert self.viewport.animation_timer.isActive()
+
+        self.viewport.setRedrawSuspended(True)
+        assert not self.viewport.animation_timer.isActive(), "Suspended viewport should not run animation timer"
+
+        self.viewport.setRedrawSuspended(False)
+        assert self.viewport.animation_timer.isActive()
+
+        self.viewport.hide()
+        assert not self.viewport.animation_timer.isActive()